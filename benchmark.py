@@ -0,0 +1,1166 @@
+"""Benchmarks for the quote calculator in ``testiranje slik.py``.
+
+Run all benchmarks with ``python benchmark.py`` or pick some by name,
+e.g. ``python benchmark.py razpon``. ``python benchmark.py zbirka`` is the
+pricing suite: it compares against benchmark_osnova.json and exits with 1
+on a regression; ``--shrani-osnovo`` records a new baseline.
+"""
+import argparse
+import asyncio
+import bisect
+import contextlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+_POT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "testiranje slik.py")
+_spec = importlib.util.spec_from_file_location("testiranje_slik", _POT)
+ts = importlib.util.module_from_spec(_spec)
+# Registered before executing so pickling (worker processes) can find it.
+sys.modules["testiranje_slik"] = ts
+_spec.loader.exec_module(ts)
+
+def izmeri(fn, ponovitve=1):
+    """Return the best wall time in seconds of ``ponovitve`` runs of ``fn``."""
+    najboljse = float("inf")
+    for _ in range(ponovitve):
+        zacetek = time.perf_counter()
+        fn()
+        najboljse = min(najboljse, time.perf_counter() - zacetek)
+    return najboljse
+
+# === POISCI_RAZPON ===
+def _poisci_razpon_linearno(cenik, kolicina, ime_izdelka=None):
+    """The original linear scan, kept as the reference for the indexed lookup."""
+    if ime_izdelka:
+        for razpon in cenik:
+            if razpon["min"] <= kolicina <= razpon["max"] and razpon["ime"] == ime_izdelka:
+                return razpon
+    else:
+        for razpon in cenik:
+            if razpon["min"] <= kolicina <= razpon["max"]:
+                return razpon
+    return None
+
+def bench_razpon(n=200_000, seme=1):
+    """Indexed ``poisci_razpon`` against the original linear scan."""
+    rnd = random.Random(seme)
+    majice = list(ts.ceniki["majice"])  # dict rows, as the scan used to see them
+    imena = [razpon["ime"] for razpon in majice]
+    promocije = [ts.ceniki[ime] for ime in ts.promocijski_material.values()]
+    poizvedbe = []
+    for _ in range(n):
+        if rnd.random() < 0.5:
+            poizvedbe.append((majice, rnd.randint(1, 120), rnd.choice(imena)))
+        else:
+            poizvedbe.append((rnd.choice(promocije), rnd.randint(1, 1200), None))
+
+    for cenik, kolicina, ime in poizvedbe[:5000]:
+        assert ts.poisci_razpon(cenik, kolicina, ime) is _poisci_razpon_linearno(cenik, kolicina, ime)
+
+    def linearno():
+        for cenik, kolicina, ime in poizvedbe:
+            _poisci_razpon_linearno(cenik, kolicina, ime)
+
+    def indeksirano():
+        for cenik, kolicina, ime in poizvedbe:
+            ts.poisci_razpon(cenik, kolicina, ime)
+
+    t_lin = izmeri(linearno, 3)
+    t_idx = izmeri(indeksirano, 3)
+    print(f"poisci_razpon ({n} poizvedb)")
+    print(f"  linearno:    {t_lin * 1e6 / n:8.3f} µs/poizvedbo")
+    print(f"  indeksirano: {t_idx * 1e6 / n:8.3f} µs/poizvedbo ({t_lin / t_idx:.1f}x)")
+
+# === PAKETNA OBDELAVA ===
+def nakljucna_narocila(n, seme=1):
+    """Yield ``n`` random batch order rows (promotional and DTF)."""
+    rnd = random.Random(seme)
+    imena = [razpon["ime"] for razpon in ts.ceniki["majice"]]
+    promocije = list(ts.promocijski_material)
+    for st in range(n):
+        if rnd.random() < 0.4:
+            yield {"tip": "promocija", "podjetje": f"Podjetje {st % 500}",
+                   "izdelek": rnd.choice(promocije), "kolicina": rnd.randint(1, 400)}
+        else:
+            logotipi = [[rnd.choice([5, 8, 10, 12.5, 20, 28]), rnd.choice([4, 6, 9, 15, 30]), rnd.randint(1, 100)]
+                        for _ in range(rnd.randint(1, 4))]
+            yield {"tip": "dtf", "podjetje": f"Podjetje {st % 500}",
+                   "izdelek": rnd.choice(imena + ["ne potrebujem ga"]), "kolicina": rnd.randint(1, 100),
+                   "logotipi": logotipi}
+
+def zapisi_narocila(pot, n, seme=1):
+    with open(pot, "w", encoding="utf-8") as f:
+        for narocilo in nakljucna_narocila(n, seme):
+            f.write(json.dumps(narocilo) + "\n")
+
+def bench_paket(n=50_000):
+    """Throughput of the streaming batch path (JSONL in, JSONL out)."""
+    with tempfile.TemporaryDirectory() as mapa:
+        vhod = os.path.join(mapa, "narocila.jsonl")
+        izhod = os.path.join(mapa, "rezultati.jsonl")
+        zapisi_narocila(vhod, n)
+        cas = izmeri(lambda: ts.obdelaj_paket(vhod, izhod))
+    print(f"paketna obdelava ({n} naročil)")
+    print(f"  {cas:.2f} s, {n / cas * 60:,.0f} ponudb/min")
+
+def _obdelaj_s_poolom(vhod, izhod, delavci):
+    # Always through the pool, also for one worker, to show the pool overhead.
+    with open(izhod, "w", encoding="utf-8") as f:
+        for besedilo, *_ in ts.izracunaj_vzporedno(ts.beri_narocila(vhod), delavci, 1000):
+            f.write(besedilo)
+
+def bench_delavci(n=100_000, delavci=(1, 2, 4, 8)):
+    """Scaling of the process-pool batch mode across worker counts."""
+    with tempfile.TemporaryDirectory() as mapa:
+        vhod = os.path.join(mapa, "narocila.jsonl")
+        zapisi_narocila(vhod, n)
+        referenca = os.path.join(mapa, "serijsko.jsonl")
+        t_serijsko = izmeri(lambda: ts.obdelaj_paket(vhod, referenca))
+        with open(referenca, "rb") as f:
+            pricakovano = f.read()
+        print(f"vzporedna obdelava ({n} naročil, {os.cpu_count()} jeder)")
+        print(f"  serijsko:   {t_serijsko:6.2f} s")
+        for st in delavci:
+            izhod = os.path.join(mapa, f"vzporedno_{st}.jsonl")
+            cas = izmeri(lambda: _obdelaj_s_poolom(vhod, izhod, st))
+            with open(izhod, "rb") as f:
+                enako = f.read() == pricakovano
+            print(f"  {st} delavcev: {cas:6.2f} s ({t_serijsko / cas:.2f}x), enak izhod: {enako}")
+
+# === VEKTORSKI DTF ===
+def nakljucni_logotipi(st_narocil, seme=1):
+    """Flat logo arrays (sirine, visine, kolicine, narocila) for random DTF orders."""
+    rnd = random.Random(seme)
+    sirine, visine, kolicine, narocila = [], [], [], []
+    for narocilo in range(st_narocil):
+        for _ in range(rnd.randint(1, 6)):
+            sirine.append(round(rnd.uniform(2, 50), 1))
+            visine.append(round(rnd.uniform(2, 40), 1))
+            kolicine.append(rnd.randint(1, 300))
+            narocila.append(narocilo)
+    return sirine, visine, kolicine, narocila
+
+def bench_dtf_paket(st_narocil=100_000):
+    """Vectorized izracunaj_dtf_paket against the plain-Python fallback."""
+    sirine, visine, kolicine, narocila = nakljucni_logotipi(st_narocil)
+    rezultat = {}
+
+    def python():
+        rezultat["python"] = ts.izracunaj_dtf_paket(sirine, visine, kolicine, narocila, st_narocil, uporabi_numpy=False)
+
+    t_py = izmeri(python)
+    print(f"izracunaj_dtf_paket ({st_narocil} naročil, {len(sirine)} logotipov)")
+    print(f"  python: {t_py:.3f} s")
+    if ts._numpy() is None:
+        print("  numpy ni nameščen")
+        return
+    np = ts._numpy()
+    polja = [np.asarray(a) for a in (sirine, visine, kolicine, narocila)]
+
+    def vektorsko():
+        rezultat["numpy"] = ts.izracunaj_dtf_paket(*polja, st_narocil)
+
+    t_np = izmeri(vektorsko, 3)
+    enako = all(np.array_equal(np.asarray(rezultat["python"][k]), rezultat["numpy"][k]) for k in rezultat["numpy"])
+    print(f"  numpy:  {t_np:.3f} s ({t_py / t_np:.1f}x), enak rezultat: {enako}")
+
+# === ZLAGANJE ===
+def bench_zlaganje(st_vrst=(10, 100, 300), seme=1):
+    """Packing quality (film length) against speed for the shelf heuristics."""
+    rnd = random.Random(seme)
+    print("zlozi_logotipe: dolžina glede na spodnjo mejo (površina / 44 cm)")
+    for n in st_vrst:
+        logotipi = [(round(rnd.uniform(2, 30), 1), round(rnd.uniform(2, 30), 1), rnd.randint(1, 40))
+                    for _ in range(n)]
+        kopij = sum(k for _, _, k in logotipi)
+        meja = sum(s * v * k for s, v, k in logotipi) / 44
+        ocena = meja + 20  # what izracunaj_dtf charges today: area / 44 cm + 0.2 m
+        print(f"  {n} vrst, {kopij} kopij: spodnja meja {meja / 100:.2f} m, ocena iz površine {ocena / 100:.2f} m")
+        for hevristika in ("ffdh", "nfdh"):
+            rezultat = {}
+            cas = izmeri(lambda: rezultat.update(ts.zlozi_logotipe(logotipi, hevristika=hevristika)), 3)
+            print(f"    {hevristika}: {rezultat['dolzina_cm'] / 100:7.2f} m "
+                  f"({rezultat['dolzina_cm'] / meja:.3f}x meje, izkoristek {rezultat['izkoristek']:.1%}) "
+                  f"v {cas * 1000:.1f} ms")
+
+# === INTERPOLACIJA ===
+def _interpoliraj_ceno_staro(metri, cenik):
+    """The original sort-and-scan interpolation, kept as the benchmark reference."""
+    tocke = sorted(cenik.keys())
+    if metri <= 0:
+        return 0, 0
+    if metri < tocke[0]:
+        d2, p2 = cenik[tocke[0]]
+        faktor = metri / tocke[0]
+        return round(d2 * faktor, 2), round(p2 * faktor, 2)
+    for i in range(len(tocke) - 1):
+        nizji = tocke[i]
+        visji = tocke[i + 1]
+        if nizji <= metri <= visji:
+            d1, p1 = cenik[nizji]
+            d2, p2 = cenik[visji]
+            faktor = (metri - nizji) / (visji - nizji)
+            return round(d1 + (d2 - d1) * faktor, 2), round(p1 + (p2 - p1) * faktor, 2)
+    return cenik[tocke[-1]]
+
+def bench_interpolacija(n=200_000, seme=1):
+    """Compiled InterpolatorCen (with and without memo) against the original function."""
+    rnd = random.Random(seme)
+    dolzine = [round(rnd.uniform(0.2, 13), 2) for _ in range(n)]
+    cenik = ts.ceniki["dtf"]
+    brez_memo = ts.InterpolatorCen(cenik, predpomni=False)
+    z_memo = ts.InterpolatorCen(cenik)
+    for metri in dolzine[:5000]:
+        assert z_memo(metri) == brez_memo(metri)
+        # The float original can be a cent off on half-cent ties.
+        assert all(abs(a - b) < 0.0101 for a, b in zip(_interpoliraj_ceno_staro(metri, cenik), z_memo(metri)))
+
+    t_staro = izmeri(lambda: [_interpoliraj_ceno_staro(m, cenik) for m in dolzine], 3)
+    t_bisect = izmeri(lambda: [brez_memo(m) for m in dolzine], 3)
+    t_memo = izmeri(lambda: [z_memo(m) for m in dolzine], 3)
+    print(f"interpoliraj_ceno ({n} dolžin)")
+    print(f"  staro:        {t_staro * 1e6 / n:6.3f} µs/klic")
+    print(f"  bisect:       {t_bisect * 1e6 / n:6.3f} µs/klic ({t_staro / t_bisect:.1f}x)")
+    print(f"  bisect+memo:  {t_memo * 1e6 / n:6.3f} µs/klic ({t_staro / t_memo:.1f}x)")
+
+# === DENAR ===
+def _cena_float(interpolator, metri):
+    """InterpolatorCen's step in float euros, as it was before integer cents (the reference)."""
+    tocke = interpolator.tocke
+    if metri > tocke[-1]:
+        return round(float(interpolator.dobavne[-1]), 2), round(float(interpolator.prodajne[-1]), 2)
+    i = 0 if metri < tocke[1] else bisect.bisect_left(tocke, metri, 2) - 1
+    faktor = (metri - tocke[i]) / interpolator.razlike_m[i]
+    return (round(interpolator.dobavne[i] + interpolator.razlike_d[i] * faktor, 2),
+            round(interpolator.prodajne[i] + interpolator.razlike_p[i] * faktor, 2))
+
+def bench_denar(n=200_000, seme=1):
+    """Money in integer cents against the old float rounding: per-quote cost, batch totals and drift."""
+    rnd = random.Random(seme)
+    katalog = ts.ceniki["majice"]
+    interpolator = ts.InterpolatorCen(ts.ceniki["dtf"], predpomni=False)
+    ponudbe = []
+    for _ in range(n):
+        vrstica = rnd.randrange(len(katalog))
+        kolicina = rnd.randint(katalog.mini[vrstica], min(katalog.maksi[vrstica], katalog.mini[vrstica] + 200))
+        ponudbe.append((round(rnd.uniform(0.2, 13), 2), katalog.imena[vrstica], kolicina))
+
+    def v_evrih():
+        izid = []
+        for metri, ime, kolicina in ponudbe:
+            dtf_dobava, dtf_prodaja = _cena_float(interpolator, metri)
+            cena = katalog.cena(ime, kolicina)
+            dobava = round(dtf_dobava + cena[0] * kolicina, 2)
+            prodaja = round(dtf_prodaja + cena[1] * kolicina, 2)
+            izid.append((dobava, prodaja, round(prodaja - dobava, 2), round(prodaja / kolicina, 3)))
+        return izid
+
+    def v_centih():
+        izid = []
+        for metri, ime, kolicina in ponudbe:
+            dtf_dobava, dtf_prodaja = interpolator(metri)
+            cena = katalog.cena_v_centih(ime, kolicina)
+            dobava = ts.v_cente(dtf_dobava) + cena[0] * kolicina
+            prodaja = ts.v_cente(dtf_prodaja) + cena[1] * kolicina
+            izid.append((ts.v_evre(dobava), ts.v_evre(prodaja), ts.v_evre(prodaja - dobava), ts.na_kos(prodaja, kolicina)))
+        return izid
+
+    t_float = izmeri(v_evrih, 3)
+    t_centi = izmeri(v_centih, 3)
+    stari, novi = v_evrih(), v_centih()
+    razlicnih = sum(a != b for a, b in zip(stari, novi))
+    narocila = list(nakljucna_narocila(20_000, seme))
+    t_paket = izmeri(lambda: list(ts.izracunaj_narocila(narocila)))
+    print(f"denar ({n} ponudb DTF z majicami)")
+    print(f"  {'float, round():':22} {t_float * 1e6 / n:6.3f} µs/ponudbo")
+    print(f"  {'celi centi:':22} {t_centi * 1e6 / n:6.3f} µs/ponudbo ({t_centi / t_float - 1:+.0%}), "
+          f"{razlicnih} ponudb se razlikuje (polovični centi)")
+    print(f"  {'paket izracunaj_narocila:':22} {t_paket * 1e6 / len(narocila):6.3f} µs/naročilo, "
+          f"razlika je {(t_centi - t_float) / n / (t_paket / len(narocila)):+.1%} paketa")
+
+    prodaje = [ponudba[1] for ponudba in novi]
+    centi = sum(round(prodaja * 100) for prodaja in prodaje)  # exact, one by one
+    assert ts.sestej_cente(prodaje) == centi
+    t_vsota = izmeri(lambda: round(sum(prodaje), 2), 5)
+    t_tocno = izmeri(lambda: ts.sestej_cente(prodaje), 5)
+    print(f"  vsota {n} zneskov: sum() {t_vsota * 1e3:6.2f} ms, sestej_cente {t_tocno * 1e3:6.2f} ms "
+          f"({(t_tocno - t_vsota) / n / (t_paket / len(narocila)):+.2%} paketa)", end="")
+    np = ts._numpy()
+    if np is not None:
+        polje = np.asarray(prodaje)
+        assert ts.sestej_cente(polje) == centi
+        print(f", polje NumPy: sum() {izmeri(lambda: round(float(polje.sum()), 2), 5) * 1e3:6.2f} ms, "
+              f"sestej_cente {izmeri(lambda: ts.sestej_cente(polje), 5) * 1e3:6.2f} ms", end="")
+    print()
+
+# === CENIKI ===
+_NALOZI_CENIKE = (
+    "import importlib.util as u; s = u.spec_from_file_location('t', {pot!r}); "
+    "m = u.module_from_spec(s); s.loader.exec_module(m); m.ceniki.nalozi_vse()"
+)
+
+def bench_ceniki(ponovitve=10):
+    """Cold start of a process that loads every price list, with and without the pickle cache."""
+    with tempfile.TemporaryDirectory() as mapa:
+        kopija = os.path.join(mapa, "ceniki")
+        shutil.copytree(ts.MAPA_CENIKOV, kopija, ignore=shutil.ignore_patterns(".predpomnilnik"))
+        predpomnilnik = os.path.join(kopija, ".predpomnilnik")
+        okolje = dict(os.environ, CENIKI=kopija)
+        ukaz = [sys.executable, "-c", _NALOZI_CENIKE.format(pot=_POT)]
+
+        def zagon(brez_predpomnilnika):
+            if brez_predpomnilnika:
+                shutil.rmtree(predpomnilnik, ignore_errors=True)
+            return lambda: subprocess.run(ukaz, env=okolje, check=True)
+
+        t_prazno = izmeri(lambda: subprocess.run([sys.executable, "-c", "pass"], check=True), ponovitve)
+        t_hladno = min(izmeri(zagon(True)) for _ in range(ponovitve))
+        t_toplo = izmeri(zagon(False), ponovitve)
+
+        zbirka = ts.ZbirkaCenikov(kopija)
+        t_nalaganje = izmeri(lambda: ts.ZbirkaCenikov(kopija).nalozi_vse(), ponovitve)
+        zbirka.nalozi_vse()
+        t_osvezi = izmeri(zbirka.osvezi, ponovitve)
+    print("nalaganje cenikov")
+    print(f"  prazen python:          {t_prazno * 1000:6.1f} ms")
+    print(f"  zagon, brez predpomn.:  {t_hladno * 1000:6.1f} ms")
+    print(f"  zagon, s predpomn.:     {t_toplo * 1000:6.1f} ms")
+    print(f"  nalozi_vse v procesu:   {t_nalaganje * 1000:6.2f} ms")
+    print(f"  osvezi brez sprememb:   {t_osvezi * 1e6:6.1f} µs")
+
+# === KATALOG MAJIC ===
+def _nakljucne_vrstice(n, seme=1):
+    """Garment rows like a parsed supplier CSV: fresh strings, float prices."""
+    rnd = random.Random(seme)
+    osnove = [razpon["ime"] for razpon in ts.ceniki["majice"]]
+    for st in range(n):
+        dobava = round(rnd.uniform(2, 40), 2)
+        yield {"ime": f"{rnd.choice(osnove)} {st}", "min": 1, "max": 100,
+               "dobava": dobava, "prodaja": round(dobava * 1.2, 2)}
+
+def _pomnilnik(ustvari):
+    tracemalloc.start()
+    objekt = ustvari()
+    porabljeno, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objekt, porabljeno
+
+def bench_katalog(n=50_000):
+    """Memory per SKU of KatalogMajic against the list-of-dicts cenik, plus lookup speed."""
+    seznam, b_seznam = _pomnilnik(lambda: list(_nakljucne_vrstice(n)))
+    katalog, b_katalog = _pomnilnik(lambda: ts.KatalogMajic.iz_razponov(_nakljucne_vrstice(n)))
+    imena = [razpon["ime"] for razpon in seznam]
+    rnd = random.Random(2)
+    poizvedbe = [(rnd.choice(imena), rnd.randint(1, 100)) for _ in range(100_000)]
+    for ime, kolicina in poizvedbe[:2000]:
+        razpon = ts.poisci_razpon(seznam, kolicina, ime)
+        assert katalog.cena(ime, kolicina) == (razpon["dobava"], razpon["prodaja"])
+
+    def seznam_iskanje():
+        for ime, kolicina in poizvedbe:
+            ime in ts.indeks_cenika(seznam).po_imenu
+            ts.poisci_razpon(seznam, kolicina, ime)
+
+    def katalog_iskanje():
+        for ime, kolicina in poizvedbe:
+            ime in katalog
+            katalog.cena(ime, kolicina)
+
+    t_seznam = izmeri(seznam_iskanje, 3)
+    t_katalog = izmeri(katalog_iskanje, 3)
+    print(f"katalog majic ({n} SKU)")
+    print(f"  seznam slovarjev: {b_seznam / n:6.0f} B/SKU, iskanje {t_seznam * 1e6 / len(poizvedbe):.3f} µs")
+    print(f"  KatalogMajic:     {b_katalog / n:6.0f} B/SKU, iskanje {t_katalog * 1e6 / len(poizvedbe):.3f} µs "
+          f"({b_seznam / b_katalog:.1f}x manj pomnilnika)")
+
+# === IMENA ARTIKLOV ===
+def _tipkarska_napaka(ime, rnd):
+    i = rnd.randrange(len(ime))
+    vrsta = rnd.randrange(3)
+    if vrsta == 0:
+        return ime[:i] + ime[i + 1:]
+    if vrsta == 1 or i == len(ime) - 1:
+        return ime[:i] + rnd.choice("aeiou") + ime[i:]
+    return ime[:i] + ime[i + 1] + ime[i] + ime[i + 2:]  # swapped neighbours, "lday" for "lady"
+
+def bench_imena(faktor=100, n=2000, seme=1):
+    """Garment name validation and suggestions on a catalogue ``faktor`` times the current size."""
+    rnd = random.Random(seme)
+    osnove = [razpon["ime"] for razpon in ts.ceniki["majice"]]
+    dodatki = ["".join(rnd.choice("abcdefghijklmnoprstuvz") for _ in range(rnd.randint(3, 8)))
+               for _ in range(faktor)]
+    imena = [f"{osnova} {dodatek}" for osnova in osnove for dodatek in dodatki]
+    katalog = ts.KatalogMajic(imena, [1] * len(imena), [100] * len(imena),
+                              [1.0] * len(imena), [1.2] * len(imena))
+    cas_gradnje = izmeri(katalog._zgradi_trigrame)
+
+    tocni = [rnd.choice(imena) for _ in range(n)]
+    neurejeni = [f"  {ime.upper()} " for ime in tocni]
+    napacni = [_tipkarska_napaka(ime, rnd) for ime in tocni]
+
+    def povprecje(fn, poizvedbe):
+        return izmeri(lambda: [fn(ime) for ime in poizvedbe], 3) / len(poizvedbe)
+
+    predlogi = [katalog.predlagaj(napacno) for napacno in napacni]
+    zadetki = sum(tocno in predlog for tocno, predlog in zip(tocni, predlogi))
+    prvi = sum(predlog[:1] == [tocno] for tocno, predlog in zip(tocni, predlogi))
+    print(f"imena artiklov ({len(imena)} imen, trigrami zgrajeni v {cas_gradnje * 1000:.0f} ms)")
+    print(f"  seznam (staro):   {povprecje(lambda ime: ime in [i.lower() for i in imena], tocni[:50]) * 1e6:9.1f} µs")
+    print(f"  točen zadetek:    {povprecje(katalog.najdi, tocni) * 1e6:9.2f} µs")
+    print(f"  normalizirano:    {povprecje(katalog.najdi, neurejeni) * 1e6:9.2f} µs")
+    print(f"  predlogi:         {povprecje(katalog.predlagaj, napacni) * 1e6:9.1f} µs "
+          f"(pravo ime med predlogi: {zadetki / n:.0%}, prvo: {prvi / n:.0%})")
+
+# === ZAPISOVANJE ===
+def bench_zapisovanje(n=20_000, seme=1):
+    """Synchronous save_to_file against ZapisovalnikPonudb for ``n`` quote files."""
+    zapisi = []
+    for narocilo in nakljucna_narocila(n, seme):
+        try:
+            rezultat = ts.izracunaj_narocilo(narocilo)
+        except ValueError:
+            continue
+        podjetje, vrstice, kolicina, izbira = ts.zapis_ponudbe(rezultat)
+        zapisi.append((f"{podjetje} {len(zapisi)}", vrstice, kolicina, izbira))  # unique file names
+
+    with tempfile.TemporaryDirectory() as mapa:
+        def sinhrono():
+            with contextlib.redirect_stdout(io.StringIO()):
+                for zapis in zapisi:
+                    ts.save_to_file(*zapis, mapa=os.path.join(mapa, "sinhrono"))
+
+        t_sinhrono = izmeri(sinhrono)
+        print(f"zapisovanje ponudb ({len(zapisi)} datotek)")
+        print(f"  {'save_to_file:':19} {t_sinhrono * 1e6 / len(zapisi):7.1f} µs/ponudbo")
+        for trajno in (False, True):
+            zapisovalnik = ts.ZapisovalnikPonudb(os.path.join(mapa, f"ozadje_{trajno}"), trajno=trajno)
+            zacetek = time.perf_counter()
+            for zapis in zapisi:
+                zapisovalnik.shrani(*zapis)
+            t_vrsta = time.perf_counter() - zacetek
+            zapisovalnik.zapri()
+            t_skupaj = time.perf_counter() - zacetek
+            oznaka = "v ozadju, trajno:" if trajno else "v ozadju:"
+            print(f"  {oznaka:19} {t_vrsta * 1e6 / len(zapisi):7.1f} µs/ponudbo "
+                  f"za klicatelja, {t_skupaj * 1e6 / len(zapisi):7.1f} µs/ponudbo do zapri() "
+                  f"({t_sinhrono / t_vrsta:.1f}x)")
+
+# === MAPE PONUDB ===
+def _zapisi_ponudbe(mapa, zapisi, razdeljeno):
+    """Write ``zapisi`` (podjetje, datum, ime) into one flat folder or into mapa_ponudbe() folders."""
+    narejene = set()
+    for podjetje, datum, ime in zapisi:
+        cilj = ts.mapa_ponudbe(mapa, podjetje, datum) if razdeljeno else mapa
+        if cilj not in narejene:
+            os.makedirs(cilj, exist_ok=True)
+            narejene.add(cilj)
+        ts.zapisi_brez_prepisa(cilj, ime, "Podjetje: x\n")
+    return len(zapisi)
+
+def bench_mape(n=100_000, podjetij=2000, dni=5, procesov=4, seme=1):
+    """Quote files flat in one folder against the date/shard/company layout, at ``n`` quotes."""
+    rng = random.Random(seme)
+    zapisi = []
+    for _ in range(n):
+        podjetje = f"Podjetje {rng.randrange(podjetij)}"
+        ime = ts.ime_datoteke_ponudbe(podjetje, rng.choice((10, 20, 50, 100)), "majice")
+        zapisi.append((podjetje, f"2026-01-0{rng.randrange(dni) + 1}", ime))  # many repeated names
+    iskano = zapisi[0][0]
+    print(f"mape ponudb ({n} ponudb, {podjetij} podjetij, {dni} dni)")
+    with tempfile.TemporaryDirectory() as koren:
+        for razdeljeno in (False, True):
+            mapa = os.path.join(koren, "razdeljeno" if razdeljeno else "ravno")
+            t_pisanje = izmeri(lambda: _zapisi_ponudbe(mapa, zapisi, razdeljeno))
+            if razdeljeno:
+                datoteke = sum(len(f) for _, _, f in os.walk(mapa))
+                mape = [ts.mapa_ponudbe(mapa, iskano, f"2026-01-0{d + 1}") for d in range(dni)]
+                t_iskanje = izmeri(lambda: [os.listdir(m) for m in mape if os.path.isdir(m)], 20)
+                najvec = max(len(f) for _, _, f in os.walk(mapa))
+            else:
+                datoteke = len(os.listdir(mapa))
+                predpona = ts.sanitize_filename(iskano) + "_"
+                t_iskanje = izmeri(lambda: [e.name for e in os.scandir(mapa) if e.name.startswith(predpona)], 20)
+                najvec = datoteke
+            oznaka = "datum/razdelek/podjetje:" if razdeljeno else "ena mapa:"
+            print(f"  {oznaka:25} pisanje {t_pisanje * 1e6 / n:6.1f} µs/ponudbo, "
+                  f"ponudbe enega podjetja {t_iskanje * 1e3:8.3f} ms, "
+                  f"največ {najvec} datotek v mapi, {datoteke} datotek")
+        # Several processes writing the same names at once: every quote must land in its own file.
+        mapa = os.path.join(koren, "vzporedno")
+        deli = [zapisi[i::procesov] for i in range(procesov)]
+        zacetek = time.perf_counter()
+        with multiprocessing.Pool(procesov) as bazen:
+            zapisanih = sum(bazen.starmap(_zapisi_ponudbe, [(mapa, del_, True) for del_ in deli]))
+        cas = time.perf_counter() - zacetek
+        na_disku = sum(len(f) for _, _, f in os.walk(mapa))
+        oznaka = f"{procesov} procesi hkrati:"
+        print(f"  {oznaka:25} pisanje {cas * 1e6 / n:6.1f} µs/ponudbo, "
+              f"{zapisanih} zapisanih, {na_disku} na disku")
+
+# === KNJIGA PONUDB ===
+def bench_knjiga(n=100_000, seme=1):
+    """Batched ledger inserts against one commit per quote, plus indexed queries."""
+    rezultati = []
+    for narocilo in nakljucna_narocila(n, seme):
+        try:
+            rezultati.append(ts.izracunaj_narocilo(narocilo))
+        except ValueError:
+            pass
+    podjetja = sorted({rezultat["podjetje"] for rezultat in rezultati})
+    rnd = random.Random(seme)
+
+    with tempfile.TemporaryDirectory() as mapa:
+        posamezno = rezultati[:2000]
+        with ts.KnjigaPonudb(os.path.join(mapa, "posamezno.sqlite3"), velikost_paketa=1) as knjiga:
+            t_posamezno = izmeri(lambda: [knjiga.dodaj(rezultat) for rezultat in posamezno])
+        knjiga = ts.KnjigaPonudb(os.path.join(mapa, "paketno.sqlite3"))
+
+        def paketno():
+            for rezultat in rezultati:
+                knjiga.dodaj(rezultat)
+            knjiga.shrani()
+
+        t_paketno = izmeri(paketno)
+        izbrana = [rnd.choice(podjetja) for _ in range(200)]
+        t_podjetje = izmeri(lambda: [list(knjiga.poisci(podjetje=podjetje)) for podjetje in izbrana], 3)
+        t_profit = izmeri(knjiga.profit_po_artiklih, 3)
+        t_mesec = izmeri(lambda: knjiga.profit_po_artiklih(od="2000-01-01", do="2100-01-01",
+                                                          min_kolicina=50), 3)
+        knjiga.zapri()
+    print(f"knjiga ponudb ({len(rezultati)} ponudb)")
+    print(f"  commit na ponudbo: {t_posamezno * 1e6 / len(posamezno):8.1f} µs/ponudbo")
+    print(f"  paketno:           {t_paketno * 1e6 / len(rezultati):8.1f} µs/ponudbo "
+          f"({t_posamezno / len(posamezno) / (t_paketno / len(rezultati)):.1f}x)")
+    print(f"  ponudbe podjetja:  {t_podjetje * 1e3 / len(izbrana):8.3f} ms/poizvedbo")
+    print(f"  profit po artiklih: {t_profit * 1e3:7.1f} ms (vse), {t_mesec * 1e3:.1f} ms (s filtri)")
+
+# === PRILOGE ===
+def _zasedeno(mapa):
+    """Bytes used by the files under ``mapa``, counting each inode once."""
+    videni = {}
+    for koren, _, datoteke in os.walk(mapa):
+        for ime in datoteke:
+            stat = os.stat(os.path.join(koren, ime))
+            videni[(stat.st_dev, stat.st_ino)] = stat.st_blocks * 512
+    return sum(videni.values())
+
+def bench_priloge(st_ponudb=50, st_pdf=3, velikost=4 << 20, seme=1):
+    """Attaching a few multi-MB briefs to many quotes: shutil.copy2 against ShrambaPrilog."""
+    rnd = random.Random(seme)
+    with tempfile.TemporaryDirectory() as mapa:
+        pdfji = []
+        for st in range(st_pdf):
+            pot = os.path.join(mapa, f"brief{st}.pdf")
+            with open(pot, "wb") as f:
+                f.write(b"%PDF-1.7\n" + rnd.randbytes(velikost))
+            pdfji.append(pot)
+        priloge = [(rnd.choice(pdfji), f"ponudba{st}") for st in range(st_ponudb)]
+
+        def kopiraj(cilj, prilozi):
+            def izvedi():
+                for pdf, ponudba in priloge:
+                    os.makedirs(os.path.join(cilj, ponudba), exist_ok=True)
+                    prilozi(pdf, os.path.join(cilj, ponudba, os.path.basename(pdf)))
+            return izvedi
+
+        kopije = os.path.join(mapa, "copy2")
+        t_kopije = izmeri(kopiraj(kopije, shutil.copy2))
+        shramba = ts.ShrambaPrilog(os.path.join(mapa, "shramba", ".priloge"))
+        t_shramba = izmeri(kopiraj(os.path.join(mapa, "shramba"), shramba.prilozi))
+        print(f"priloge ({st_ponudb} ponudb, {st_pdf} različnih PDF po {velikost >> 20} MiB)")
+        print(f"  shutil.copy2:  {t_kopije * 1000:7.1f} ms, {_zasedeno(kopije) >> 20:5d} MiB na disku")
+        print(f"  ShrambaPrilog: {t_shramba * 1000:7.1f} ms, {_zasedeno(os.path.join(mapa, 'shramba')) >> 20:5d} MiB "
+              f"na disku ({shramba.novih} shranjenih, {shramba.povezav} povezav, {shramba.kopij} kopij)")
+
+        # batch --shrani: every quote gets its brief, though PDFs are attached on another thread.
+        # A small brief is attached quickly enough to catch it running ahead of its quote.
+        kratek = os.path.join(mapa, "kratek.pdf")
+        with open(kratek, "wb") as f:
+            f.write(b"%PDF-1.7\n%%EOF\n")
+        vhod = os.path.join(mapa, "narocila.jsonl")
+        with open(vhod, "w", encoding="utf-8") as f:
+            for st, narocilo in enumerate(nakljucna_narocila(st_ponudb * 4, seme)):
+                f.write(json.dumps({**narocilo, "podjetje": f"Podjetje {st}", "pdf": kratek}) + "\n")
+        paket = os.path.join(mapa, "paket")
+        zacetek = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()) as izpis:
+            ok, _ = ts.obdelaj_paket(vhod, os.devnull, mapa_ponudb=paket)
+        t_paket = time.perf_counter() - zacetek
+        prilozenih = sum(ime.endswith(".pdf") for koren, _, datoteke in os.walk(paket) if ".priloge" not in koren
+                         for ime in datoteke)
+        assert prilozenih == ok and "❌" not in izpis.getvalue(), izpis.getvalue()
+        print(f"  batch --shrani: {t_paket * 1000:6.1f} ms, {prilozenih}/{ok} ponudb s prilogo")
+
+# === HTTP STORITEV ===
+def _zahteve_storitve(n, seme=1):
+    """(path, JSON body) pairs for the quote endpoints."""
+    zahteve = []
+    for narocilo in nakljucna_narocila(n, seme):
+        pot = "/quote/promo" if narocilo.pop("tip") == "promocija" else "/quote/dtf"
+        zahteve.append((pot, json.dumps(narocilo).encode("utf-8")))
+    return zahteve
+
+async def _stanje_storitve(naslov, vrata):
+    bralnik, pisalnik = await asyncio.open_connection(naslov, vrata)
+    pisalnik.write(f"GET /health HTTP/1.1\r\nHost: {naslov}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    odgovor = await bralnik.read()
+    pisalnik.close()
+    return json.loads(odgovor.split(b"\r\n\r\n", 1)[1])
+
+async def _obremeni(naslov, vrata, zahteve, socasnih):
+    """Send ``zahteve`` over ``socasnih`` keep-alive connections; return client latencies in seconds."""
+    latence = []
+    naslednja = iter(zahteve)
+
+    async def odjemalec():
+        bralnik, pisalnik = await asyncio.open_connection(naslov, vrata)
+        for pot, telo in naslednja:
+            zacetek = time.perf_counter()
+            pisalnik.write(f"POST {pot} HTTP/1.1\r\nHost: {naslov}\r\nContent-Type: application/json\r\n"
+                           f"Content-Length: {len(telo)}\r\n\r\n".encode("latin-1") + telo)
+            glava = await bralnik.readuntil(b"\r\n\r\n")
+            dolzina = int(glava.split(b"Content-Length: ", 1)[1].split(b"\r\n", 1)[0])
+            await bralnik.readexactly(dolzina)
+            latence.append(time.perf_counter() - zacetek)
+        pisalnik.close()
+
+    await asyncio.gather(*(odjemalec() for _ in range(socasnih)))
+    return latence
+
+def bench_storitev(n=20_000, socasnih=(1, 16, 64), naslov=None, vrata=None):
+    """Load test of the HTTP service on localhost.
+
+    Client latency includes queueing behind the other connections; the
+    server-side service time from /health is what CILJ_P50_MS/CILJ_P99_MS
+    apply to.
+
+    Without ``naslov``/``vrata`` a server is started with ``serve`` for the
+    duration of the test; otherwise an already running one is used.
+    """
+    proces = None
+    if naslov is None:
+        naslov = "127.0.0.1"
+        proces = subprocess.Popen([sys.executable, _POT, "serve", "--vrata", "0"],
+                                  stderr=subprocess.PIPE, text=True)
+        vrstica = proces.stderr.readline()
+        vrata = int(vrstica.rsplit(":", 1)[1])
+    try:
+        zahteve = _zahteve_storitve(n)
+        asyncio.run(_obremeni(naslov, vrata, zahteve[:500], 4))  # warm-up
+        print(f"HTTP storitev ({n} zahtev, cilj p50 {ts.CILJ_P50_MS} ms, p99 {ts.CILJ_P99_MS} ms)")
+        for st in socasnih:
+            zacetek = time.perf_counter()
+            latence = asyncio.run(_obremeni(naslov, vrata, zahteve, st))
+            trajanje = time.perf_counter() - zacetek
+            stanje = asyncio.run(_stanje_storitve(naslov, vrata))
+            ok = "✅" if stanje["p50_ms"] <= ts.CILJ_P50_MS and stanje["p99_ms"] <= ts.CILJ_P99_MS else "❌"
+            print(f"  {st:3d} sočasnih: {len(latence) / trajanje:8.0f} zahtev/s, "
+                  f"odjemalec p50 {ts.percentil(latence, 50) * 1000:6.2f} ms, "
+                  f"p99 {ts.percentil(latence, 99) * 1000:6.2f} ms; "
+                  f"strežnik p50 {stanje['p50_ms']:6.3f} ms, p99 {stanje['p99_ms']:6.3f} ms {ok}")
+    finally:
+        if proces is not None:
+            proces.terminate()
+            proces.wait()
+
+# === PREDPOMNILNIK PONUDB ===
+def bench_predpomnilnik(n=100_000, razlicnih=2000, seme=1):
+    """Quote cache on a repeat-heavy stream: ``n`` orders drawn from ``razlicnih`` distinct ones.
+
+    Repeats come as they were first given and, separately, with their logos
+    shuffled into a new order each time.
+    """
+    rnd = random.Random(seme)
+    osnove = list(nakljucna_narocila(razlicnih, seme))
+    narocila = [rnd.choice(osnove) for _ in range(n)]
+    premesana = []
+    for narocilo in narocila:
+        narocilo = dict(narocilo)
+        if "logotipi" in narocilo:
+            narocilo["logotipi"] = rnd.sample(narocilo["logotipi"], len(narocilo["logotipi"]))
+        premesana.append(narocilo)
+
+    predpomnilnik = ts.PredpomnilnikPonudb()
+    for narocilo in narocila[:2500] + premesana[:2500]:
+        try:
+            assert ts.izracunaj_narocilo(narocilo, predpomnilnik) == ts.izracunaj_narocilo(narocilo)
+        except ValueError:
+            pass
+
+    def s_predpomnilnikom(narocila, velikost=10_000):
+        # Every run starts from an empty cache; returns the best time and the last cache.
+        predpomnilniki = []
+
+        def izracunaj():
+            predpomnilniki.append(ts.PredpomnilnikPonudb(velikost=velikost))
+            list(ts.izracunaj_narocila(narocila, predpomnilnik=predpomnilniki[-1]))
+        return izmeri(izracunaj, 3), predpomnilniki[-1]
+
+    t_brez = izmeri(lambda: list(ts.izracunaj_narocila(narocila)), 3)
+    t_s, predpomnilnik = s_predpomnilnikom(narocila)
+    statistika = predpomnilnik.statistika()
+    t_premesan, premesan = s_predpomnilnikom(premesana)
+    t_majhen, majhen = s_predpomnilnikom(narocila, razlicnih // 4)
+    print(f"predpomnilnik ponudb ({n} naročil, {razlicnih} različnih)")
+    print(f"  brez:                 {t_brez * 1e6 / n:6.2f} µs/naročilo")
+    print(f"  s predpomnilnikom:    {t_s * 1e6 / n:6.2f} µs/naročilo ({t_brez / t_s:.1f}x), "
+          f"zadetkov {statistika['delez_zadetkov']:.1%}")
+    print(f"  premešani logotipi:   {t_premesan * 1e6 / n:6.2f} µs/naročilo ({t_brez / t_premesan:.1f}x), "
+          f"zadetkov {premesan.statistika()['delez_zadetkov']:.1%}")
+    print(f"  velikost {majhen.velikost:5d}:       {t_majhen * 1e6 / n:6.2f} µs/naročilo "
+          f"({t_brez / t_majhen:.1f}x), zadetkov {majhen.statistika()['delez_zadetkov']:.1%}, "
+          f"izrinjenih {majhen.izrinjeni}")
+
+# === ZBIRKA MERITEV ===
+_OSNOVA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_osnova.json")
+
+# Common logo placements as (sirina, visina) in cm: chest, pocket, sleeve, back, full front.
+_POLOZAJI_LOGOTIPOV = [(10, 10), (8, 5), (7, 7), (28, 30), (30, 40), (12.5, 6), (20, 9), (5, 5)]
+
+def sinteticna_narocila(n, seme=1, delez_dtf=0.6, maks_logotipov=12):
+    """Yield ``n`` realistic order rows from a seeded generator.
+
+    Promotional orders pick a price tier of any promocijski_material item
+    and a quantity inside it, so every tier is exercised. DTF orders take a
+    garment from the catalogue (or none), a quantity within its tier and
+    1..``maks_logotipov`` logos, mostly standard placements printed on
+    every garment, some odd sizes, and ask for packing one time in five.
+    """
+    rnd = random.Random(seme)
+    promocije = [(izdelek, [(razpon["min"], razpon["max"]) for razpon in ts.ceniki[ime]])
+                 for izdelek, ime in ts.promocijski_material.items()]
+    majice = [(razpon["ime"], razpon["min"], razpon["max"]) for razpon in ts.ceniki["majice"]]
+    for st in range(n):
+        podjetje = f"Podjetje {rnd.randrange(1000)}"
+        if rnd.random() >= delez_dtf:
+            izdelek, razponi = rnd.choice(promocije)
+            najmanj, najvec = rnd.choice(razponi)
+            yield {"tip": "promocija", "podjetje": podjetje, "izdelek": izdelek,
+                   "kolicina": rnd.randint(najmanj, najvec)}
+            continue
+        if rnd.random() < 0.9:
+            izdelek, najmanj, najvec = rnd.choice(majice)
+        else:
+            izdelek, najmanj, najvec = "ne potrebujem ga", 1, 500
+        kolicina = rnd.randint(najmanj, najvec)
+        logotipi = []
+        for _ in range(min(maks_logotipov, 1 + int(rnd.expovariate(0.5)))):
+            if rnd.random() < 0.8:
+                sirina, visina = rnd.choice(_POLOZAJI_LOGOTIPOV)
+            else:
+                sirina, visina = round(rnd.uniform(3, 40), 1), round(rnd.uniform(3, 40), 1)
+            logotipi.append([sirina, visina, kolicina * rnd.choice((1, 1, 1, 2))])
+        yield {"tip": "dtf", "podjetje": podjetje, "izdelek": izdelek, "kolicina": kolicina,
+               "logotipi": logotipi, "zlaganje": rnd.random() < 0.2}
+
+def _referenca_cpu(n=20_000):
+    """Seconds for a fixed pure-Python loop, the yardstick of the CPU-bound stages."""
+    najboljse = float("inf")
+    for _ in range(3):
+        zacetek = time.perf_counter()
+        slovar = {}
+        vsota = 0.0
+        for i in range(n):
+            kljuc = i & 255
+            slovar[kljuc] = slovar.get(kljuc, 0) + 1
+            vsota += i // 7 * 1.5
+        f"{vsota:.2f}"
+        najboljse = min(najboljse, time.perf_counter() - zacetek)
+    return najboljse
+
+def _referenca_diska(mapa, n=100):
+    """Seconds to create and write ``n`` small files in ``mapa``, the yardstick of stages that write files.
+
+    File creation on shared or virtual disks can vary several times over
+    within a minute, more than this yardstick cancels, so such stages are
+    reported but not checked (see zazeni_zbirko).
+    """
+    najboljse = float("inf")
+    for _ in range(3):
+        with tempfile.TemporaryDirectory(dir=mapa) as podmapa:
+            zacetek = time.perf_counter()
+            for i in range(n):
+                with open(os.path.join(podmapa, f"{i}.txt"), "w", encoding="utf-8") as f:
+                    f.write("x" * 400)
+            najboljse = min(najboljse, time.perf_counter() - zacetek)
+    return najboljse
+
+def _meri_stopnjo(fn, argumenti, skupina, referenca, ponovitve=5, ogrevanje=200, vzorec_pomnilnika=2000):
+    """Throughput, latency percentiles and peak memory of ``fn(*a)`` over ``argumenti``.
+
+    Calls are timed ``skupina`` at a time (per-call time is the group mean),
+    so sub-microsecond stages are not swamped by timer overhead. Of
+    ``ponovitve`` passes the fastest is reported. Absolute numbers depend on
+    the machine and on whatever else it is doing, so right before every pass
+    ``referenca()`` times a fixed workload; ``relativno`` and
+    ``p50_relativno`` are the medians over the passes of the time per call
+    and of the p50 in those units. Those are what primerjaj() checks.
+    Peak memory is traced on a separate pass over the first
+    ``vzorec_pomnilnika`` calls.
+    """
+    for a in argumenti[:ogrevanje]:
+        fn(*a)
+    skupaj = float("inf")
+    razmerja, razmerja_p50 = [], []
+    for _ in range(ponovitve):
+        enota = referenca()
+        casi_prehoda = []
+        zacetek = time.perf_counter()
+        for i in range(0, len(argumenti), skupina):
+            kos = argumenti[i:i + skupina]
+            zacetek_kosa = time.perf_counter_ns()
+            for a in kos:
+                fn(*a)
+            casi_prehoda.append((time.perf_counter_ns() - zacetek_kosa) / len(kos) / 1000)
+        trajanje = time.perf_counter() - zacetek
+        razmerja.append(trajanje / len(argumenti) / enota)
+        razmerja_p50.append(ts.percentil(casi_prehoda, 50) / 1e6 / enota)
+        if trajanje < skupaj:
+            skupaj, casi = trajanje, casi_prehoda
+    tracemalloc.start()
+    for a in argumenti[:vzorec_pomnilnika]:
+        fn(*a)
+    _, vrh = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "n": len(argumenti),
+        "na_sekundo": round(len(argumenti) / skupaj, 1),
+        "relativno": round(ts.percentil(razmerja, 50), 6),
+        "p50_relativno": round(ts.percentil(razmerja_p50, 50), 6),
+        "p50_us": round(ts.percentil(casi, 50), 3),
+        "p95_us": round(ts.percentil(casi, 95), 3),
+        "p99_us": round(ts.percentil(casi, 99), 3),
+        "vrh_pomnilnika_kib": round(vrh / 1024, 1),
+    }
+
+def zazeni_zbirko(n=20_000, seme=1):
+    """Run every pricing stage on the same synthetic orders and return the results as a dict."""
+    narocila = list(sinteticna_narocila(n, seme))
+    promocije = [(o["izdelek"], o["kolicina"]) for o in narocila if o["tip"] == "promocija"]
+    dtf = [(o["izdelek"], o["kolicina"], ts._preberi_logotipe(o["logotipi"]), o["zlaganje"])
+           for o in narocila if o["tip"] == "dtf"]
+    majice = ts.ceniki["majice"]
+    razponi = [(ts.ceniki[ts.promocijski_material[izdelek]], kolicina, None) for izdelek, kolicina in promocije]
+    razponi += [(majice, kolicina, izdelek) for izdelek, kolicina, _, _ in dtf if izdelek in majice]
+    random.Random(seme).shuffle(razponi)
+    rezultati_dtf = [ts.izracunaj_dtf(izdelek, kolicina, logotipi) for izdelek, kolicina, logotipi, _ in dtf]
+    cenik_dtf = ts.ceniki["dtf"]
+
+    def postavitve(logotipi):
+        for i, logotip in enumerate(logotipi, 1):
+            ts.postavitev_logotipa(i, *logotip)
+
+    stopnje = {}
+    with tempfile.TemporaryDirectory() as mapa:
+        def disk():
+            return _referenca_diska(mapa)
+
+        vse = [
+            ("poisci_razpon", ts.poisci_razpon, razponi, 256, _referenca_cpu),
+            ("interpoliraj_ceno", ts.interpoliraj_ceno,
+             [(rezultat["dolzina_m"], cenik_dtf) for rezultat in rezultati_dtf], 256, _referenca_cpu),
+            ("postavitev_logotipov", postavitve, [(logotipi,) for _, _, logotipi, _ in dtf], 16, _referenca_cpu),
+            ("izracunaj_promocijo", ts.izracunaj_promocijo, promocije, 64, _referenca_cpu),
+            ("izracunaj_dtf", ts.izracunaj_dtf, [a[:3] for a in dtf], 16, _referenca_cpu),
+            ("zlaganje", ts.izracunaj_dtf, [a for a in dtf if a[3]], 4, _referenca_cpu),
+            ("izracunaj_narocilo", ts.izracunaj_narocilo, [(o,) for o in narocila], 16, _referenca_cpu),
+            ("save_to_file", lambda *zapis: ts.save_to_file(*zapis, mapa=mapa),
+             [ts.zapis_ponudbe({"podjetje": f"Podjetje {st}", **rezultat})
+              for st, rezultat in enumerate(rezultati_dtf[:5000])], 1, disk),
+        ]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for ime, fn, argumenti, skupina, referenca in vse:
+                stopnje[ime] = _meri_stopnjo(fn, argumenti, skupina, referenca)
+                # Disk timings are too noisy to fail a run on; they are still printed.
+                stopnje[ime]["preverjeno"] = referenca is _referenca_cpu
+    return {
+        "meta": {
+            "cas": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platforma": platform.platform(),
+            "numpy": ts._numpy() is not None,
+            "narocil": n,
+            "seme": seme,
+        },
+        "stopnje": stopnje,
+    }
+
+def primerjaj(rezultati, osnova, prag=0.3):
+    """Print every stage next to ``osnova`` and return the names of stages that regressed.
+
+    A stage regresses when its time per call or p50 latency, both in units
+    of the reference loop timed in the same run (see _meri_stopnjo), or its
+    peak memory grows by more than ``prag`` (a fraction). Stages measured
+    against the disk are printed but never count. Absolute throughput is
+    printed for information only.
+    """
+    if osnova["meta"].get("platforma") != rezultati["meta"]["platforma"]:
+        print(f"  ⚠ osnova je z druge platforme ({osnova['meta'].get('platforma')})")
+    regresije = []
+    for ime, zdaj in rezultati["stopnje"].items():
+        prej = osnova["stopnje"].get(ime)
+        if prej is None or "relativno" not in prej:
+            print(f"  {ime:22} (ni v osnovi, shrani jo z --shrani-osnovo)")
+            continue
+        slabse = (zdaj["relativno"] > prej["relativno"] * (1 + prag)
+                  or zdaj["p50_relativno"] > prej["p50_relativno"] * (1 + prag)
+                  or zdaj["vrh_pomnilnika_kib"] > prej["vrh_pomnilnika_kib"] * (1 + prag) + 64)
+        if not zdaj.get("preverjeno", True):
+            oznaka = "ℹ (disk, ni preverjeno)"
+        elif slabse:
+            regresije.append(ime)
+            oznaka = "❌"
+        else:
+            oznaka = "✅"
+        print(f"  {ime:22} {zdaj['relativno'] / prej['relativno'] - 1:+7.1%} čas na klic, "
+              f"p50 {zdaj['p50_relativno'] / prej['p50_relativno'] - 1:+7.1%}, "
+              f"pomnilnik {zdaj['vrh_pomnilnika_kib'] - prej['vrh_pomnilnika_kib']:+8.1f} KiB "
+              f"{oznaka}")
+    return regresije
+
+def bench_zbirka(n=20_000, seme=1, json_pot=None, osnova=_OSNOVA, shrani_osnovo=False, prag=0.3):
+    """The pricing benchmark suite: per-stage throughput, percentiles and memory, against a baseline.
+
+    Returns True when a stage regressed against the stored ``osnova``.
+    """
+    rezultati = zazeni_zbirko(n, seme)
+    print(f"zbirka meritev ({n} naročil, seme {seme})")
+    print(f"  {'stopnja':22} {'na sekundo':>12} {'p50 µs':>9} {'p95 µs':>9} {'p99 µs':>9} {'vrh KiB':>9}")
+    for ime, s in rezultati["stopnje"].items():
+        print(f"  {ime:22} {s['na_sekundo']:12,.0f} {s['p50_us']:9.2f} {s['p95_us']:9.2f} "
+              f"{s['p99_us']:9.2f} {s['vrh_pomnilnika_kib']:9.1f}")
+    for pot in filter(None, (json_pot, osnova if shrani_osnovo else None)):
+        with open(pot, "w", encoding="utf-8") as f:
+            json.dump(rezultati, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"  rezultati shranjeni v {pot}")
+    if shrani_osnovo or not osnova or not os.path.exists(osnova):
+        return False
+    with open(osnova, encoding="utf-8") as f:
+        shranjena = json.load(f)
+    print(f"  primerjava z osnovo {os.path.basename(osnova)} ({shranjena['meta']['cas']}):")
+    regresije = primerjaj(rezultati, shranjena, prag)
+    if regresije:
+        print(f"  ❌ poslabšanje: {', '.join(regresije)}")
+    return bool(regresije)
+
+# === SKUPNO NAROČILO ===
+def _postavke(n, seme=1):
+    """``n`` order lines that stay inside the price tiers however many there are."""
+    rnd = random.Random(seme)
+    majice = [razpon["ime"] for razpon in ts.ceniki["majice"]]
+    postavke = []
+    for st in range(n):
+        izbira = rnd.random()
+        if izbira < 0.15:
+            postavke.append({"tip": "promocija", "izdelek": "dotisk na bloke", "kolicina": rnd.randint(1, 3)})
+        elif izbira < 0.3:
+            postavke.append({"tip": "dtf", "izdelek": majice[st % len(majice)], "kolicina": 1,
+                             "logotipi": [[10, 10, 1]]})
+        else:
+            postavke.append({"tip": "dtf", "izdelek": "ne potrebujem ga", "kolicina": 1,
+                             "logotipi": [[rnd.choice([5, 8, 10]), rnd.choice([4, 6, 9]), rnd.randint(1, 3)]
+                                          for _ in range(rnd.randint(1, 3))]})
+    return postavke
+
+def bench_skupno(velikosti=(10, 100, 1000, 10_000), seme=1):
+    """izracunaj_skupno on growing orders (time per line should stay flat) and its saving over line-by-line quotes."""
+    print("skupno naročilo")
+    for n in velikosti:
+        postavke = _postavke(n, seme)
+        cas = izmeri(lambda: ts.izracunaj_skupno(postavke), 3)
+        print(f"  {n:6d} postavk: {cas * 1000:8.2f} ms, {cas * 1e6 / n:6.2f} µs/postavko")
+    rnd = random.Random(seme)
+    postavke = [{"tip": "promocija", "izdelek": rnd.choice(list(ts.promocijski_material)), "kolicina": rnd.randint(5, 40)}
+                for _ in range(8)]
+    postavke += [{"tip": "dtf", "izdelek": "venice pro", "kolicina": 10, "logotipi": [[10, 10, 10]]} for _ in range(4)]
+    posamezno = sum(ts.izracunaj_narocilo(postavka)["prodaja"] for postavka in postavke)
+    skupno = ts.izracunaj_skupno(postavke)["prodaja"]
+    print(f"  {len(postavke)} postavk posamezno {posamezno:.2f} €, skupno {skupno:.2f} € "
+          f"({1 - skupno / posamezno:.0%} ceneje)")
+
+# === POROČILA ===
+def _ponudbe(n, seme=1):
+    """Priced result records for the first ``n`` valid random orders, generated lazily."""
+    for rezultat in ts.izracunaj_narocila(nakljucna_narocila(n, seme)):
+        if "napaka" not in rezultat:
+            yield rezultat
+
+def bench_porocila(velikosti=(1000, 10_000), seme=1):
+    """Streaming CSV + PDF offers: time per quote and peak memory as the batch grows, and the shared template."""
+    print("poročila (CSV + PDF)")
+    with tempfile.TemporaryDirectory() as mapa:
+        for n in velikosti:
+            tracemalloc.start()
+            zacetek = time.perf_counter()
+            st = ts.zapisi_porocila(_ponudbe(n, seme), os.path.join(mapa, f"{n}.csv"), os.path.join(mapa, str(n)))
+            cas = time.perf_counter() - zacetek
+            _, vrh = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  {st:6d} ponudb: {cas * 1e6 / st:7.1f} µs/ponudbo, vrh pomnilnika {vrh / 1024:7.1f} KiB")
+        rezultati = list(_ponudbe(2000, seme))
+        predloga = ts.PredlogaPDF()
+        skupna = izmeri(lambda: [predloga.zapisi(io.BytesIO(), r) for r in rezultati], 3)
+        nova = izmeri(lambda: [ts.PredlogaPDF().zapisi(io.BytesIO(), r) for r in rezultati], 3)
+        print(f"  PDF v pomnilnik: skupna predloga {skupna * 1e6 / len(rezultati):6.1f} µs/ponudbo, "
+              f"nova za vsako {nova * 1e6 / len(rezultati):6.1f} µs/ponudbo")
+
+# === DNEVNI NAČRT TISKA ===
+def bench_nacrt(velikosti=(100, 300, 1000), seme=1):
+    """nacrtuj_tisk on a day of small DTF orders: planning time and film and price saved against separate runs."""
+    print("dnevni načrt tiska")
+    for n in velikosti:
+        rnd = random.Random(seme)
+        narocila = [{"tip": "dtf", "podjetje": f"Podjetje {st}",
+                     "logotipi": [[rnd.choice([5, 8, 10, 12.5, 20]), rnd.choice([4, 6, 9, 15]), rnd.randint(1, 40)]
+                                  for _ in range(rnd.randint(1, 3))]}
+                    for st in range(n)]
+        for zlaganje in (True, False):
+            nacrt = None
+
+            def nacrtuj():
+                nonlocal nacrt
+                nacrt = ts.nacrtuj_tisk(narocila, zlaganje)
+
+            cas = izmeri(nacrtuj, 3)
+            skupaj = nacrt["skupaj"]
+            print(f"  {n:5d} naročil, {'zlaganje' if zlaganje else 'površina'}: {cas * 1000:7.1f} ms, "
+                  f"{skupaj['zagonov']} zagonov, {skupaj['dolzina_m']:.1f} m namesto {skupaj['samostojno_m']:.1f} m, "
+                  f"{skupaj['dtf_prodaja']:.2f} € namesto {skupaj['samostojno_prodaja']:.2f} €")
+
+# === OBRATNI IZRAČUN ===
+def _najvec_z_nastevanjem(izdelek, proracun, najvec):
+    """The by-hand answer: quote every quantity and keep the largest within budget."""
+    najboljsa = None
+    for kolicina in range(1, najvec + 1):
+        try:
+            if ts.izracunaj_promocijo(izdelek, kolicina)["prodaja"] <= proracun:
+                najboljsa = kolicina
+        except ValueError:
+            pass
+    return najboljsa
+
+def bench_obratno(n=2000, seme=1):
+    """Budget -> quantity for every product at once: bisect solver against quoting each quantity."""
+    rnd = random.Random(seme)
+    proracuni = [rnd.uniform(20, 120) for _ in range(n)]
+    najvec = {izdelek: max(r["max"] for r in ts.ceniki[ime]) for izdelek, ime in ts.promocijski_material.items()}
+    for proracun in proracuni[:20]:
+        for r in ts.obratni_izracun(proracun, artikli=list(ts.promocijski_material)):
+            assert r["kolicina"] == _najvec_z_nastevanjem(r["artikel"], proracun, najvec[r["artikel"]])
+
+    st = 20
+    t_nast = izmeri(lambda: [_najvec_z_nastevanjem(izdelek, proracun, najvec[izdelek])
+                             for proracun in proracuni[:st] for izdelek in najvec])
+    t_bis = izmeri(lambda: [ts.obratni_izracun(proracun) for proracun in proracuni], 3)
+    print(f"obratni izračun ({len(najvec)} izdelkov + DTF na vprašanje)")
+    print(f"  naštevanje: {t_nast * 1e3 / st:8.3f} ms/vprašanje (brez DTF)")
+    print(f"  bisekcija:  {t_bis * 1e3 / n:8.3f} ms/vprašanje ({t_nast / st / (t_bis / n):.0f}x)")
+
+# === ZAGON ===
+_TAKOJ = (
+    "import asyncio, concurrent.futures\n"
+    "try:\n    import numpy\nexcept ImportError:\n    pass\n"
+    "import runpy, sys; sys.argv = [{pot!r}] + {argumenti!r}; runpy.run_path({pot!r}, run_name='__main__')"
+)
+
+def bench_zagon(ponovitve=20):
+    """Wall time of one ``quote`` invocation, against the same run with every module imported up front."""
+    ukazi = {
+        "quote promo": ["quote", "promo", "vizitke", "120"],
+        "quote dtf": ["quote", "dtf", "backfire", "20", "-l", "10x5x20", "-l", "8x8x20"],
+    }
+    okolje = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+
+    def zazeni(argumenti):
+        subprocess.run(argumenti, check=True, env=okolje, stdout=subprocess.DEVNULL)
+
+    prazen = izmeri(lambda: zazeni([sys.executable, "-c", "pass"]), ponovitve)
+    print(f"zagon procesa (najboljši od {ponovitve}, prazen interpreter {prazen * 1000:.1f} ms)")
+    for ime, argumenti in ukazi.items():
+        t_takoj = izmeri(lambda: zazeni([sys.executable, "-c", _TAKOJ.format(pot=_POT, argumenti=argumenti)]),
+                         ponovitve)
+        t_leno = izmeri(lambda: zazeni([sys.executable, _POT] + argumenti), ponovitve)
+        print(f"  {ime}: uvozi vnaprej {t_takoj * 1000:7.1f} ms, leno {t_leno * 1000:7.1f} ms "
+              f"({(t_takoj - t_leno) * 1000:.1f} ms manj)")
+
+# === MERITVE ===
+def bench_meritve(n=50_000, seme=1):
+    """Cost of the instrumentation on the serial pricing path, switched off and on."""
+    narocila = list(sinteticna_narocila(n, seme))
+
+    def izracunaj():
+        for _ in ts.izracunaj_narocila(narocila):
+            pass
+
+    t_izklopljeno = izmeri(izracunaj, 3)
+    ts.meritve.vklopi()
+    try:
+        t_vklopljeno = izmeri(izracunaj, 3)
+    finally:
+        ts.meritve.izklopi()
+    klici = sum(s["klici"] for s in ts.meritve.posnetek().values()) / 3  # per pass
+    ts.meritve.ponastavi()
+    print(f"meritve ({n} naročil, {klici / n:.1f} merjenih klicev/naročilo)")
+    print(f"  izklopljeno: {t_izklopljeno * 1e6 / n:6.2f} µs/naročilo")
+    print(f"  vklopljeno:  {t_vklopljeno * 1e6 / n:6.2f} µs/naročilo "
+          f"(+{(t_vklopljeno - t_izklopljeno) * 1e9 / klici:.0f} ns/klic)")
+
+BENCHMARKI = {
+    "razpon": bench_razpon,
+    "paket": bench_paket,
+    "delavci": bench_delavci,
+    "dtf_paket": bench_dtf_paket,
+    "zlaganje": bench_zlaganje,
+    "interpolacija": bench_interpolacija,
+    "denar": bench_denar,
+    "ceniki": bench_ceniki,
+    "katalog": bench_katalog,
+    "imena": bench_imena,
+    "zapisovanje": bench_zapisovanje,
+    "mape": bench_mape,
+    "knjiga": bench_knjiga,
+    "priloge": bench_priloge,
+    "storitev": bench_storitev,
+    "predpomnilnik": bench_predpomnilnik,
+    "meritve": bench_meritve,
+    "skupno": bench_skupno,
+    "porocila": bench_porocila,
+    "obratno": bench_obratno,
+    "nacrt": bench_nacrt,
+    "zagon": bench_zagon,
+    "zbirka": bench_zbirka,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Meritve izračuna ponudb.")
+    parser.add_argument("imena", nargs="*", metavar="ime",
+                        help=f"meritve za zagon (privzeto vse): {', '.join(BENCHMARKI)}")
+    parser.add_argument("--seme", type=int, default=1, help="seme generatorja naročil za zbirko")
+    parser.add_argument("--json", metavar="POT", help="shrani rezultate zbirke v POT")
+    parser.add_argument("--osnova", metavar="POT", default=_OSNOVA, help="osnova za primerjavo zbirke")
+    parser.add_argument("--shrani-osnovo", action="store_true", help="zapiši rezultate zbirke kot novo osnovo")
+    parser.add_argument("--prag", type=float, default=0.3, help="dovoljeno poslabšanje (delež, privzeto 0.3)")
+    args = parser.parse_args()
+    neznane = [ime for ime in args.imena if ime not in BENCHMARKI]
+    if neznane:
+        parser.error(f"neznane meritve: {', '.join(neznane)}")
+    regresije = False
+    for ime in args.imena or list(BENCHMARKI):
+        if ime == "zbirka":
+            regresije = bench_zbirka(seme=args.seme, json_pot=args.json, osnova=args.osnova,
+                                     shrani_osnovo=args.shrani_osnovo, prag=args.prag)
+        else:
+            BENCHMARKI[ime]()
+    sys.exit(1 if regresije else 0)
@@ -1,331 +1,2467 @@
 import os
+import sys
 import math
+import bisect
 import re
 import shutil
+import csv
+import json
+import argparse
+import array
+import collections
+import contextlib
+import hashlib
+import io
+import operator
+import pickle
+import queue
+import threading
+import time
+import unicodedata
+
+# asyncio (serve), concurrent.futures (batch -j) and NumPy are imported where
+# they are used: together they are most of the start-up time of a single quote.
+np = None  # set by _numpy() on first use; optional, only for izracunaj_dtf_paket
+_numpy_preverjen = False
+
+def _numpy():
+    """Import NumPy on first use and return it, or None when it is not installed."""
+    global np, _numpy_preverjen
+    if not _numpy_preverjen:
+        _numpy_preverjen = True
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+    return np
 
 # === CENIKI ===
-cenik_gravura = [
-    {"min": 1, "max": 25, "dobava": 20, "prodaja": 28},
-    {"min": 26, "max": 50, "dobava": 25, "prodaja": 35},
-    {"min": 51, "max": 100, "dobava": 30, "prodaja": 42},
-    {"min": 101, "max": 150, "dobava": 40, "prodaja": 56},
-    {"min": 151, "max": 200, "dobava": 45, "prodaja": 63},
-    {"min": 201, "max": 250, "dobava": 50, "prodaja": 70},
-    {"min": 251, "max": 300, "dobava": 55, "prodaja": 77},
-    {"min": 301, "max": 400, "dobava": 65, "prodaja": 85},
-    {"min": 401, "max": 1000, "dobava": 160, "prodaja": 220}
-]
-
-cenik_bloki = [
-    {"min": 1, "max": 10, "dobava": 30, "prodaja": 42},
-    {"min": 11, "max": 20, "dobava": 40, "prodaja": 56},
-    {"min": 21, "max": 30, "dobava": 43, "prodaja": 61},
-    {"min": 31, "max": 40, "dobava": 45, "prodaja": 63},
-    {"min": 41, "max": 49, "dobava": 49, "prodaja": 69},
-    {"min": 50, "max": 59, "dobava": 55, "prodaja": 77},
-    {"min": 60, "max": 69, "dobava": 66, "prodaja": 93},
-    {"min": 70, "max": 79, "dobava": 77, "prodaja": 108},
-    {"min": 80, "max": 99, "dobava": 88, "prodaja": 124},
-    {"min": 100, "max": 149, "dobava": 110, "prodaja": 154},
-    {"min": 150, "max": 9999, "dobava": 165, "prodaja": 231}
-]
-
-cenik_vzigalniki = [
-    {"min": 1, "max": 50, "dobava": 25, "prodaja": 35},
-    {"min": 51, "max": 100, "dobava": 35, "prodaja": 49},
-    {"min": 101, "max": 150, "dobava": 45, "prodaja": 63},
-    {"min": 151, "max": 200, "dobava": 55, "prodaja": 77},
-    {"min": 201, "max": 250, "dobava": 65, "prodaja": 91},
-    {"min": 251, "max": 300, "dobava": 75, "prodaja": 105}
-]
-
-cenik_vizitke = [
-    {"min": 1, "max": 50, "dobava": 15, "prodaja": 21},
-    {"min": 51, "max": 100, "dobava": 20, "prodaja": 28},
-    {"min": 101, "max": 150, "dobava": 25, "prodaja": 35},
-    {"min": 151, "max": 200, "dobava": 30, "prodaja": 42},
-    {"min": 201, "max": 300, "dobava": 35, "prodaja": 49},
-    {"min": 301, "max": 500, "dobava": 40, "prodaja": 56},
-    {"min": 501, "max": 1000, "dobava": 65, "prodaja": 91}
-]
-
-cenik_letaki = [
-    {"min": 1, "max": 50, "dobava": 25, "prodaja": 35},
-    {"min": 51, "max": 100, "dobava": 30, "prodaja": 42},
-    {"min": 101, "max": 200, "dobava": 45, "prodaja": 63},
-    {"min": 201, "max": 300, "dobava": 55, "prodaja": 77},
-    {"min": 301, "max": 500, "dobava": 65, "prodaja": 91},
-    {"min": 501, "max": 1000, "dobava": 90, "prodaja": 126},
-    {"min": 1001, "max": 2000, "dobava": 160, "prodaja": 224}
-]
-
-# T-shirt price lists
-cenik_majice = [
-    {"ime": "backfire", "min": 1, "max": 100, "dobava": 5.22, "prodaja": 6.26},
-    {"ime": "beverly", "min": 1, "max": 100, "dobava": 5.95, "prodaja": 7.14},
-    {"ime": "corporate", "min": 1, "max": 100, "dobava": 7.94, "prodaja": 9.53},
-    {"ime": "fencer", "min": 1, "max": 100, "dobava": 5.22, "prodaja": 6.26},
-    {"ime": "flag", "min": 1, "max": 100, "dobava": 5.40, "prodaja": 6.48},
-    {"ime": "flextop", "min": 1, "max": 100, "dobava": 5.22, "prodaja": 6.26},
-    {"ime": "florida", "min": 1, "max": 100, "dobava": 6.04, "prodaja": 7.25},
-    {"ime": "florida fluo", "min": 1, "max": 100, "dobava": 8.24, "prodaja": 9.89},
-    {"ime": "free", "min": 1, "max": 100, "dobava": 4.67, "prodaja": 5.60},
-    {"ime": "free lady", "min": 1, "max": 100, "dobava": 4.67, "prodaja": 5.60},
-    {"ime": "free lady melange", "min": 1, "max": 100, "dobava": 4.67, "prodaja": 5.60},
-    {"ime": "free melange", "min": 1, "max": 100, "dobava": 4.67, "prodaja": 5.60},
-    {"ime": "look", "min": 1, "max": 100, "dobava": 4.58, "prodaja": 5.50},
-    {"ime": "look man", "min": 1, "max": 100, "dobava": 5.31, "prodaja": 6.37},
-    {"ime": "party", "min": 1, "max": 100, "dobava": 5.22, "prodaja": 6.26},
-    {"ime": "party lady", "min": 1, "max": 100, "dobava": 5.22, "prodaja": 6.26},
-    {"ime": "pineta", "min": 1, "max": 100, "dobava": 8.11, "prodaja": 9.73},
-    {"ime": "pineta lady", "min": 1, "max": 100, "dobava": 8.11, "prodaja": 9.73},
-    {"ime": "pineta melange", "min": 1, "max": 100, "dobava": 8.11, "prodaja": 9.73},
-    {"ime": "print (white)", "min": 1, "max": 100, "dobava": 3.57, "prodaja": 4.28},
-    {"ime": "print (others)", "min": 1, "max": 100, "dobava": 3.97, "prodaja": 4.76},
-    {"ime": "print melange", "min": 1, "max": 100, "dobava": 3.97, "prodaja": 4.76},
-    {"ime": "print lady (white)", "min": 1, "max": 100, "dobava": 3.29, "prodaja": 3.95},
-    {"ime": "print lady (others)", "min": 1, "max": 100, "dobava": 3.57, "prodaja": 4.28},
-    {"ime": "runner", "min": 1, "max": 100, "dobava": 4.12, "prodaja": 4.94},
-    {"ime": "runner lady", "min": 1, "max": 100, "dobava": 3.76, "prodaja": 4.51},
-    {"ime": "running", "min": 1, "max": 100, "dobava": 8.24, "prodaja": 9.89},
-    {"ime": "running lady", "min": 1, "max": 100, "dobava": 8.24, "prodaja": 9.89},
-    {"ime": "shore", "min": 1, "max": 100, "dobava": 4.65, "prodaja": 5.58},
-    {"ime": "smash", "min": 1, "max": 100, "dobava": 6.87, "prodaja": 8.24},
-    {"ime": "sound+", "min": 1, "max": 100, "dobava": 5.22, "prodaja": 6.26},
-    {"ime": "sound+ lady", "min": 1, "max": 100, "dobava": 5.22, "prodaja": 6.26},
-    {"ime": "sunrise", "min": 1, "max": 100, "dobava": 5.51, "prodaja": 6.61},
-    {"ime": "sunrise lady", "min": 1, "max": 100, "dobava": 5.51, "prodaja": 6.61},
-    {"ime": "sunrise lady melange", "min": 1, "max": 100, "dobava": 5.51, "prodaja": 6.61},
-    {"ime": "sunrise melange", "min": 1, "max": 100, "dobava": 5.51, "prodaja": 6.61},
-    {"ime": "sunset (others)", "min": 1, "max": 100, "dobava": 4.41, "prodaja": 5.29},
-    {"ime": "sunset (camouflage)", "min": 1, "max": 100, "dobava": 6.13, "prodaja": 7.36},
-    {"ime": "sunset fluo", "min": 1, "max": 100, "dobava": 6.13, "prodaja": 7.36},
-    {"ime": "sunset lady (others)", "min": 1, "max": 100, "dobava": 4.41, "prodaja": 5.29},
-    {"ime": "sunset lady (camouflage)", "min": 1, "max": 100, "dobava": 6.13, "prodaja": 7.36},
-    {"ime": "sunset lady melange", "min": 1, "max": 100, "dobava": 4.41, "prodaja": 5.29},
-    {"ime": "sunset melange", "min": 1, "max": 100, "dobava": 4.41, "prodaja": 5.29},
-    {"ime": "v-neck", "min": 1, "max": 100, "dobava": 4.67, "prodaja": 5.60},
-    {"ime": "v-neck lady", "min": 1, "max": 100, "dobava": 4.67, "prodaja": 5.60},
-    {"ime": "v-neck lady melange", "min": 1, "max": 100, "dobava": 4.67, "prodaja": 5.60},
-    {"ime": "v-neck melange", "min": 1, "max": 100, "dobava": 4.67, "prodaja": 5.60},
-    {"ime": "young", "min": 1, "max": 100, "dobava": 5.22, "prodaja": 6.26},
-    {"ime": "young lady", "min": 1, "max": 100, "dobava": 5.22, "prodaja": 6.26},
-    {"ime": "amalfi", "min": 1, "max": 100, "dobava": 8.60, "prodaja": 10.32},
-    {"ime": "amalfi melange", "min": 1, "max": 100, "dobava": 8.60, "prodaja": 10.32},
-    {"ime": "aviazione", "min": 1, "max": 100, "dobava": 14.30, "prodaja": 17.16},
-    {"ime": "aviazione melange", "min": 1, "max": 100, "dobava": 14.30, "prodaja": 17.16},
-    {"ime": "cambridge", "min": 1, "max": 100, "dobava": 12.81, "prodaja": 15.37},
-    {"ime": "cambridge melange", "min": 1, "max": 100, "dobava": 12.81, "prodaja": 15.37},
-    {"ime": "company", "min": 1, "max": 100, "dobava": 14.46, "prodaja": 17.35},
-    {"ime": "chic", "min": 1, "max": 100, "dobava": 13.72, "prodaja": 16.46},
-    {"ime": "florence", "min": 1, "max": 100, "dobava": 14.19, "prodaja": 17.03},
-    {"ime": "florence lady", "min": 1, "max": 100, "dobava": 14.19, "prodaja": 17.03},
-    {"ime": "florence lady melange", "min": 1, "max": 100, "dobava": 14.19, "prodaja": 17.03},
-    {"ime": "florence melange", "min": 1, "max": 100, "dobava": 14.19, "prodaja": 17.03},
-    {"ime": "france", "min": 1, "max": 100, "dobava": 12.72, "prodaja": 15.26},
-    {"ime": "glamour", "min": 1, "max": 100, "dobava": 12.36, "prodaja": 14.83},
-    {"ime": "italia", "min": 1, "max": 100, "dobava": 12.72, "prodaja": 15.26},
-    {"ime": "italia melange", "min": 1, "max": 100, "dobava": 12.72, "prodaja": 15.26},
-    {"ime": "leeds", "min": 1, "max": 100, "dobava": 12.81, "prodaja": 15.37},
-    {"ime": "leeds melange", "min": 1, "max": 100, "dobava": 12.81, "prodaja": 15.37},
-    {"ime": "long nation", "min": 1, "max": 100, "dobava": 16.02, "prodaja": 19.22},
-    {"ime": "long nation lady", "min": 1, "max": 100, "dobava": 16.02, "prodaja": 19.22},
-    {"ime": "long nation lady melange", "min": 1, "max": 100, "dobava": 16.02, "prodaja": 19.22},
-    {"ime": "long nation melange", "min": 1, "max": 100, "dobava": 16.02, "prodaja": 19.22},
-    {"ime": "memphis", "min": 1, "max": 100, "dobava": 11.90, "prodaja": 14.28},
-    {"ime": "memphis lady", "min": 1, "max": 100, "dobava": 11.90, "prodaja": 14.28},
-    {"ime": "nation", "min": 1, "max": 100, "dobava": 13.72, "prodaja": 16.46},
-    {"ime": "nation lady", "min": 1, "max": 100, "dobava": 13.72, "prodaja": 16.46},
-    {"ime": "nation lady melange", "min": 1, "max": 100, "dobava": 13.72, "prodaja": 16.46},
-    {"ime": "nation melange", "min": 1, "max": 100, "dobava": 13.72, "prodaja": 16.46},
-    {"ime": "nautic", "min": 1, "max": 100, "dobava": 12.36, "prodaja": 14.83},
-    {"ime": "nautic lady", "min": 1, "max": 100, "dobava": 12.36, "prodaja": 14.83},
-    {"ime": "prestige", "min": 1, "max": 100, "dobava": 12.36, "prodaja": 14.83},
-    {"ime": "prestige melange", "min": 1, "max": 100, "dobava": 12.36, "prodaja": 14.83},
-    {"ime": "rome", "min": 1, "max": 100, "dobava": 8.60, "prodaja": 10.32},
-    {"ime": "rome lady", "min": 1, "max": 100, "dobava": 8.60, "prodaja": 10.32},
-    {"ime": "rome lady melange", "min": 1, "max": 100, "dobava": 8.60, "prodaja": 10.32},
-    {"ime": "rome melange", "min": 1, "max": 100, "dobava": 8.60, "prodaja": 10.32},
-    {"ime": "skipper", "min": 1, "max": 100, "dobava": 12.72, "prodaja": 15.26},
-    {"ime": "skipper lady", "min": 1, "max": 100, "dobava": 12.72, "prodaja": 15.26},
-    {"ime": "skipper lady melange", "min": 1, "max": 100, "dobava": 12.72, "prodaja": 15.26},
-    {"ime": "spain", "min": 1, "max": 100, "dobava": 12.72, "prodaja": 15.26},
-    {"ime": "training", "min": 1, "max": 100, "dobava": 11.90, "prodaja": 14.28},
-    {"ime": "training lady", "min": 1, "max": 100, "dobava": 11.90, "prodaja": 14.28},
-    {"ime": "venice", "min": 1, "max": 100, "dobava": 10.61, "prodaja": 12.73},
-    {"ime": "venice lady", "min": 1, "max": 100, "dobava": 10.61, "prodaja": 12.73},
-    {"ime": "venice lady melange", "min": 1, "max": 100, "dobava": 10.61, "prodaja": 12.73},
-    {"ime": "venice melange", "min": 1, "max": 100, "dobava": 10.61, "prodaja": 12.73},
-    {"ime": "venice pro", "min": 1, "max": 100, "dobava": 10.61, "prodaja": 12.73},
-    {"ime": "verona", "min": 1, "max": 100, "dobava": 12.72, "prodaja": 15.26},
-    {"ime": "alabama", "min": 1, "max": 100, "dobava": 21.04, "prodaja": 25.25},
-    {"ime": "alabama melange", "min": 1, "max": 100, "dobava": 21.04, "prodaja": 25.25},
-    {"ime": "atlanta+", "min": 1, "max": 100, "dobava": 26.54, "prodaja": 31.85},
-    {"ime": "atlanta+ fluo", "min": 1, "max": 100, "dobava": 26.54, "prodaja": 31.85},
-    {"ime": "atlanta+ lady", "min": 1, "max": 100, "dobava": 26.54, "prodaja": 31.85},
-    {"ime": "atlanta+ lady fluo", "min": 1, "max": 100, "dobava": 26.54, "prodaja": 31.85},
-    {"ime": "atlanta+ lady melange", "min": 1, "max": 100, "dobava": 26.54, "prodaja": 31.85},
-    {"ime": "atlanta+ melange", "min": 1, "max": 100, "dobava": 26.54, "prodaja": 31.85},
-    {"ime": "austin", "min": 1, "max": 100, "dobava": 21.56, "prodaja": 25.87},
-    {"ime": "boxer+", "min": 1, "max": 100, "dobava": 17.38, "prodaja": 20.86},
-    {"ime": "boxer+ lady", "min": 1, "max": 100, "dobava": 17.38, "prodaja": 20.86},
-    {"ime": "canada", "min": 1, "max": 100, "dobava": 17.02, "prodaja": 20.42},
-    {"ime": "canada melange", "min": 1, "max": 100, "dobava": 17.02, "prodaja": 20.42},
-    {"ime": "carson", "min": 1, "max": 100, "dobava": 15.19, "prodaja": 18.23},
-    {"ime": "class+", "min": 1, "max": 100, "dobava": 31.48, "prodaja": 37.78},
-    {"ime": "class+ lady", "min": 1, "max": 100, "dobava": 31.48, "prodaja": 37.78},
-    {"ime": "dallas+", "min": 1, "max": 100, "dobava": 28.36, "prodaja": 34.03},
-    {"ime": "dallas+ fluo", "min": 1, "max": 100, "dobava": 28.36, "prodaja": 34.03},
-    {"ime": "dallas+ lady", "min": 1, "max": 100, "dobava": 28.36, "prodaja": 34.03},
-    {"ime": "dallas+ lady melange", "min": 1, "max": 100, "dobava": 28.36, "prodaja": 34.03},
-    {"ime": "dallas+ melange", "min": 1, "max": 100, "dobava": 28.36, "prodaja": 34.03},
-    {"ime": "derby", "min": 1, "max": 100, "dobava": 32.30, "prodaja": 38.76},
-    {"ime": "derby lady", "min": 1, "max": 100, "dobava": 32.30, "prodaja": 38.76},
-    {"ime": "hawaii+", "min": 1, "max": 100, "dobava": 22.88, "prodaja": 27.46},
-    {"ime": "hawaii+ lady", "min": 1, "max": 100, "dobava": 22.88, "prodaja": 27.46},
-    {"ime": "hoover", "min": 1, "max": 100, "dobava": 18.12, "prodaja": 21.74},
-    {"ime": "houston", "min": 1, "max": 100, "dobava": 17.53, "prodaja": 21.04},
-    {"ime": "houston melange", "min": 1, "max": 100, "dobava": 17.53, "prodaja": 21.04},
-    {"ime": "kansas", "min": 1, "max": 100, "dobava": 32.30, "prodaja": 38.76},
-    {"ime": "malibu+", "min": 1, "max": 100, "dobava": 19.60, "prodaja": 23.52},
-    {"ime": "malibu+ lady", "min": 1, "max": 100, "dobava": 19.60, "prodaja": 23.52},
-    {"ime": "malibu+ lady melange", "min": 1, "max": 100, "dobava": 19.60, "prodaja": 23.52},
-    {"ime": "malibu+ melange", "min": 1, "max": 100, "dobava": 19.60, "prodaja": 23.52},
-    {"ime": "maverick 2.0", "min": 1, "max": 100, "dobava": 27.45, "prodaja": 32.94},
-    {"ime": "melbourne", "min": 1, "max": 100, "dobava": 28.36, "prodaja": 34.03},
-    {"ime": "melbourne fluo", "min": 1, "max": 100, "dobava": 28.36, "prodaja": 34.03},
-    {"ime": "melbourne melange", "min": 1, "max": 100, "dobava": 28.36, "prodaja": 34.03},
-    {"ime": "miami+", "min": 1, "max": 100, "dobava": 20.68, "prodaja": 24.82},
-    {"ime": "miami+ fluo", "min": 1, "max": 100, "dobava": 20.68, "prodaja": 24.82},
-    {"ime": "miami+ lady", "min": 1, "max": 100, "dobava": 20.68, "prodaja": 24.82},
-    {"ime": "miami+ lady melange", "min": 1, "max": 100, "dobava": 20.68, "prodaja": 24.82},
-    {"ime": "miami+ melange", "min": 1, "max": 100, "dobava": 20.68, "prodaja": 24.82},
-    {"ime": "miami+ summer", "min": 1, "max": 100, "dobava": 17.93, "prodaja": 21.52},
-    {"ime": "mistral+", "min": 1, "max": 100, "dobava": 17.02, "prodaja": 20.42},
-    {"ime": "mistral+ fluo", "min": 1, "max": 100, "dobava": 17.02, "prodaja": 20.42},
-    {"ime": "mistral+ lady", "min": 1, "max": 100, "dobava": 17.02, "prodaja": 20.42},
-    {"ime": "mistral+ lady melange", "min": 1, "max": 100, "dobava": 17.02, "prodaja": 20.42},
-    {"ime": "mistral+ melange", "min": 1, "max": 100, "dobava": 17.02, "prodaja": 20.42},
-    {"ime": "mistral+ summer", "min": 1, "max": 100, "dobava": 15.92, "prodaja": 19.10},
-    {"ime": "nazionale", "min": 1, "max": 100, "dobava": 28.36, "prodaja": 34.03},
-    {"ime": "nazionale lady", "min": 1, "max": 100, "dobava": 28.36, "prodaja": 34.03},
-    {"ime": "nevada", "min": 1, "max": 100, "dobava": 32.30, "prodaja": 38.76},
-    {"ime": "new orleans", "min": 1, "max": 100, "dobava": 12.03, "prodaja": 14.44},
-    {"ime": "new orleans melange", "min": 1, "max": 100, "dobava": 12.03, "prodaja": 14.44},
-    {"ime": "orlando", "min": 1, "max": 100, "dobava": 14.84, "prodaja": 17.81},
-    {"ime": "orlando melange", "min": 1, "max": 100, "dobava": 14.84, "prodaja": 17.81},
-    {"ime": "panama+", "min": 1, "max": 100, "dobava": 25.99, "prodaja": 31.19},
-    {"ime": "panama+ fluo", "min": 1, "max": 100, "dobava": 25.99, "prodaja": 31.19},
-    {"ime": "panama+ lady", "min": 1, "max": 100, "dobava": 25.99, "prodaja": 31.19},
-    {"ime": "panama+ lady melange", "min": 1, "max": 100, "dobava": 25.99, "prodaja": 31.19},
-    {"ime": "panama+ melange", "min": 1, "max": 100, "dobava": 25.99, "prodaja": 31.19},
-    {"ime": "panama+ summer", "min": 1, "max": 100, "dobava": 21.23, "prodaja": 25.48},
-    {"ime": "pontiac", "min": 1, "max": 100, "dobava": 19.40, "prodaja": 23.28},
-    {"ime": "portland", "min": 1, "max": 100, "dobava": 21.23, "prodaja": 25.48},
-    {"ime": "portland melange", "min": 1, "max": 100, "dobava": 21.23, "prodaja": 25.48},
-    {"ime": "rio", "min": 1, "max": 100, "dobava": 24.70, "prodaja": 29.64},
-    {"ime": "sydney", "min": 1, "max": 100, "dobava": 28.36, "prodaja": 34.03},
-    {"ime": "sydney fluo", "min": 1, "max": 100, "dobava": 28.36, "prodaja": 34.03},
-    {"ime": "sydney melange", "min": 1, "max": 100, "dobava": 28.36, "prodaja": 34.03},
-    {"ime": "toledo", "min": 1, "max": 100, "dobava": 17.57, "prodaja": 21.08},
-    {"ime": "toronto", "min": 1, "max": 100, "dobava": 19.40, "prodaja": 23.28},
-    {"ime": "toronto melange", "min": 1, "max": 100, "dobava": 19.40, "prodaja": 23.28},
-    {"ime": "vancouver", "min": 1, "max": 100, "dobava": 29.38, "prodaja": 35.26},
-    {"ime": "vancouver melange", "min": 1, "max": 100, "dobava": 29.38, "prodaja": 35.26},
-    {"ime": "work 2.0", "min": 1, "max": 100, "dobava": 41.18, "prodaja": 49.42},
-    {"ime": "fruit of the loom", "min": 1, "max": 100, "dobava": 2.70, "prodaja": 3.70},
-    {"ime": "imperial sols", "min": 1, "max": 100, "dobava": 3.14, "prodaja": 4.90}
-]
+# Price lists live in ceniki/<ime>.csv (or .json) next to this script; the
+# CENIKI environment variable points to another folder.
+MAPA_CENIKOV = os.environ.get("CENIKI", os.path.join(os.path.dirname(os.path.abspath(__file__)), "ceniki"))
 
 promocijski_material = {
-    "gravura": cenik_gravura,
-    "dotisk na bloke": cenik_bloki,
-    "vzigalniki": cenik_vzigalniki,
-    "vizitke": cenik_vizitke,
-    "letaki": cenik_letaki
+    "gravura": "gravura",
+    "dotisk na bloke": "bloki",
+    "vzigalniki": "vzigalniki",
+    "vizitke": "vizitke",
+    "letaki": "letaki"
 }
 
-cenik_dtf = {
-    1: (27, 38),
-    2: (40, 56),
-    4: (72, 101),
-    5: (90, 126),
-    6: (110, 154),
-    7: (126, 177),
-    8: (144, 202),
-    9: (162, 227),
-    10: (180, 252),
-    11: (200, 280),
-    12: (215, 301),
-}
+IMENA_CENIKOV = list(promocijski_material.values()) + ["majice", "dtf"]
+
+# Bumped whenever the pickled representation of a price list changes.
+RAZLICICA_PREDPOMNILNIKA = 2
+
+def _stevilo(vrednost):
+    """Parse a price-list number, keeping whole numbers as int like the old literals."""
+    if isinstance(vrednost, (int, float)):
+        return vrednost
+    vrednost = str(vrednost).strip()
+    return int(vrednost) if re.fullmatch(r"-?\d+", vrednost) else float(vrednost)
+
+def _preveri_razpone(vrstice, pot):
+    """Validate and convert tier rows (min, max, dobava, prodaja and optional ime)."""
+    cenik = []
+    for st, vrstica in enumerate(vrstice, 1):
+        try:
+            razpon = {"ime": str(vrstica["ime"]).strip()} if "ime" in vrstica else {}
+            for kljuc in ("min", "max", "dobava", "prodaja"):
+                razpon[kljuc] = _stevilo(vrstica[kljuc])
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"{pot}: vrstica {st}: neveljaven zapis ({e})") from None
+        if not isinstance(razpon["min"], int) or not isinstance(razpon["max"], int):
+            raise ValueError(f"{pot}: vrstica {st}: min in max morata biti celi števili.")
+        if not 1 <= razpon["min"] <= razpon["max"]:
+            raise ValueError(f"{pot}: vrstica {st}: napačen razpon {razpon['min']}-{razpon['max']}.")
+        if razpon["dobava"] < 0 or razpon["prodaja"] < 0:
+            raise ValueError(f"{pot}: vrstica {st}: cene ne smejo biti negativne.")
+        cenik.append(razpon)
+    if not cenik:
+        raise ValueError(f"{pot}: cenik je prazen.")
+
+    po_imenu = {}
+    for razpon in cenik:
+        po_imenu.setdefault(razpon.get("ime"), []).append(razpon)
+    for ime, razponi in po_imenu.items():
+        razponi = sorted(razponi, key=lambda r: r["min"])
+        for prejsnji, naslednji in zip(razponi, razponi[1:]):
+            if naslednji["min"] <= prejsnji["max"]:
+                opis = f" za {ime!r}" if ime else ""
+                raise ValueError(f"{pot}: razpona {prejsnji['min']}-{prejsnji['max']} in "
+                                 f"{naslednji['min']}-{naslednji['max']}{opis} se prekrivata.")
+    return cenik
+
+def _preveri_dtf(vrstice, pot):
+    """Validate and convert DTF rows (metri, dobava, prodaja) into {metri: (dobava, prodaja)}."""
+    cenik = {}
+    for st, vrstica in enumerate(vrstice, 1):
+        try:
+            metri = _stevilo(vrstica["metri"])
+            cena = (_stevilo(vrstica["dobava"]), _stevilo(vrstica["prodaja"]))
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"{pot}: vrstica {st}: neveljaven zapis ({e})") from None
+        if metri <= 0 or metri in cenik:
+            raise ValueError(f"{pot}: vrstica {st}: dolžina {metri} m mora biti pozitivna in enkratna.")
+        if cena[0] < 0 or cena[1] < 0:
+            raise ValueError(f"{pot}: vrstica {st}: cene ne smejo biti negativne.")
+        cenik[metri] = cena
+    if not cenik:
+        raise ValueError(f"{pot}: cenik je prazen.")
+    return cenik
+
+class ZbirkaCenikov:
+    """Price lists loaded on first use from ``mapa`` and kept up to date.
+
+    Every list is validated once and the result is pickled into
+    ``mapa/.predpomnilnik`` keyed by the file's mtime and size (and its
+    SHA-256 when those changed), so later processes skip parsing. osvezi()
+    reloads lists whose file changed; with ``interval_osvezevanja`` (seconds)
+    that check also runs automatically on access, for long-running processes.
+    ``generacija`` grows with every reload.
+    """
+
+    def __init__(self, mapa, interval_osvezevanja=None):
+        self.mapa = mapa
+        self.interval_osvezevanja = interval_osvezevanja
+        self.generacija = 0
+        self._ceniki = {}
+        self._podpisi = {}
+        self._zavrnjeni = {}  # ime -> signature of a file that failed validation
+        self._zadnje_preverjanje = time.monotonic()
+
+    def _pot(self, ime):
+        for koncnica in (".csv", ".json"):
+            pot = os.path.join(self.mapa, ime + koncnica)
+            if os.path.exists(pot):
+                return pot
+        raise FileNotFoundError(f"Cenik {ime!r} ne obstaja v {self.mapa}.")
+
+    def _preberi(self, pot, vsebina):
+        besedilo = vsebina.decode("utf-8-sig")
+        if pot.endswith(".json"):
+            vrstice = json.loads(besedilo)
+        else:
+            vrstice = list(csv.DictReader(io.StringIO(besedilo)))
+        ime = os.path.splitext(os.path.basename(pot))[0]
+        if ime == "dtf":
+            return _preveri_dtf(vrstice, pot)
+        if ime == "majice":
+            return KatalogMajic.iz_razponov(_preveri_razpone(vrstice, pot))
+        return _preveri_razpone(vrstice, pot)
+
+    @staticmethod
+    def _iz_predpomnilnika(shranjeno):
+        if shranjeno["katalog"]:
+            return KatalogMajic(*shranjeno["cenik"])
+        return shranjeno["cenik"]
+
+    def _nalozi(self, ime):
+        pot = self._pot(ime)
+        stat = os.stat(pot)
+        podpis = (pot, stat.st_mtime_ns, stat.st_size)
+        pot_predpomnilnika = os.path.join(self.mapa, ".predpomnilnik", ime + ".pickle")
+        shranjeno = None
+        try:
+            with open(pot_predpomnilnika, "rb") as f:
+                shranjeno = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            pass
+        if shranjeno is not None and shranjeno.get("razlicica") != RAZLICICA_PREDPOMNILNIKA:
+            shranjeno = None
+        if shranjeno is not None and shranjeno["podpis"] == podpis:
+            return self._iz_predpomnilnika(shranjeno), podpis
+
+        with open(pot, "rb") as f:
+            vsebina = f.read()
+        sha = hashlib.sha256(vsebina).hexdigest()
+        if shranjeno is not None and shranjeno["sha256"] == sha:
+            cenik = self._iz_predpomnilnika(shranjeno)  # touched but not changed
+        else:
+            cenik = self._preberi(pot, vsebina)
+        try:
+            os.makedirs(os.path.dirname(pot_predpomnilnika), exist_ok=True)
+            zacasna = f"{pot_predpomnilnika}.{os.getpid()}.tmp"
+            with open(zacasna, "wb") as f:
+                # Only builtins and arrays are pickled, so the cache does not
+                # depend on the name this script was imported under.
+                katalog = isinstance(cenik, KatalogMajic)
+                pickle.dump({"razlicica": RAZLICICA_PREDPOMNILNIKA, "podpis": podpis, "sha256": sha,
+                             "katalog": katalog, "cenik": cenik.stolpci() if katalog else cenik},
+                            f, pickle.HIGHEST_PROTOCOL)
+            os.replace(zacasna, pot_predpomnilnika)
+        except OSError:
+            pass  # read-only price folder: work without the cache
+        return cenik, podpis
+
+    def _prevedi(self, ime, cenik, stari=None):
+        """Compile the lookup structure of a freshly loaded list and drop the old one."""
+        if stari is not None:
+            _indeksi_cenikov.pop(id(stari), None)
+            for kljuc in [k for k in _interpolatorji if k[0] == id(stari)]:
+                del _interpolatorji[kljuc]
+        if ime == "dtf":
+            interpolator_cenika(cenik)
+        elif not isinstance(cenik, KatalogMajic):
+            indeks_cenika(cenik)
+
+    def preveri_osvezitev(self):
+        """Run osvezi() if ``interval_osvezevanja`` has passed since the last check."""
+        if self.interval_osvezevanja is not None and \
+                time.monotonic() - self._zadnje_preverjanje >= self.interval_osvezevanja:
+            self.osvezi()
+
+    def __getitem__(self, ime):
+        self.preveri_osvezitev()
+        cenik = self._ceniki.get(ime)
+        if cenik is None:
+            if ime not in IMENA_CENIKOV:
+                raise KeyError(ime)
+            cenik, self._podpisi[ime] = self._nalozi(ime)
+            self._ceniki[ime] = cenik
+            self._prevedi(ime, cenik)
+        return cenik
+
+    def nalozi_vse(self):
+        """Load (and compile) every price list up front."""
+        for ime in IMENA_CENIKOV:
+            self[ime]
+
+    def odtis(self):
+        """Signatures (path, mtime, size) of every price list file, for caches kept on disk."""
+        self.nalozi_vse()
+        return tuple(sorted(self._podpisi.items()))
+
+    def osvezi(self):
+        """Reload price lists whose file changed. Returns the names that were reloaded."""
+        self._zadnje_preverjanje = time.monotonic()
+        osvezeni = []
+        for ime, podpis in list(self._podpisi.items()):
+            try:
+                pot = self._pot(ime)
+                stat = os.stat(pot)
+            except OSError:
+                continue  # keep the last good list if the file is briefly missing
+            nov_podpis = (pot, stat.st_mtime_ns, stat.st_size)
+            if nov_podpis == podpis or nov_podpis == self._zavrnjeni.get(ime):
+                continue
+            try:
+                cenik, self._podpisi[ime] = self._nalozi(ime)
+            except (OSError, ValueError) as e:
+                self._zavrnjeni[ime] = nov_podpis
+                print(f"❌ Cenik {ime} ni osvežen: {e}", file=sys.stderr)
+                continue
+            self._prevedi(ime, cenik, self._ceniki[ime])
+            self._ceniki[ime] = cenik
+            osvezeni.append(ime)
+        if osvezeni:
+            self.generacija += 1
+        return osvezeni
+
+ceniki = ZbirkaCenikov(MAPA_CENIKOV)
 
 def sanitize_filename(name):
     """Sanitize a string to be safe for use as a filename."""
     return re.sub(r'[<>:"/\\|?*]', '_', name.strip())
 
+# === DENAR ===
+# Money is added up and rounded in integer cents. Results still carry euros
+# as floats (cents / 100), which are the floats closest to the exact amounts.
+
+def v_cente(znesek):
+    """Exact cents of a euro amount as written in decimal (a price or a result), rounded half up."""
+    if isinstance(znesek, int):
+        return znesek * 100
+    stotine = znesek * 100
+    centi = round(stotine)
+    if abs(abs(stotine - centi) - 0.5) < 1e-6:
+        # A decimal half cent (x.xx5) can land on either side of .5 as a float,
+        # so it is decided on the decimal digits.
+        import decimal
+        return int(decimal.Decimal(repr(float(znesek))).scaleb(2).quantize(1, decimal.ROUND_HALF_UP))
+    return centi
+
+def v_evre(centi):
+    """Euro float of an amount in cents."""
+    return centi / 100
+
+def v_evre_kot(centi, *zneski):
+    """Euro amount of ``centi`` written like ``zneski``: whole euros stay an int when they all are ints."""
+    if centi % 100 == 0 and all(isinstance(znesek, int) for znesek in zneski):
+        return centi // 100
+    return v_evre(centi)
+
+def deli_zaokrozeno(stevec, imenovalec):
+    """Integer ``stevec / imenovalec`` rounded half up (away from zero); ``imenovalec`` > 0."""
+    if stevec < 0:
+        return -((imenovalec - 2 * stevec) // (2 * imenovalec))
+    return (2 * stevec + imenovalec) // (2 * imenovalec)
+
+def na_kos(centi, kolicina):
+    """Price per piece in euros to a tenth of a cent (half up) of ``centi`` for ``kolicina`` pieces."""
+    return deli_zaokrozeno(centi * 10, kolicina) / 1000
+
+def sestej_cente(zneski):
+    """Exact sum in cents of euro amounts that are whole cents (results, not raw products).
+
+    NumPy arrays (izracunaj_dtf_paket results) are scaled and rounded to
+    whole cents in place and summed in C; float64 adds whole numbers exactly
+    up to 2**53 cents. Anything else goes through math.fsum, which adds the
+    floats without rounding error; their own error is under a billionth of
+    a cent each, so the total is exact far beyond any real batch.
+    """
+    if hasattr(zneski, "dtype"):
+        stotine = zneski * 100
+        _numpy().rint(stotine, out=stotine)
+        return int(stotine.sum())
+    return round(math.fsum(zneski) * 100)
+
+# === INDEKS CENIKOV ===
+class _SkupinaRazponov:
+    """Tiers of one product, with sorted boundaries for bisect lookup."""
+    __slots__ = ("razponi", "mini", "maksi", "urejeno")
+
+    def __init__(self, razponi):
+        self.razponi = razponi
+        self.mini = [razpon["min"] for razpon in razponi]
+        self.maksi = [razpon["max"] for razpon in razponi]
+        # Bisect is only equivalent to a first-match scan when the tiers are
+        # sorted and do not overlap; anything else keeps the linear scan.
+        self.urejeno = all(
+            self.mini[i] <= self.maksi[i] and self.maksi[i] < self.mini[i + 1]
+            for i in range(len(razponi) - 1)
+        )
+
+    def poisci(self, kolicina):
+        if self.urejeno:
+            i = bisect.bisect_right(self.mini, kolicina) - 1
+            if i >= 0 and kolicina <= self.maksi[i]:
+                return self.razponi[i]
+            return None
+        for razpon in self.razponi:
+            if razpon["min"] <= kolicina <= razpon["max"]:
+                return razpon
+        return None
+
+class _IndeksCenika:
+    """Name -> tiers hash map for one cenik list, built once."""
+    __slots__ = ("cenik", "dolzina", "vse", "po_imenu")
+
+    def __init__(self, cenik):
+        self.cenik = cenik
+        self.dolzina = len(cenik)
+        self.vse = _SkupinaRazponov(list(cenik))
+        po_imenu = {}
+        for razpon in cenik:
+            if "ime" in razpon:
+                po_imenu.setdefault(razpon["ime"], []).append(razpon)
+        self.po_imenu = {ime: _SkupinaRazponov(razponi) for ime, razponi in po_imenu.items()}
+
+_indeksi_cenikov = {}
+
+def indeks_cenika(cenik):
+    """Return the precompiled index for a cenik list, (re)building it if needed."""
+    indeks = _indeksi_cenikov.get(id(cenik))
+    if indeks is None or indeks.cenik is not cenik or indeks.dolzina != len(cenik):
+        indeks = _IndeksCenika(cenik)
+        _indeksi_cenikov[id(cenik)] = indeks
+    return indeks
+
 def poisci_razpon(cenik, kolicina, ime_izdelka=None):
     """Find the appropriate price range for a given quantity and optionally item name."""
+    if isinstance(cenik, KatalogMajic):
+        if ime_izdelka:
+            vrstica = cenik.razpon(ime_izdelka, kolicina)
+            return None if vrstica is None else cenik.vrstica(vrstica)
+        for vrstica in range(len(cenik)):
+            if cenik.mini[vrstica] <= kolicina <= cenik.maksi[vrstica]:
+                return cenik.vrstica(vrstica)
+        return None
+    indeks = indeks_cenika(cenik)
     if ime_izdelka:
-        for razpon in cenik:
-            if razpon["min"] <= kolicina <= razpon["max"] and razpon["ime"] == ime_izdelka:
-                return razpon
-    else:
-        for razpon in cenik:
-            if razpon["min"] <= kolicina <= razpon["max"]:
-                return razpon
-    return None
+        skupina = indeks.po_imenu.get(ime_izdelka)
+        if skupina is None:
+            return None
+        return skupina.poisci(kolicina)
+    return indeks.vse.poisci(kolicina)
+
+# === KATALOG MAJIC ===
+def normaliziraj_ime(ime):
+    """Lookup key of an article name: case-folded, without diacritics, single spaces."""
+    ime = unicodedata.normalize("NFKD", ime)
+    ime = "".join(znak for znak in ime if not unicodedata.combining(znak))
+    return " ".join(ime.casefold().split())
+
+def _trigrami(kljuc):
+    kljuc = f"  {kljuc} "
+    return {kljuc[i:i + 3] for i in range(len(kljuc) - 2)}
+
+def _razdalja(a, b):
+    """Edit distance of ``a`` and ``b`` where swapping two adjacent characters counts as one edit."""
+    # A typo touches one spot, so the shared start and end are dropped first.
+    zacetek = 0
+    while zacetek < len(a) and zacetek < len(b) and a[zacetek] == b[zacetek]:
+        zacetek += 1
+    konec = 0
+    while konec < len(a) - zacetek and konec < len(b) - zacetek and a[-1 - konec] == b[-1 - konec]:
+        konec += 1
+    a, b = a[zacetek:len(a) - konec], b[zacetek:len(b) - konec]
+    predprejsnja, prejsnja = None, list(range(len(b) + 1))
+    for i, znak_a in enumerate(a, 1):
+        vrstica = [i]
+        for j, znak_b in enumerate(b, 1):
+            razdalja = min(prejsnja[j] + 1, vrstica[j - 1] + 1, prejsnja[j - 1] + (znak_a != znak_b))
+            if i > 1 and j > 1 and znak_a == b[j - 2] and a[i - 2] == znak_b:
+                razdalja = min(razdalja, predprejsnja[j - 2] + 1)
+            vrstica.append(razdalja)
+        predprejsnja, prejsnja = prejsnja, vrstica
+    return prejsnja[-1]
+
+class KatalogMajic:
+    """Array-backed garment catalogue.
+
+    Names are interned and the tiers are stored column-wise (``array('l')``
+    for min/max, ``array('d')`` for prices, ``array('q')`` for the same
+    prices in cents) instead of one dict per SKU.
+    A normalized name (see normaliziraj_ime) maps to its row number, or to a
+    tuple of row numbers sorted by ``min`` when the garment has several
+    tiers. Iterating yields the rows as dicts for code that still expects a
+    cenik list.
+
+    predlagaj() suggests names for a mistyped article from the sorted keys
+    (prefix matches) and a trigram index that is only built on first use;
+    the best trigram matches are ranked by edit distance.
+    """
+    __slots__ = ("imena", "mini", "maksi", "dobave", "prodaje", "centi_dobave", "centi_prodaje",
+                 "_po_imenu", "_kljuci", "_trigrami")
+
+    # Trigram postings scanned per suggestion; the rarest trigrams go first.
+    MAKS_KANDIDATOV = 3000
+
+    def __init__(self, imena, mini, maksi, dobave, prodaje):
+        self.imena = [sys.intern(ime) for ime in imena]
+        self.mini = array.array("l", mini)
+        self.maksi = array.array("l", maksi)
+        self.dobave = array.array("d", dobave)
+        self.prodaje = array.array("d", prodaje)
+        self.centi_dobave = array.array("q", map(v_cente, self.dobave))
+        self.centi_prodaje = array.array("q", map(v_cente, self.prodaje))
+        po_imenu = {}
+        for vrstica, ime in enumerate(self.imena):
+            po_imenu.setdefault(sys.intern(normaliziraj_ime(ime)), []).append(vrstica)
+        self._po_imenu = {
+            ime: vrstice[0] if len(vrstice) == 1 else tuple(sorted(vrstice, key=self.mini.__getitem__))
+            for ime, vrstice in po_imenu.items()
+        }
+        self._kljuci = None
+        self._trigrami = None
+
+    @classmethod
+    def iz_razponov(cls, razponi):
+        """Build the catalogue from an iterable of cenik dict rows (read once)."""
+        stolpci = ([], array.array("l"), array.array("l"), array.array("d"), array.array("d"))
+        for razpon in razponi:
+            for stolpec, kljuc in zip(stolpci, ("ime", "min", "max", "dobava", "prodaja")):
+                stolpec.append(razpon[kljuc])
+        return cls(*stolpci)
+
+    def stolpci(self):
+        """The columns, in the argument order of the constructor."""
+        return self.imena, self.mini, self.maksi, self.dobave, self.prodaje
+
+    def __len__(self):
+        return len(self.imena)
+
+    def __contains__(self, ime):
+        return self._vrstice(ime) is not None
+
+    def _vrstice(self, ime):
+        vrstice = self._po_imenu.get(ime)
+        if vrstice is None:
+            vrstice = self._po_imenu.get(normaliziraj_ime(ime))
+        return vrstice
+
+    def najdi(self, ime):
+        """Catalogue spelling of ``ime`` if it names a garment, else None."""
+        vrstice = self._vrstice(ime)
+        if vrstice is None:
+            return None
+        return self.imena[vrstice if isinstance(vrstice, int) else vrstice[0]]
+
+    def _zgradi_trigrame(self):
+        self._kljuci = sorted(self._po_imenu)
+        trigrami = {}
+        for st, kljuc in enumerate(self._kljuci):
+            for trigram in _trigrami(kljuc):
+                trigrami.setdefault(trigram, []).append(st)
+        self._trigrami = trigrami
+
+    def predlagaj(self, ime, n=3):
+        """Up to ``n`` catalogue names close to a mistyped ``ime``, best first."""
+        if self._trigrami is None:
+            self._zgradi_trigrame()
+        kljuc = normaliziraj_ime(ime)
+        if not kljuc:
+            return []
+        kljuci = self._kljuci
+        predlogi = []
+        # Names that start with what was typed, e.g. "sunset la".
+        i = bisect.bisect_left(kljuci, kljuc)
+        while i < len(kljuci) and len(predlogi) < n and kljuci[i].startswith(kljuc):
+            predlogi.append(kljuci[i])
+            i += 1
+
+        # Trigram similarity (Dice), gathering candidates from the rarest
+        # trigrams so common ones like "lad" do not dominate the cost.
+        iskani = _trigrami(kljuc)
+        seznami = sorted((self._trigrami[t] for t in iskani if t in self._trigrami), key=len)
+        stevec = collections.Counter()
+        pregledano = 0
+        for seznam in seznami:
+            if pregledano and pregledano + len(seznam) > self.MAKS_KANDIDATOV:
+                break
+            stevec.update(seznam)
+            pregledano += len(seznam)
+        ocene = []
+        # Only names sharing at least half as many trigrams as the best one
+        # are scored exactly; heapq-based most_common() costs more than this.
+        najvec = max(stevec.values(), default=0)
+        kandidati = [st for st, skupni in stevec.items() if 2 * skupni >= najvec]
+        if len(kandidati) > 30:
+            kandidati.sort(key=stevec.__getitem__, reverse=True)
+            del kandidati[30:]
+        for st in kandidati:
+            kandidat = kljuci[st]
+            trigrami = _trigrami(kandidat)
+            ocene.append((2 * len(iskani & trigrami) / (len(iskani) + len(trigrami)), kandidat))
+        ocene.sort(key=lambda ocena: (-ocena[0], ocena[1]))
+        # Dice favours short names contained in the query ("free" for
+        # "free lday"), so the best few are reordered by edit distance.
+        najboljse = [kandidat for ocena, kandidat in ocene[:2 * n] if ocena >= 0.4]
+        najboljse.sort(key=lambda kandidat: _razdalja(kljuc, kandidat))
+        for kandidat in najboljse:
+            if len(predlogi) >= n:
+                break
+            if kandidat not in predlogi:
+                predlogi.append(kandidat)
+        return [self.najdi(kandidat) for kandidat in predlogi]
+
+    def __iter__(self):
+        for vrstica in range(len(self.imena)):
+            yield self.vrstica(vrstica)
+
+    def vrstica(self, vrstica):
+        """Row ``vrstica`` as a cenik dict."""
+        return {"ime": self.imena[vrstica], "min": self.mini[vrstica], "max": self.maksi[vrstica],
+                "dobava": self.dobave[vrstica], "prodaja": self.prodaje[vrstica]}
+
+    def razpon(self, ime, kolicina):
+        """Row number of the tier of ``ime`` that covers ``kolicina``, or None."""
+        vrstice = self._vrstice(ime)
+        if vrstice is None:
+            return None
+        if isinstance(vrstice, int):
+            vrstica = vrstice
+        else:
+            # Tiers are validated not to overlap, so the last min <= kolicina decides.
+            i = bisect.bisect_right(vrstice, kolicina, key=self.mini.__getitem__) - 1
+            if i < 0:
+                return None
+            vrstica = vrstice[i]
+        if self.mini[vrstica] <= kolicina <= self.maksi[vrstica]:
+            return vrstica
+        return None
+
+    def cena(self, ime, kolicina):
+        """Per-unit (dobava, prodaja) of ``ime`` at ``kolicina``, or None."""
+        vrstica = self.razpon(ime, kolicina)
+        if vrstica is None:
+            return None
+        return self.dobave[vrstica], self.prodaje[vrstica]
+
+    def cena_v_centih(self, ime, kolicina):
+        """Per-unit (dobava, prodaja) of ``ime`` at ``kolicina`` in cents, or None."""
+        vrstica = self.razpon(ime, kolicina)
+        if vrstica is None:
+            return None
+        return self.centi_dobave[vrstica], self.centi_prodaje[vrstica]
+
+# === INTERPOLACIJA DTF ===
+class InterpolatorCen:
+    """Piecewise-linear DTF price curve compiled once from a cenik dict.
+
+    Breakpoints are kept sorted together with the per-segment price and
+    length differences, so a lookup is a bisect plus one linear step. The
+    step is done in integers (cents and centimetres, breakpoints taken to
+    the centimetre) and rounded half up, so a price is exact whatever the
+    float error of the length. Lengths above the last breakpoint follow
+    ``ekstrapolacija``:
+
+    - "omejeno": the price of the last breakpoint (the historical behaviour),
+    - "linearno": continue the slope of the last segment,
+    - "napaka": raise ValueError.
+
+    Results are always a pair of floats rounded to cents. With ``predpomni``
+    results are memoized per length; quote lengths are quantized to 0.01 m so
+    the memo stays small (it is cleared once it reaches ``MAKS_PREDPOMNILNIK``).
+    """
+    __slots__ = ("cenik", "dolzina", "tocke", "dobavne", "prodajne",
+                 "razlike_d", "razlike_p", "razlike_m", "centimetri", "centi_d", "centi_p",
+                 "razlike_cd", "razlike_cp", "razlike_cm", "ekstrapolacija", "_memo")
+
+    MAKS_PREDPOMNILNIK = 100_000
+
+    def __init__(self, cenik, ekstrapolacija="omejeno", predpomni=True):
+        if ekstrapolacija not in ("omejeno", "linearno", "napaka"):
+            raise ValueError(f"Neznana ekstrapolacija: {ekstrapolacija!r}")
+        if not cenik:
+            raise ValueError("Cenik DTF je prazen.")
+        self.cenik = cenik
+        self.dolzina = len(cenik)
+        # Point 0 m costs nothing; it is the start of the first segment.
+        self.tocke = [0] + sorted(cenik)
+        self.dobavne = [0] + [cenik[t][0] for t in self.tocke[1:]]
+        self.prodajne = [0] + [cenik[t][1] for t in self.tocke[1:]]
+        self.razlike_m = [self.tocke[i + 1] - self.tocke[i] for i in range(len(self.tocke) - 1)]
+        self.razlike_d = [self.dobavne[i + 1] - self.dobavne[i] for i in range(len(self.tocke) - 1)]
+        self.razlike_p = [self.prodajne[i + 1] - self.prodajne[i] for i in range(len(self.tocke) - 1)]
+        self.centimetri = [v_cente(t) for t in self.tocke]
+        self.centi_d = [v_cente(d) for d in self.dobavne]
+        self.centi_p = [v_cente(p) for p in self.prodajne]
+        self.razlike_cm = [b - a for a, b in zip(self.centimetri, self.centimetri[1:])]
+        self.razlike_cd = [b - a for a, b in zip(self.centi_d, self.centi_d[1:])]
+        self.razlike_cp = [b - a for a, b in zip(self.centi_p, self.centi_p[1:])]
+        if min(self.razlike_cm, default=1) <= 0:
+            raise ValueError("Točke cenika DTF morajo biti vsaj 1 cm narazen.")
+        self.ekstrapolacija = ekstrapolacija
+        self._memo = {} if predpomni else None
+
+    def _odsek(self, metri, i):
+        stotine = metri * 100
+        cm = round(stotine)
+        if abs(stotine - cm) < 1e-9:
+            premik, imenovalec = cm - self.centimetri[i], self.razlike_cm[i]
+        else:  # off the centimetre grid: the exact decimal value of metri
+            import fractions
+            premik = fractions.Fraction(repr(float(metri))) * 100 - self.centimetri[i]
+            premik, imenovalec = premik.numerator, premik.denominator * self.razlike_cm[i]
+        return (v_evre(self.centi_d[i] + deli_zaokrozeno(self.razlike_cd[i] * premik, imenovalec)),
+                v_evre(self.centi_p[i] + deli_zaokrozeno(self.razlike_cp[i] * premik, imenovalec)))
+
+    def _izracunaj(self, metri):
+        if metri <= 0:
+            return 0.0, 0.0
+        tocke = self.tocke
+        if metri < tocke[1]:
+            return self._odsek(metri, 0)
+        if metri <= tocke[-1]:
+            if len(tocke) == 2:
+                # A single breakpoint, met exactly: the end of the segment from 0 m.
+                return self._odsek(metri, 0)
+            # bisect_left picks the segment ending at an exact breakpoint and
+            # lo=2 keeps the first breakpoint on the segment it starts, like
+            # the old first-match scan.
+            i = bisect.bisect_left(tocke, metri, 2) - 1
+            return self._odsek(metri, i)
+        if self.ekstrapolacija == "linearno":
+            # With a single breakpoint the last segment is the one from 0 m.
+            return self._odsek(metri, len(tocke) - 2)
+        if self.ekstrapolacija == "napaka":
+            raise ValueError(f"Dolžina {metri} m presega cenik DTF (največ {tocke[-1]} m).")
+        return v_evre(self.centi_d[-1]), v_evre(self.centi_p[-1])
+
+    def __call__(self, metri):
+        memo = self._memo
+        if memo is None:
+            return self._izracunaj(metri)
+        cena = memo.get(metri)
+        if cena is None:
+            if len(memo) >= self.MAKS_PREDPOMNILNIK:
+                memo.clear()
+            cena = memo[metri] = self._izracunaj(metri)
+        return cena
+
+_interpolatorji = {}
+
+def interpolator_cenika(cenik, ekstrapolacija="omejeno"):
+    """Return the compiled interpolator for a DTF cenik, (re)building it if needed."""
+    kljuc = (id(cenik), ekstrapolacija)
+    interpolator = _interpolatorji.get(kljuc)
+    if interpolator is None or interpolator.cenik is not cenik or interpolator.dolzina != len(cenik):
+        interpolator = InterpolatorCen(cenik, ekstrapolacija)
+        _interpolatorji[kljuc] = interpolator
+    return interpolator
 
 def interpoliraj_ceno(metri, cenik):
-    """Interpolate the cost based on the length in meters, including <1m."""
-    tocke = sorted(cenik.keys())
-    
-    # Handle lengths less than or equal to 0
-    if metri <= 0:
-        return 0, 0
-    
-    # Handle lengths between 0 and 1 meter
-    if metri < tocke[0]:
-        d1, p1 = 0, 0  # Price at 0 meters
-        d2, p2 = cenik[tocke[0]]  # Price at 1 meter
-        faktor = metri / tocke[0]
-        dobavna = d1 + (d2 - d1) * faktor
-        prodajna = p1 + (p2 - p1) * faktor
-        return round(dobavna, 2), round(prodajna, 2)
-    
-    # Handle lengths between defined points
-    for i in range(len(tocke) - 1):
-        nizji = tocke[i]
-        visji = tocke[i + 1]
-        if nizji <= metri <= visji:
-            d1, p1 = cenik[nizji]
-            d2, p2 = cenik[visji]
-            faktor = (metri - nizji) / (visji - nizji)
-            dobavna = d1 + (d2 - d1) * faktor
-            prodajna = p1 + (p2 - p1) * faktor
-            return round(dobavna, 2), round(prodajna, 2)
-    
-    # Handle lengths beyond the last point
-    return cenik[tocke[-1]]
-
-def save_to_file(podjetje, data, kolicina_or_metri, izbira, mapa="izracuni_dtf"):
-    """Save calculation results to a file. Returns saved file path."""
-    os.makedirs(mapa, exist_ok=True)
+    """Interpolate the cost based on the length in meters, including <1m.
+
+    Returns (dobavna, prodajna) rounded to cents; above the last breakpoint
+    the last price applies (see InterpolatorCen).
+    """
+    return interpolator_cenika(cenik)(metri)
+
+def ime_datoteke_ponudbe(podjetje, kolicina_or_metri, izbira):
+    """File name save_to_file uses for a quote."""
     sanitized_podjetje = sanitize_filename(podjetje)
     sanitized_izbira = sanitize_filename(izbira)
     unit = "m" if izbira == "dtf" else "kos"
-    ime_datoteke = f"{sanitized_podjetje}_{sanitized_izbira}_{kolicina_or_metri}{unit}.txt"
-    pot = os.path.join(mapa, ime_datoteke)
+    return f"{sanitized_podjetje}_{sanitized_izbira}_{kolicina_or_metri}{unit}.txt"
+
+def vsebina_ponudbe(podjetje, data):
+    """Text of a saved quote file."""
+    return f"Podjetje: {podjetje}\n" + "".join(f"{line}\n" for line in data)
+
+def mapa_ponudbe(mapa, podjetje, datum=None):
+    """Folder of one company's quotes of one day: ``mapa/YYYY-MM-DD/xx/podjetje``.
+
+    ``xx`` is one of 256 shards picked by a hash of the company name, so no
+    folder grows with the total number of quotes. ``datum`` defaults to today.
+    """
+    ime = sanitize_filename(podjetje).rstrip(". ") or "_"  # Windows drops trailing dots and spaces
+    razdelek = hashlib.blake2s(ime.casefold().encode("utf-8"), digest_size=1).hexdigest()
+    return os.path.join(mapa, datum or time.strftime("%Y-%m-%d"), razdelek, ime)
+
+def zapisi_brez_prepisa(mapa, ime, vsebina, dir_fd=None):
+    """Create a new file ``ime`` in ``mapa``, never replacing an existing file.
+
+    The content is written to a hidden temporary file which is then hard
+    linked under its final name. os.link fails instead of replacing, so when
+    the name is taken, by this or any other process, ``_2``, ``_3``... is
+    added before the extension, and readers never see a half-written file.
+    Where hard links are not supported (FAT, some network shares) the name
+    is claimed with O_EXCL and written in place: names still never collide,
+    but a reader can see the file before it is complete. ``vsebina`` is str
+    (written as UTF-8) or bytes; with ``dir_fd`` (an open handle of ``mapa``)
+    names are resolved against it. Returns the path written.
+    """
+    podatki = vsebina.encode("utf-8") if isinstance(vsebina, str) else vsebina
+    osnova, koncnica = os.path.splitext(ime)
+    if dir_fd is None:
+        def pot(ime):
+            return os.path.join(mapa, ime)
+    else:
+        def pot(ime):
+            return ime
+    zacasna = f".{osnova}.{os.getpid()}.{os.urandom(4).hex()}.tmp"
+    with open(os.open(pot(zacasna), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666, dir_fd=dir_fd), "wb") as f:
+        f.write(podatki)
     try:
-        with open(pot, "w", encoding="utf-8") as f:
-            f.write(f"Podjetje: {podjetje}\n")
-            for line in data:
-                f.write(f"{line}\n")
+        st = 1
+        povezave = True
+        while True:
+            kandidat = ime if st == 1 else f"{osnova}_{st}{koncnica}"
+            try:
+                if povezave:
+                    os.link(pot(zacasna), pot(kandidat), src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+                else:
+                    with open(os.open(pot(kandidat), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666, dir_fd=dir_fd),
+                              "wb") as f:
+                        f.write(podatki)
+                return os.path.join(mapa, kandidat)
+            except FileExistsError:
+                st += 1
+            except OSError:
+                if not povezave:
+                    raise
+                povezave = False
+    finally:
+        os.unlink(pot(zacasna), dir_fd=dir_fd)
+
+_ustvarjene_mape = set()  # folders save_to_file has created in this process
+
+def save_to_file(podjetje, data, kolicina_or_metri, izbira, mapa="izracuni_dtf", datum=None):
+    """Save calculation results to a file. Returns saved file path.
+
+    The file goes into mapa_ponudbe() and never replaces an earlier quote
+    (see zapisi_brez_prepisa).
+    """
+    try:
+        mapa_podjetja = mapa_ponudbe(mapa, podjetje, datum)
+        ime = ime_datoteke_ponudbe(podjetje, kolicina_or_metri, izbira)
+        vsebina = vsebina_ponudbe(podjetje, data)
+        if mapa_podjetja not in _ustvarjene_mape:
+            os.makedirs(mapa_podjetja, exist_ok=True)
+            _ustvarjene_mape.add(mapa_podjetja)
+        try:
+            pot = zapisi_brez_prepisa(mapa_podjetja, ime, vsebina)
+        except FileNotFoundError:  # the folder was removed since it was created
+            os.makedirs(mapa_podjetja, exist_ok=True)
+            pot = zapisi_brez_prepisa(mapa_podjetja, ime, vsebina)
         print(f"\n✅ Shranjeno v: {pot}")
         return pot
     except OSError as e:
         print(f"❌ Napaka pri shranjevanju datoteke: {e}")
         return None
 
+# === SHRAMBA PRILOG ===
+# PDF header must start within the first 1024 bytes (PDF 1.7, annex H).
+_GLAVA_PDF = b"%PDF-"
+_OBSEG_GLAVE_PDF = 1024
+_KOS_BRANJA = 1 << 20
+_FICLONE = 0x40049409  # linux/fs.h, clone a whole file (btrfs, xfs, ...)
+
+def preveri_pdf(pot):
+    """Raise ValueError unless ``pot`` starts like a PDF file (reads only the header)."""
+    with open(pot, "rb") as f:
+        if _GLAVA_PDF not in f.read(_OBSEG_GLAVE_PDF):
+            raise ValueError(f"Datoteka {os.path.basename(pot)} ni veljaven PDF.")
+
+def _kopiraj_vsebino(izvor, cilj):
+    """Copy file contents without passing them through Python buffers where possible.
+
+    Tries a reflink (shared extents), then os.sendfile, then a plain copy.
+    """
+    with open(izvor, "rb") as fi, open(cilj, "wb") as fo:
+        try:
+            import fcntl
+            fcntl.ioctl(fo.fileno(), _FICLONE, fi.fileno())
+            return
+        except (ImportError, OSError):
+            pass
+        if hasattr(os, "sendfile"):
+            try:
+                odmik = 0
+                velikost = os.fstat(fi.fileno()).st_size
+                while odmik < velikost:
+                    poslano = os.sendfile(fo.fileno(), fi.fileno(), odmik, velikost - odmik)
+                    if not poslano:
+                        break
+                    odmik += poslano
+                return
+            except OSError:
+                fi.seek(0)
+                fo.seek(0)
+                fo.truncate()
+        shutil.copyfileobj(fi, fo, _KOS_BRANJA)
+
+class ShrambaPrilog:
+    """Content-addressed store for PDF attachments.
+
+    Each distinct PDF is kept once as ``mapa/<xx>/<sha256>.pdf``; prilozi()
+    puts it next to a quote as a hardlink, or as a reflink/sendfile copy when
+    linking is not possible (another filesystem, no hardlink support). The
+    source is hashed in 1 MiB pieces, and a file whose device, inode, size
+    and mtime are unchanged is not hashed again. Blobs are made read-only, as
+    an edit through any linked copy would change every quote sharing it.
+    """
+
+    def __init__(self, mapa):
+        self.mapa = mapa
+        self._znani = {}
+        self.novih = self.podvojenih = self.povezav = self.kopij = 0
+
+    def _izvlecek(self, pot):
+        stat = os.stat(pot)
+        kljuc = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        izvlecek = self._znani.get(kljuc)
+        if izvlecek is None:
+            h = hashlib.sha256()
+            with open(pot, "rb") as f:
+                kos = f.read(_KOS_BRANJA)
+                if _GLAVA_PDF not in kos[:_OBSEG_GLAVE_PDF]:
+                    raise ValueError(f"Datoteka {os.path.basename(pot)} ni veljaven PDF.")
+                while kos:
+                    h.update(kos)
+                    kos = f.read(_KOS_BRANJA)
+            izvlecek = self._znani[kljuc] = h.hexdigest()
+        return izvlecek
+
+    def dodaj(self, pot):
+        """Store the PDF at ``pot`` (once per content) and return the blob path."""
+        izvlecek = self._izvlecek(pot)
+        blob = os.path.join(self.mapa, izvlecek[:2], izvlecek + ".pdf")
+        if os.path.exists(blob):
+            self.podvojenih += 1
+            return blob
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        zacasna = f"{blob}.{os.getpid()}.tmp"
+        try:
+            _kopiraj_vsebino(pot, zacasna)
+            os.chmod(zacasna, 0o444)
+            os.replace(zacasna, blob)
+        except BaseException:
+            if os.path.exists(zacasna):
+                os.remove(zacasna)
+            raise
+        self.novih += 1
+        return blob
+
+    def prilozi(self, pot, cilj):
+        """Place the PDF at ``pot`` at ``cilj``, sharing storage with earlier copies.
+
+        A different file already at ``cilj`` is kept and ``_2``, ``_3``... is
+        added to the new name, as in zapisi_brez_prepisa. Returns the path used.
+        """
+        blob = self.dodaj(pot)
+        osnova, koncnica = os.path.splitext(cilj)
+        st = 1
+        while True:
+            kandidat = cilj if st == 1 else f"{osnova}_{st}{koncnica}"
+            try:
+                if os.path.samefile(blob, kandidat):
+                    return kandidat
+            except OSError:
+                pass  # kandidat does not exist yet
+            try:
+                os.link(blob, kandidat)
+                self.povezav += 1
+                return kandidat
+            except FileExistsError:
+                st += 1
+                continue
+            except OSError:
+                pass  # no hard links here: claim the name, then copy into it
+            try:
+                os.close(os.open(kandidat, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+            except FileExistsError:
+                st += 1
+                continue
+            _kopiraj_vsebino(blob, kandidat)
+            self.kopij += 1
+            return kandidat
+
+_shrambe_prilog = {}
+
+def shramba_prilog(mapa):
+    """Shared ShrambaPrilog for quote folder ``mapa`` (kept in ``mapa/.priloge``)."""
+    shramba = _shrambe_prilog.get(mapa)
+    if shramba is None:
+        shramba = _shrambe_prilog[mapa] = ShrambaPrilog(os.path.join(mapa, ".priloge"))
+    return shramba
+
+def prilozi_pdf(pdf_pot, cilj, mapa=None):
+    """Attach ``pdf_pot`` as ``cilj`` through the attachment store of quote folder ``mapa``.
+
+    ``mapa`` defaults to cilj's folder, which is created if it does not exist
+    yet (see mapa_ponudbe). Returns the path used (see ShrambaPrilog.prilozi).
+    """
+    mapa_cilja = os.path.dirname(cilj) or "."
+    os.makedirs(mapa_cilja, exist_ok=True)
+    return shramba_prilog(mapa or mapa_cilja).prilozi(pdf_pot, cilj)
+
+# === ZAPISOVANJE V OZADJU ===
+_KONEC = object()
+_PRILOGA = object()  # marks a PDF job in ZapisovalnikPonudb's text queue
+
+def uskladi_na_disk(poti, mape=()):
+    """fsync the files ``poti`` and then the folders ``mape`` (paths, or open folder fds).
+
+    Only the given files and folders are flushed, not the whole host as
+    os.sync() would. A folder that cannot be fsynced is skipped; on Windows,
+    which cannot fsync a read-only handle, nothing is done.
+    """
+    if os.name != "posix":
+        return
+    for pot in poti:
+        fd = os.open(pot, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    for mapa in mape:
+        try:
+            if isinstance(mapa, int):
+                os.fsync(mapa)
+                continue
+            fd = os.open(mapa, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass  # not every filesystem can fsync a directory
+
+class ZapisovalnikPonudb:
+    """Background writer for quote files and PDF attachments.
+
+    shrani() and prilozi_pdf() only enqueue work and return the target path
+    (the file gets ``_2``, ``_3``... if that name is taken by then, see
+    zapisi_brez_prepisa); a writer thread drains the text queue in batches
+    of up to ``velikost_paketa`` files and a second thread attaches PDFs
+    through the folder's ShrambaPrilog (one stored copy per distinct PDF),
+    so neither blocks quoting. PDF jobs go through the text queue too: the
+    writer thread hands each one on only once the folder exists and every
+    file queued before it is written, so an attachment never runs ahead of
+    its quote. Both queues are bounded by ``velikost_vrste``,
+    which throttles producers that outrun the disk. Files go into
+    mapa_ponudbe() folders; each is created once and, where the OS allows
+    it, the last ``MAKS_ODPRTIH_MAP`` are kept open and used as ``dir_fd``.
+
+    With ``trajno`` each batch of files, and each PDF attachment, is
+    fsynced together with its folders once written (see uskladi_na_disk),
+    so zapri() (or leaving the ``with`` block) returns only when everything
+    queued is on disk.
+    Failed writes and rejected PDFs are collected in ``napake`` as
+    (pot, sporočilo).
+    """
+
+    MAKS_ODPRTIH_MAP = 64
+
+    def __init__(self, mapa="izracuni_dtf", velikost_vrste=1000, velikost_paketa=256, trajno=True):
+        self.mapa = mapa
+        self.velikost_paketa = velikost_paketa
+        self.trajno = trajno
+        self.napake = []
+        self.zapisanih = 0
+        self._mape = collections.OrderedDict()  # folder -> open fd (or None), most recent last
+        self._vrsta = queue.Queue(velikost_vrste)
+        self._vrsta_pdf = queue.Queue(velikost_vrste)
+        self._niti = [
+            threading.Thread(target=self._zapisuj, name="zapisovalnik-ponudb", daemon=True),
+            threading.Thread(target=self._kopiraj, name="zapisovalnik-pdf", daemon=True),
+        ]
+        for nit in self._niti:
+            nit.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.zapri()
+
+    def shrani(self, podjetje, data, kolicina_or_metri, izbira, mapa=None):
+        """Queue a quote file like save_to_file and return the path it will have."""
+        mapa = mapa_ponudbe(self.mapa if mapa is None else mapa, podjetje)
+        ime = ime_datoteke_ponudbe(podjetje, kolicina_or_metri, izbira)
+        self._vrsta.put((mapa, ime, vsebina_ponudbe(podjetje, data)))
+        return os.path.join(mapa, ime)
+
+    def prilozi_pdf(self, pdf_pot, pot_ponudbe):
+        """Queue a copy of ``pdf_pot`` next to the quote file ``pot_ponudbe``."""
+        cilj = os.path.join(os.path.dirname(pot_ponudbe), os.path.basename(pdf_pot))
+        self._vrsta.put((_PRILOGA, pdf_pot, cilj))
+        return cilj
+
+    def _odpri_mapo(self, mapa):
+        fd = self._mape.get(mapa, _KONEC)
+        if fd is _KONEC:
+            os.makedirs(mapa, exist_ok=True)
+            podprto = {os.open, os.link, os.unlink} <= os.supports_dir_fd
+            fd = os.open(mapa, os.O_RDONLY) if podprto else None
+            self._mape[mapa] = fd
+            if len(self._mape) > self.MAKS_ODPRTIH_MAP:
+                _, staro = self._mape.popitem(last=False)
+                if staro is not None:
+                    os.close(staro)
+        else:
+            self._mape.move_to_end(mapa)
+        return fd
+
+    def _zapisi(self, mapa, ime, vsebina):
+        return zapisi_brez_prepisa(mapa, ime, vsebina, dir_fd=self._odpri_mapo(mapa))
+
+    def _uskladi(self, poti):
+        # Folders evicted from _mape in the meantime are opened again by path.
+        mape = {os.path.dirname(pot) for pot in poti}
+        uskladi_na_disk(poti, [mapa if self._mape.get(mapa) is None else self._mape[mapa] for mapa in mape])
+
+    def _zapisuj(self):
+        konec = False
+        while not konec:
+            paket = [self._vrsta.get()]
+            while len(paket) < self.velikost_paketa:
+                try:
+                    paket.append(self._vrsta.get_nowait())
+                except queue.Empty:
+                    break
+            zapisane = []
+            for posel in paket:
+                if posel is _KONEC:
+                    konec = True
+                    continue
+                if posel[0] is _PRILOGA:
+                    _, pdf_pot, cilj = posel
+                    try:
+                        self._odpri_mapo(os.path.dirname(cilj))
+                    except OSError as e:
+                        self.napake.append((cilj, str(e)))
+                    else:
+                        self._vrsta_pdf.put((pdf_pot, cilj, self.mapa))
+                    continue
+                mapa, ime, vsebina = posel
+                try:
+                    zapisane.append(self._zapisi(mapa, ime, vsebina))
+                    self.zapisanih += 1
+                except OSError as e:
+                    self.napake.append((os.path.join(mapa, ime), str(e)))
+            if self.trajno and zapisane:
+                try:
+                    self._uskladi(zapisane)
+                except OSError as e:
+                    self.napake.append((e.filename or self.mapa, str(e)))
+            for _ in paket:
+                self._vrsta.task_done()
+        self._vrsta_pdf.put(_KONEC)  # after every PDF job handed on above
+
+    def _kopiraj(self):
+        while True:
+            posel = self._vrsta_pdf.get()
+            try:
+                if posel is _KONEC:
+                    return
+                pdf_pot, cilj, mapa = posel
+                try:
+                    pot = prilozi_pdf(pdf_pot, cilj, mapa)
+                    if self.trajno:
+                        uskladi_na_disk([pot], [os.path.dirname(pot)])
+                except (OSError, ValueError) as e:
+                    self.napake.append((cilj, str(e)))
+            finally:
+                self._vrsta_pdf.task_done()
+
+    def pocakaj(self):
+        """Block until everything queued so far is written."""
+        self._vrsta.join()
+        self._vrsta_pdf.join()
+
+    def zapri(self):
+        """Drain the queues (with ``trajno``, onto the disk), stop the threads and close the folders."""
+        if not self._niti:
+            return
+        self._vrsta.put(_KONEC)
+        for nit in self._niti:
+            nit.join()
+        self._niti = []
+        for fd in self._mape.values():
+            if fd is not None:
+                os.close(fd)
+        self._mape = collections.OrderedDict()
+
+# === KNJIGA PONUDB ===
+# Every saved quote is also appended here; "" in KNJIGA_PONUDB turns it off.
+POT_KNJIGE = os.environ.get("KNJIGA_PONUDB", os.path.join("izracuni_dtf", "ponudbe.sqlite3"))
+
+_SHEMA_KNJIGE = """
+CREATE TABLE IF NOT EXISTS ponudbe (
+    id INTEGER PRIMARY KEY,
+    cas TEXT NOT NULL,
+    podjetje TEXT NOT NULL COLLATE NOCASE,
+    tip TEXT NOT NULL,
+    artikel TEXT NOT NULL,
+    kolicina INTEGER NOT NULL,
+    dobava REAL NOT NULL,
+    prodaja REAL NOT NULL,
+    profit REAL NOT NULL,
+    cena_na_kos REAL NOT NULL,
+    zapis TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ponudbe_podjetje ON ponudbe (podjetje, cas);
+CREATE INDEX IF NOT EXISTS ponudbe_artikel ON ponudbe (artikel, cas);
+CREATE INDEX IF NOT EXISTS ponudbe_cas ON ponudbe (cas);
+CREATE INDEX IF NOT EXISTS ponudbe_kolicina ON ponudbe (kolicina);
+CREATE TRIGGER IF NOT EXISTS ponudbe_brez_popravkov BEFORE UPDATE ON ponudbe
+BEGIN SELECT RAISE(ABORT, 'knjiga ponudb dovoljuje le dodajanje'); END;
+CREATE TRIGGER IF NOT EXISTS ponudbe_brez_brisanja BEFORE DELETE ON ponudbe
+BEGIN SELECT RAISE(ABORT, 'knjiga ponudb dovoljuje le dodajanje'); END;
+"""
+
+_STOLPCI_KNJIGE = ("podjetje", "tip", "artikel", "kolicina", "dobava", "prodaja", "profit", "cena_na_kos")
+
+class KnjigaPonudb:
+    """Append-only SQLite ledger of priced quotes.
+
+    dodaj() buffers result records (as returned by izracunaj_narocilo, i.e.
+    with ``podjetje``) and writes them ``velikost_paketa`` at a time in one
+    transaction; shrani() or zapri() writes the rest. Triggers reject UPDATE
+    and DELETE, so a rerun adds a new row instead of replacing the old quote.
+    Company, product, date and quantity are indexed columns; the full record
+    is kept as JSON for izvozi().
+
+    Filters shared by poisci() and profit_po_artiklih(): ``podjetje``
+    (case-insensitive), ``artikel``, ``tip``, ``od``/``do`` (ISO date or
+    timestamp, ``do`` exclusive) and ``min_kolicina``/``max_kolicina``.
+    """
+
+    def __init__(self, pot=POT_KNJIGE, velikost_paketa=500):
+        import sqlite3
+        mapa = os.path.dirname(pot)
+        if mapa:
+            os.makedirs(mapa, exist_ok=True)
+        self.pot = pot
+        self.velikost_paketa = velikost_paketa
+        self._cakajoci = []
+        self._povezava = sqlite3.connect(pot)
+        self._povezava.execute("PRAGMA journal_mode=WAL")
+        self._povezava.execute("PRAGMA synchronous=NORMAL")
+        self._povezava.executescript(_SHEMA_KNJIGE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.zapri()
+
+    def dodaj(self, rezultat, cas=None):
+        """Queue one priced result record; ``cas`` defaults to now."""
+        if cas is None:
+            cas = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self._cakajoci.append((cas, *(rezultat[ime] for ime in _STOLPCI_KNJIGE),
+                               json.dumps(rezultat, ensure_ascii=False)))
+        if len(self._cakajoci) >= self.velikost_paketa:
+            self.shrani()
+
+    def shrani(self):
+        """Write all queued records in one transaction."""
+        if not self._cakajoci:
+            return
+        with self._povezava:
+            self._povezava.executemany(
+                "INSERT INTO ponudbe (cas, podjetje, tip, artikel, kolicina, dobava, prodaja, profit, cena_na_kos, zapis) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self._cakajoci)
+        self._cakajoci = []
+
+    def zapri(self):
+        if self._povezava is not None:
+            self.shrani()
+            self._povezava.close()
+            self._povezava = None
+
+    def __len__(self):
+        self.shrani()
+        return self._povezava.execute("SELECT COUNT(*) FROM ponudbe").fetchone()[0]
+
+    @staticmethod
+    def _pogoji(podjetje=None, artikel=None, tip=None, od=None, do=None, min_kolicina=None, max_kolicina=None):
+        pogoji = []
+        parametri = []
+        for izraz, vrednost in (("podjetje = ?", podjetje), ("artikel = ?", artikel), ("tip = ?", tip),
+                                ("cas >= ?", od), ("cas < ?", do),
+                                ("kolicina >= ?", min_kolicina), ("kolicina <= ?", max_kolicina)):
+            if vrednost is not None:
+                pogoji.append(izraz)
+                parametri.append(vrednost)
+        return (" WHERE " + " AND ".join(pogoji) if pogoji else ""), parametri
+
+    def poisci(self, **filtri):
+        """Yield matching quotes in insertion order as result records plus ``id`` and ``cas``."""
+        self.shrani()
+        kje, parametri = self._pogoji(**filtri)
+        for id_, cas, zapis in self._povezava.execute(f"SELECT id, cas, zapis FROM ponudbe{kje} ORDER BY id", parametri):
+            yield {"id": id_, "cas": cas, **json.loads(zapis)}
+
+    def profit_po_artiklih(self, **filtri):
+        """Totals per product, most profitable first.
+
+        Each row is a dict with ``artikel``, ``ponudb``, ``kolicina``,
+        ``dobava``, ``prodaja``, ``profit`` and the quantity-weighted
+        ``cena_na_kos``.
+        """
+        self.shrani()
+        kje, parametri = self._pogoji(**filtri)
+        # Summed in integer cents, so the totals are exact however many quotes there are.
+        vrstice = self._povezava.execute(
+            "SELECT artikel, COUNT(*), SUM(kolicina), SUM(CAST(ROUND(dobava * 100) AS INTEGER)), "
+            "SUM(CAST(ROUND(prodaja * 100) AS INTEGER)), SUM(CAST(ROUND(profit * 100) AS INTEGER)) AS centi "
+            f"FROM ponudbe{kje} GROUP BY artikel ORDER BY centi DESC, artikel", parametri)
+        return [{"artikel": artikel, "ponudb": ponudb, "kolicina": kolicina, "dobava": v_evre(dobava),
+                 "prodaja": v_evre(prodaja), "profit": v_evre(profit), "cena_na_kos": na_kos(prodaja, kolicina)}
+                for artikel, ponudb, kolicina, dobava, prodaja, profit in vrstice]
+
+    def izvozi(self, mapa="izracuni_dtf", **filtri):
+        """Write matching quotes as save_to_file text files under ``mapa``.
+
+        Files are laid out and named like save_to_file does it, dated by the
+        quote's ``cas``; existing files are kept and a same-named quote gets a
+        ``_2``, ``_3``... suffix. Returns the number of quotes written.
+        """
+        mape = set()
+        st = 0
+        for rezultat in self.poisci(**filtri):
+            podjetje, data, kolicina_or_metri, izbira = zapis_ponudbe(rezultat)
+            mapa_podjetja = mapa_ponudbe(mapa, podjetje, (rezultat.get("cas") or "")[:10] or None)
+            if mapa_podjetja not in mape:
+                os.makedirs(mapa_podjetja, exist_ok=True)
+                mape.add(mapa_podjetja)
+            zapisi_brez_prepisa(mapa_podjetja, ime_datoteke_ponudbe(podjetje, kolicina_or_metri, izbira),
+                                vsebina_ponudbe(podjetje, data))
+            st += 1
+        return st
+
+def pot_knjige(mapa):
+    """Ledger of the quotes saved under ``mapa``: ``mapa/ponudbe.sqlite3``, unless KNJIGA_PONUDB is set."""
+    if "KNJIGA_PONUDB" in os.environ:
+        return POT_KNJIGE
+    return os.path.join(mapa, "ponudbe.sqlite3")
+
+def zabelezi_ponudbo(rezultat, pot=None):
+    """Append one result record to the quote ledger at ``pot`` (POT_KNJIGE by default)."""
+    pot = POT_KNJIGE if pot is None else pot
+    if not pot:
+        return
+    try:
+        with KnjigaPonudb(pot) as knjiga:
+            knjiga.dodaj(rezultat)
+    except Exception as e:  # the text file is already saved; the ledger is a bonus
+        print(f"❌ Napaka pri zapisu v knjigo ponudb: {e}")
+
+# === ZLAGANJE NA ROLO ===
+SIRINA_ROLE = 44
+_EPS = 1e-9  # float slack so e.g. ten 4.4 cm logos still fit on one 44 cm shelf
+
+def zlozi_logotipe(logotipi, sirina_role=SIRINA_ROLE, razmik=0, hevristika="ffdh"):
+    """Pack logos onto a roll of width ``sirina_role`` cm with a shelf heuristic.
+
+    ``logotipi`` is a sequence of (sirina, visina, kolicina). Every logo is
+    turned so that it lies as low as possible while still fitting the roll,
+    shelves are filled tallest first, and ``hevristika`` is either "ffdh"
+    (first fit: any earlier shelf with room is reused) or "nfdh" (next fit:
+    only the last shelf is open). ``razmik`` is the cutting gap between logos.
+
+    Returns a dict with the consumed ``dolzina_cm``, the number of ``police``,
+    the film ``izkoristek`` (0..1) and ``postavitve``, a list of
+    (logotip, x, y, sirina, visina, rotirano) tuples in cm, where ``logotip``
+    is the index into ``logotipi``.
+    """
+    if hevristika not in ("ffdh", "nfdh"):
+        raise ValueError(f"Neznana hevristika zlaganja: {hevristika!r}")
+    vrste = []
+    povrsina = 0
+    for st, (sirina, visina, kolicina) in enumerate(logotipi):
+        if sirina <= 0 or visina <= 0 or kolicina <= 0:
+            raise ValueError("Vrednosti morajo biti pozitivne.")
+        if max(sirina, visina) <= sirina_role:
+            rotirano = visina > sirina
+        elif min(sirina, visina) <= sirina_role:
+            rotirano = sirina > sirina_role
+        else:
+            raise ValueError(f"Logotip #{st + 1} ({sirina}x{visina} cm) je širši od role ({sirina_role} cm).")
+        w, h = (visina, sirina) if rotirano else (sirina, visina)
+        vrste.append((h, w, st, rotirano, kolicina))
+        povrsina += sirina * visina * kolicina
+    # Tallest first; the full (h, w) key keeps the result independent of input order.
+    vrste.sort(key=lambda vrsta: (-vrsta[0], -vrsta[1], vrsta[2]))
+
+    korak_role = sirina_role + razmik
+    police = []  # [y, visina, zasedeno] with zasedeno including the trailing gap
+    odprte = []  # indexes of shelves that may still take a logo
+    vrh = 0
+    postavitve = []
+    najmanjsa = min((vrsta[1] for vrsta in vrste), default=0) + razmik
+    for h, w, st, rotirano, kolicina in vrste:
+        korak = w + razmik
+        ostane = kolicina
+        # Earlier shelves are at least as tall as this logo (sorted), so only width matters.
+        for i in odprte:
+            if not ostane:
+                break
+            y, _, zasedeno = police[i]
+            n = min(ostane, int((korak_role - zasedeno + _EPS) // korak))
+            for j in range(n):
+                postavitve.append((st, zasedeno + j * korak, y, w, h, rotirano))
+            police[i][2] = zasedeno + n * korak
+            ostane -= n
+        if hevristika == "ffdh":
+            odprte = [i for i in odprte if korak_role - police[i][2] >= najmanjsa]
+        na_polico = int((korak_role + _EPS) // korak)
+        while ostane:
+            n = min(ostane, na_polico)
+            for j in range(n):
+                postavitve.append((st, j * korak, vrh, w, h, rotirano))
+            police.append([vrh, h, n * korak])
+            if hevristika == "nfdh":
+                odprte = [len(police) - 1]
+            else:
+                odprte.append(len(police) - 1)
+            vrh += h + razmik
+            ostane -= n
+
+    dolzina_cm = vrh - razmik if police else 0
+    return {
+        "dolzina_cm": dolzina_cm,
+        "police": len(police),
+        "izkoristek": povrsina / (dolzina_cm * sirina_role) if dolzina_cm else 0,
+        "postavitve": postavitve,
+    }
+
+# === IZRAČUN ===
+def izracunaj_promocijo(izbira, kolicina):
+    """Price a promotional item. Raises ValueError with a user-facing message."""
+    if izbira not in promocijski_material:
+        raise ValueError("Napačen izdelek. Izberi iz seznama (gravura, dotisk na bloke, vzigalniki, vizitke, letaki).")
+    if kolicina <= 0:
+        raise ValueError("Količina mora biti pozitivna.")
+
+    razpon = poisci_razpon(ceniki[promocijski_material[izbira]], kolicina)
+    if razpon is None:
+        raise ValueError("Napačna količina za izbrani izdelek.")
+
+    dobava = razpon["dobava"]
+    prodaja = razpon["prodaja"]
+    return {
+        "tip": "promocija",
+        "artikel": izbira,
+        "kolicina": kolicina,
+        "dobava": dobava,
+        "prodaja": prodaja,
+        "profit": v_evre_kot(v_cente(prodaja) - v_cente(dobava), prodaja, dobava),
+        "cena_na_kos": na_kos(v_cente(prodaja), kolicina),
+    }
+
+def vrstice_promocije(rezultat):
+    """Text lines of a promotional quote, as saved by save_to_file."""
+    return [
+        f"Artikel: {rezultat['artikel'].title()}",
+        f"Količina: {rezultat['kolicina']}",
+        f"Dobavna cena: {rezultat['dobava']} €",
+        f"Prodajna cena: {rezultat['prodaja']} €",
+        f"Profit: {rezultat['profit']} €",
+        f"Cena na kos: {rezultat['cena_na_kos']} €"
+    ]
+
+def postavitev_logotipa(i, sirina, visina, kolicina):
+    """Describe the row layout of one logo on the 44 cm roll, with and without rotation."""
+    log_na_vrstico = math.floor(44 / sirina) if sirina > 0 else 0
+    vrstic = math.ceil(kolicina / log_na_vrstico) if log_na_vrstico > 0 else 1
+    visina_total = vrstic * visina
+
+    rot_log_na_vrstico = math.floor(44 / visina) if visina > 0 else 0
+    rot_vrstic = math.ceil(kolicina / rot_log_na_vrstico) if rot_log_na_vrstico > 0 else 1
+    rot_visina_total = rot_vrstic * sirina
+
+    if rot_visina_total < visina_total and rot_log_na_vrstico > 0:
+        return (
+            f"Logotip #{i}: {kolicina} × {visina}x{sirina} cm (ROTIRANO) → "
+            f"{rot_log_na_vrstico} na vrstico, {rot_vrstic} vrstic = {rot_visina_total:.2f} cm"
+        )
+    return (
+        f"Logotip #{i}: {kolicina} × {sirina}x{visina} cm → "
+        f"{log_na_vrstico} na vrstico, {vrstic} vrstic = {visina_total:.2f} cm"
+    )
+
+def napaka_artikla(katalog, izbira):
+    """Message for an unknown garment, with suggestions when something is close."""
+    sporocilo = "Napačen izdelek. Vnesi veljaven oblačilni artikel (npr. backfire) ali 'ne potrebujem ga'."
+    predlogi = katalog.predlagaj(izbira)
+    if predlogi:
+        sporocilo += " Ali si mislil: " + ", ".join(f"'{predlog}'" for predlog in predlogi) + "?"
+    return sporocilo
+
+def izracunaj_dtf(izbira, skupna_kolicina, logotipi, zlaganje=False):
+    """Price a DTF order. ``logotipi`` is a sequence of (sirina, visina, kolicina).
+
+    By default the film length is estimated from the total logo area; with
+    ``zlaganje`` the logos are packed onto the roll by zlozi_logotipe and the
+    packed length is used instead. Raises ValueError with a user-facing
+    message on invalid input.
+    """
+    katalog = ceniki["majice"]
+    if izbira != "ne potrebujem ga":
+        artikel = katalog.najdi(izbira)
+        if artikel is None:
+            raise ValueError(napaka_artikla(katalog, izbira))
+        izbira = artikel
+    if skupna_kolicina <= 0:
+        raise ValueError("Količina mora biti pozitivna.")
+    if not logotipi:
+        raise ValueError("Število logotipov mora biti pozitivno.")
+
+    # Calculate article costs if an article is selected
+    if izbira != "ne potrebujem ga":
+        cena = katalog.cena_v_centih(izbira, skupna_kolicina)
+        if cena is None:
+            raise ValueError("Napačna količina ali izdelek.")
+        artikel_dobava = v_evre(cena[0] * skupna_kolicina)
+        artikel_prodaja = v_evre(cena[1] * skupna_kolicina)
+    else:
+        artikel_dobava = 0
+        artikel_prodaja = 0
+
+    skupna_povrsina_cm2 = 0
+    podrobnosti = []
+    for i, (sirina, visina, kolicina) in enumerate(logotipi, 1):
+        if sirina <= 0 or visina <= 0 or kolicina <= 0:
+            raise ValueError("Vrednosti morajo biti pozitivne.")
+        podrobnosti.append(postavitev_logotipa(i, sirina, visina, kolicina))
+        skupna_povrsina_cm2 += sirina * visina * kolicina
+
+    # Calculate DTF costs
+    if zlaganje:
+        zlozeno = zlozi_logotipe(logotipi)
+        podrobnosti.append(
+            f"Zloženo na rolo: {zlozeno['dolzina_cm']:.2f} cm, {zlozeno['police']} polic, "
+            f"izkoristek {zlozeno['izkoristek']:.0%}"
+        )
+        povrsinska_dolzina_m = zlozeno["dolzina_cm"] / 100
+    else:
+        povrsinska_dolzina_m = skupna_povrsina_cm2 / (44 * 100)
+    if not math.isfinite(povrsinska_dolzina_m):
+        raise ValueError("Logotipi so preveliki za izračun dolžine tiska.")
+    povrsinska_z_rezervo = round(povrsinska_dolzina_m + 0.2, 2)
+    dtf_dobava, dtf_prodaja = interpoliraj_ceno(povrsinska_z_rezervo, ceniki["dtf"])
+
+    # Calculate total costs and profit
+    skupna_dobava = v_cente(dtf_dobava) + v_cente(artikel_dobava)
+    skupna_prodaja = v_cente(dtf_prodaja) + v_cente(artikel_prodaja)
+    return {
+        "tip": "dtf",
+        "artikel": izbira,
+        "kolicina": skupna_kolicina,
+        "podrobnosti": podrobnosti,
+        "dolzina_m": povrsinska_z_rezervo,
+        "dtf_dobava": dtf_dobava,
+        "dtf_prodaja": dtf_prodaja,
+        "artikel_dobava": artikel_dobava,
+        "artikel_prodaja": artikel_prodaja,
+        "dobava": v_evre(skupna_dobava),
+        "prodaja": v_evre(skupna_prodaja),
+        "profit": v_evre(skupna_prodaja - skupna_dobava),
+        "cena_na_kos": na_kos(skupna_prodaja, skupna_kolicina),
+    }
+
+def vrstice_dtf(rezultat):
+    """Text lines of a DTF quote, as saved by save_to_file."""
+    artikel_ime = rezultat["artikel"]
+    data = [
+        f"Artikel: {artikel_ime.title()}",
+        f"Količina: {rezultat['kolicina']}"
+    ] + rezultat["podrobnosti"] + [
+        f"DTF tisk:",
+        f"  Referenčna dolžina: {rezultat['dolzina_m']} m",
+        f"  Dobavna cena: {rezultat['dtf_dobava']} €",
+        f"  Prodajna cena: {rezultat['dtf_prodaja']} €"
+    ]
+    if artikel_ime != "ne potrebujem ga":
+        data += [
+            f"{artikel_ime.title()}:",
+            f"  Dobavna cena: {rezultat['artikel_dobava']:.2f} €",
+            f"  Prodajna cena: {rezultat['artikel_prodaja']:.2f} €"
+        ]
+    data += [
+        f"Skupaj:",
+        f"  Dobavna cena: {rezultat['dobava']} €",
+        f"  Prodajna cena: {rezultat['prodaja']} €",
+        f"  Profit: {rezultat['profit']} €",
+        f"  Cena na kos: {rezultat['cena_na_kos']} €"
+    ]
+    return data
+
+# === SKUPNO NAROČILO ===
+def _razdeli_cente(centi, utezi):
+    """Split ``centi`` over ``utezi`` in whole cents; the parts add up to ``centi``."""
+    skupaj = sum(utezi)
+    deli = []
+    prej = kumulativa = 0
+    for utez in utezi:
+        kumulativa += utez
+        do = round(centi * kumulativa / skupaj)
+        deli.append(do - prej)
+        prej = do
+    return deli
+
+def _razdeli(znesek, utezi):
+    """Split ``znesek`` over ``utezi`` in whole cents; the parts add up to the rounded amount."""
+    return [v_evre(del_) for del_ in _razdeli_cente(v_cente(znesek), utezi)]
+
+def _skupine_v_ceniku(kolicina, indeksi, vrstice, ime, cena):
+    """The lines of one price group as (kolicina, indeksi) parts that ``cena`` can price.
+
+    The combined quantity if it has a tier, otherwise every line on its own;
+    a line without a tier of its own raises ValueError naming it.
+    """
+    if cena(kolicina) is not None:
+        return [(kolicina, indeksi)]
+    deli = []
+    for i in indeksi:
+        kolicina = vrstice[i]["kolicina"]
+        if cena(kolicina) is None:
+            raise ValueError(f"Postavka {i + 1}: napačna količina ({kolicina}) za {ime}.")
+        deli.append((kolicina, [i]))
+    return deli
+
+def izracunaj_skupno(postavke, zlaganje=False):
+    """Price a multi-line order as one consolidated quote.
+
+    ``postavke`` are dicts shaped like batch rows: {"tip": "promocija",
+    "izdelek", "kolicina"} or {"tip": "dtf", "izdelek" (a garment or
+    "ne potrebujem ga"), "kolicina", "logotipi"}. Lines on the same price
+    list share one tier lookup on their combined quantity (promotional items
+    per cenik, garments per catalogue name), so together they can reach a
+    cheaper tier than each would alone; the group price is shared out by
+    quantity. All logos of the order go on one DTF film run whose length is
+    estimated from the total area (or packed with ``zlaganje``) and priced
+    once, then shared out by logo area. Shares are whole cents and add up to
+    the group totals. When a combined quantity falls outside the tier table,
+    the lines of that group are priced one by one, as single quotes would be.
+
+    Work is linear in the number of lines and logos (packing aside). Raises
+    ValueError naming the first bad line, or when ``postavke`` is not a list
+    of dicts.
+    """
+    if not isinstance(postavke, (list, tuple)):
+        raise ValueError("Postavke morajo biti seznam.")
+    for st, postavka in enumerate(postavke, 1):
+        if not isinstance(postavka, dict):
+            raise ValueError(f"Postavka {st}: mora biti JSON objekt, ne {type(postavka).__name__}.")
+    katalog = ceniki["majice"]
+    skupine_promocij = {}  # ime cenika -> [kolicina, indeksi vrstic]
+    skupine_majic = {}  # artikel -> [kolicina, indeksi vrstic]
+    logotipi = []
+    povrsine = []
+    vrstice = []
+    for st, postavka in enumerate(postavke, 1):
+        try:
+            tip = str(postavka.get("tip", "")).strip().lower()
+            izdelek = str(postavka.get("izdelek", "")).strip().lower()
+            kolicina = int(postavka["kolicina"])
+            if kolicina <= 0:
+                raise ValueError("Količina mora biti pozitivna.")
+            povrsina = 0
+            skupina = None
+            if tip == "promocija":
+                if izdelek not in promocijski_material:
+                    raise ValueError("Napačen izdelek. Izberi iz seznama "
+                                     "(gravura, dotisk na bloke, vzigalniki, vizitke, letaki).")
+                skupina = skupine_promocij.setdefault(promocijski_material[izdelek], [0, []])
+            elif tip == "dtf":
+                if izdelek != "ne potrebujem ga":
+                    artikel = katalog.najdi(izdelek)
+                    if artikel is None:
+                        raise ValueError(napaka_artikla(katalog, izdelek))
+                    izdelek = artikel
+                    skupina = skupine_majic.setdefault(izdelek, [0, []])
+                for sirina, visina, st_logotipov in _preberi_logotipe(postavka.get("logotipi") or []):
+                    if sirina <= 0 or visina <= 0 or st_logotipov <= 0:
+                        raise ValueError("Vrednosti morajo biti pozitivne.")
+                    logotipi.append((sirina, visina, st_logotipov))
+                    povrsina += sirina * visina * st_logotipov
+                if skupina is None and not povrsina:
+                    raise ValueError("Število logotipov mora biti pozitivno.")
+            else:
+                raise ValueError(f"Neznan tip postavke: {tip!r}")
+        except KeyError as e:
+            raise ValueError(f"Postavka {st}: manjka polje {e}.") from None
+        except (TypeError, ValueError, OverflowError) as e:
+            raise ValueError(f"Postavka {st}: {e}") from None
+        if skupina is not None:
+            skupina[0] += kolicina
+            skupina[1].append(len(vrstice))
+        vrstice.append({"tip": tip, "artikel": izdelek, "kolicina": kolicina})
+        povrsine.append(povrsina)
+    if not vrstice:
+        raise ValueError("Naročilo nima postavk.")
+
+    # Line totals are kept in cents until the end.
+    dobave = [0] * len(vrstice)
+    prodaje = [0] * len(vrstice)
+    skupine = []
+    for ime, (kolicina, indeksi) in skupine_promocij.items():
+        for kolicina, indeksi in _skupine_v_ceniku(kolicina, indeksi, vrstice, ime,
+                                                   lambda kolicina: poisci_razpon(ceniki[ime], kolicina)):
+            razpon = poisci_razpon(ceniki[ime], kolicina)
+            kolicine = [vrstice[i]["kolicina"] for i in indeksi]
+            for i, dobava, prodaja in zip(indeksi, _razdeli_cente(v_cente(razpon["dobava"]), kolicine),
+                                          _razdeli_cente(v_cente(razpon["prodaja"]), kolicine)):
+                dobave[i] += dobava
+                prodaje[i] += prodaja
+            skupine.append({"cenik": ime, "kolicina": kolicina, "dobava": razpon["dobava"],
+                            "prodaja": razpon["prodaja"]})
+    for artikel, (kolicina, indeksi) in skupine_majic.items():
+        for kolicina, indeksi in _skupine_v_ceniku(kolicina, indeksi, vrstice, artikel,
+                                                   lambda kolicina: katalog.cena(artikel, kolicina)):
+            cena = katalog.cena(artikel, kolicina)
+            centi = katalog.cena_v_centih(artikel, kolicina)
+            for i in indeksi:
+                vrstica = vrstice[i]
+                dobava = centi[0] * vrstica["kolicina"]
+                prodaja = centi[1] * vrstica["kolicina"]
+                vrstica["artikel_dobava"] = v_evre(dobava)
+                vrstica["artikel_prodaja"] = v_evre(prodaja)
+                dobave[i] += dobava
+                prodaje[i] += prodaja
+            skupine.append({"cenik": artikel, "kolicina": kolicina, "dobava_na_kos": cena[0],
+                            "prodaja_na_kos": cena[1]})
+
+    dolzina_m = dtf_dobava = dtf_prodaja = 0
+    zlozeno = None
+    if logotipi:
+        if zlaganje:
+            zlozeno = zlozi_logotipe(logotipi)
+            dolzina_m = zlozeno["dolzina_cm"] / 100
+        else:
+            dolzina_m = sum(povrsine) / (SIRINA_ROLE * 100)
+        if not math.isfinite(dolzina_m):
+            raise ValueError("Logotipi so preveliki za izračun dolžine tiska.")
+        dolzina_m = round(dolzina_m + 0.2, 2)
+        dtf_dobava, dtf_prodaja = interpoliraj_ceno(dolzina_m, ceniki["dtf"])
+        z_logotipi = [i for i, povrsina in enumerate(povrsine) if povrsina]
+        utezi = [povrsine[i] for i in z_logotipi]
+        for i, dobava, prodaja in zip(z_logotipi, _razdeli_cente(v_cente(dtf_dobava), utezi),
+                                      _razdeli_cente(v_cente(dtf_prodaja), utezi)):
+            vrstice[i]["dtf_dobava"] = v_evre(dobava)
+            vrstice[i]["dtf_prodaja"] = v_evre(prodaja)
+            dobave[i] += dobava
+            prodaje[i] += prodaja
+
+    for vrstica, dobava, prodaja in zip(vrstice, dobave, prodaje):
+        vrstica["dobava"] = v_evre(dobava)
+        vrstica["prodaja"] = v_evre(prodaja)
+        vrstica["profit"] = v_evre(prodaja - dobava)
+        vrstica["cena_na_kos"] = na_kos(prodaja, vrstica["kolicina"])
+    skupna_kolicina = sum(vrstica["kolicina"] for vrstica in vrstice)
+    skupna_dobava = sum(dobave)
+    skupna_prodaja = sum(prodaje)
+    rezultat = {
+        "tip": "narocilo",
+        "artikel": "narocilo",
+        "kolicina": skupna_kolicina,
+        "postavke": vrstice,
+        "skupine": skupine,
+        "dolzina_m": dolzina_m,
+        "dtf_dobava": dtf_dobava,
+        "dtf_prodaja": dtf_prodaja,
+        "dobava": v_evre(skupna_dobava),
+        "prodaja": v_evre(skupna_prodaja),
+        "profit": v_evre(skupna_prodaja - skupna_dobava),
+        "cena_na_kos": na_kos(skupna_prodaja, skupna_kolicina),
+    }
+    if zlozeno is not None:
+        rezultat["zlozeno"] = (f"Zloženo na rolo: {zlozeno['dolzina_cm']:.2f} cm, {zlozeno['police']} polic, "
+                               f"izkoristek {zlozeno['izkoristek']:.0%}")
+    return rezultat
+
+def ime_postavke(artikel):
+    """Display name of an order line's article; customers' own garments are DTF print only."""
+    return "DTF tisk (lastni izdelki)" if artikel == "ne potrebujem ga" else artikel.title()
+
+def vrstice_narocila(rezultat):
+    """Text lines of a consolidated order quote, as saved by save_to_file."""
+    data = [f"Naročilo: {len(rezultat['postavke'])} postavk, skupaj {rezultat['kolicina']} kos"]
+    for st, vrstica in enumerate(rezultat["postavke"], 1):
+        data.append(f"  {st}. {ime_postavke(vrstica['artikel'])} × {vrstica['kolicina']}: "
+                    f"dobava {vrstica['dobava']} €, prodaja {vrstica['prodaja']} €, "
+                    f"cena na kos {vrstica['cena_na_kos']} €")
+    data.append("Cenovni razredi:")
+    for skupina in rezultat["skupine"]:
+        if "dobava_na_kos" in skupina:
+            data.append(f"  {skupina['cenik'].title()}: {skupina['kolicina']} kos → "
+                        f"{skupina['dobava_na_kos']:.2f} / {skupina['prodaja_na_kos']:.2f} € na kos")
+        else:
+            data.append(f"  {skupina['cenik'].title()}: {skupina['kolicina']} kos → "
+                        f"dobava {skupina['dobava']} €, prodaja {skupina['prodaja']} €")
+    if rezultat["dolzina_m"]:
+        data += [
+            "DTF tisk (vsi logotipi na eni roli):",
+            f"  Referenčna dolžina: {rezultat['dolzina_m']} m",
+            f"  Dobavna cena: {rezultat['dtf_dobava']} €",
+            f"  Prodajna cena: {rezultat['dtf_prodaja']} €",
+        ]
+        if "zlozeno" in rezultat:
+            data.append(f"  {rezultat['zlozeno']}")
+    data += [
+        "Skupaj:",
+        f"  Dobavna cena: {rezultat['dobava']} €",
+        f"  Prodajna cena: {rezultat['prodaja']} €",
+        f"  Profit: {rezultat['profit']} €",
+        f"  Cena na kos: {rezultat['cena_na_kos']} €",
+    ]
+    return data
+
+# === OBRATNI IZRAČUN ===
+# The same film reserve izracunaj_dtf adds to the area-based length.
+_REZERVA_M = 0.2
+
+class ResevalecRazponov:
+    """Inverse queries over one promotional tier table.
+
+    A quote costs its tier's ``prodaja``, whatever the quantity inside the
+    tier. Two monotone arrays, built once, turn every question into a bisect:
+
+    - ``najcenejse[i]`` is the lowest total of tiers i and above (a suffix
+      minimum, non-decreasing), for "how many for this budget";
+    - ``najnizje[i]`` is the lowest quoted price per piece up to tier i (a
+      prefix minimum of prodaja / max, non-increasing), for "how many to get
+      the price per piece down to X".
+    """
+    __slots__ = ("cenik", "dolzina", "razponi", "mini", "maksi", "prodajne",
+                 "najcenejse", "najcenejsi", "najnizje")
+
+    def __init__(self, cenik):
+        self.cenik = cenik
+        self.dolzina = len(cenik)
+        self.razponi = sorted(cenik, key=lambda r: r["min"])
+        self.mini = [r["min"] for r in self.razponi]
+        self.maksi = [r["max"] for r in self.razponi]
+        self.prodajne = [r["prodaja"] for r in self.razponi]
+        n = len(self.razponi)
+        # Ties go to the later tier: the same money buys more pieces there.
+        self.najcenejse = [0] * n
+        self.najcenejsi = [0] * n
+        najcenejsi = n - 1
+        for i in range(n - 1, -1, -1):
+            if self.prodajne[i] < self.prodajne[najcenejsi]:
+                najcenejsi = i
+            self.najcenejsi[i] = najcenejsi
+            self.najcenejse[i] = self.prodajne[najcenejsi]
+        self.najnizje = []
+        najnizja = math.inf
+        for i in range(n):
+            najnizja = min(najnizja, na_kos(v_cente(self.prodajne[i]), self.maksi[i]))
+            self.najnizje.append(-najnizja)  # negated so bisect sees it ascending
+
+    def najvec_za_proracun(self, proracun):
+        """Largest quantity whose quote costs at most ``proracun``, or None."""
+        i = bisect.bisect_right(self.najcenejse, proracun) - 1
+        return None if i < 0 else self.maksi[i]
+
+    def najmanj_za_ceno_na_kos(self, cena_na_kos):
+        """Smallest quantity quoted at ``cena_na_kos`` or less per piece, or None."""
+        if cena_na_kos <= 0:
+            raise ValueError("Cena na kos mora biti pozitivna.")
+        i = bisect.bisect_left(self.najnizje, -cena_na_kos)
+        if i == len(self.razponi):
+            return None
+        prodaja = self.prodajne[i]
+        # Below prodaja / (X + 0.0005) the rounded price per piece is above X,
+        # so this is at most a step or two short of the answer.
+        kolicina = max(self.mini[i], math.floor(prodaja / (cena_na_kos + 0.0005)))
+        while na_kos(v_cente(prodaja), kolicina) > cena_na_kos:
+            kolicina += 1
+        return kolicina
+
+    def najboljsa_ponudba(self, kolicina):
+        """Cheapest (kolicina, prodaja) for at least ``kolicina`` pieces, or None.
+
+        That is the upper bound of the cheapest tier from the one holding
+        ``kolicina`` upwards: a customer asking for 45 vizitke gets 50 for the
+        same money, or more if a larger tier happens to be cheaper.
+        """
+        i = bisect.bisect_right(self.mini, kolicina) - 1
+        if i < 0 or kolicina > self.maksi[i]:
+            i += 1
+        if i >= len(self.razponi):
+            return None
+        j = self.najcenejsi[i]
+        return self.maksi[j], self.prodajne[j]
+
+    def meje(self):
+        """Every tier with its best quantity (the upper bound) and price per piece there.
+
+        ``smiselno`` is False for tiers a larger quantity beats or matches on price.
+        """
+        n = len(self.razponi)
+        return [
+            {
+                "min": self.mini[i],
+                "max": self.maksi[i],
+                "prodaja": self.prodajne[i],
+                "cena_na_kos": na_kos(v_cente(self.prodajne[i]), self.maksi[i]),
+                "smiselno": i == n - 1 or self.prodajne[i] < self.najcenejse[i + 1],
+            }
+            for i in range(n)
+        ]
+
+class ResevalecDTF:
+    """Inverse queries over the DTF price curve (sale prices).
+
+    Works on the breakpoints of the compiled InterpolatorCen: a suffix minimum
+    of each segment's lowest price answers "how many metres for this budget",
+    a prefix minimum of the price per metre at each breakpoint answers "how
+    many metres to get the price per metre down to X"; both are bisects, and
+    the segment found is inverted linearly. ``rezerva`` metres are not counted
+    as printed length in the price per metre (see kosov_za_ceno_na_kos).
+    Answers stay within the price list: past the last breakpoint the curve is
+    flat, which would make every large budget "unlimited".
+    """
+    __slots__ = ("interpolator", "rezerva", "najcenejse", "najnizje")
+
+    def __init__(self, interpolator, rezerva=0):
+        self.interpolator = interpolator
+        self.rezerva = rezerva
+        tocke, prodajne = interpolator.tocke, interpolator.prodajne
+        n = len(tocke) - 1  # segments
+        self.najcenejse = [0] * n
+        najcenejsa = math.inf
+        for i in range(n - 1, -1, -1):
+            najcenejsa = min(najcenejsa, prodajne[i], prodajne[i + 1])
+            self.najcenejse[i] = najcenejsa
+        self.najnizje = [-math.inf]  # point 0 is never a valid length
+        najnizja = math.inf
+        for i in range(1, len(tocke)):
+            if tocke[i] > rezerva:
+                najnizja = min(najnizja, prodajne[i] / (tocke[i] - rezerva))
+            self.najnizje.append(-najnizja)
+
+    def _cena(self, metri):
+        return self.interpolator(metri)[1]
+
+    def najvec_metrov(self, proracun):
+        """Longest film (to 0.01 m) whose sale price is at most ``proracun``, or None."""
+        i = bisect.bisect_right(self.najcenejse, proracun) - 1
+        if i < 0:
+            return None
+        interpolator = self.interpolator
+        zacetek, konec = interpolator.tocke[i], interpolator.tocke[i + 1]
+        if interpolator.prodajne[i + 1] <= proracun:
+            return konec
+        metri = zacetek + (proracun - interpolator.prodajne[i]) / interpolator.razlike_p[i] * interpolator.razlike_m[i]
+        # Prices are rounded to cents, so settle the last centimetre by pricing it.
+        metri = max(round(math.floor(metri * 100 + 1e-9) / 100, 2), zacetek)
+        while metri > zacetek and self._cena(metri) > proracun:
+            metri = round(metri - 0.01, 2)
+        while metri + 0.01 <= konec and self._cena(round(metri + 0.01, 2)) <= proracun:
+            metri = round(metri + 0.01, 2)
+        return metri if metri > 0 else None
+
+    def najmanj_metrov(self, cena_na_meter):
+        """Shortest film (to 0.01 m) priced at ``cena_na_meter`` or less per metre past the reserve, or None."""
+        if cena_na_meter <= 0:
+            raise ValueError("Cena mora biti pozitivna.")
+        i = bisect.bisect_left(self.najnizje, -cena_na_meter)
+        if i == len(self.najnizje):
+            return None
+        interpolator, rezerva = self.interpolator, self.rezerva
+        zacetek, konec = max(interpolator.tocke[i - 1], rezerva), interpolator.tocke[i]
+        # On the segment the price is a + b * metri; solve a + b * m <= X * (m - rezerva).
+        b = interpolator.razlike_p[i - 1] / interpolator.razlike_m[i - 1]
+        a = interpolator.prodajne[i - 1] - b * interpolator.tocke[i - 1]
+        metri = (a + cena_na_meter * rezerva) / (cena_na_meter - b) if cena_na_meter > b else zacetek
+        metri = min(max(round(math.ceil(metri * 100 - 1e-9) / 100, 2), zacetek), konec)
+
+        def dovolj(m):
+            return m > rezerva and self._cena(m) <= cena_na_meter * (m - rezerva)
+
+        while metri < konec and not dovolj(metri):
+            metri = round(metri + 0.01, 2)
+        while metri - 0.01 > zacetek and dovolj(round(metri - 0.01, 2)):
+            metri = round(metri - 0.01, 2)
+        return metri if dovolj(metri) else None
+
+    def _metri_kosov(self, kolicina, povrsina_cm2):
+        return round(kolicina * povrsina_cm2 / (SIRINA_ROLE * 100) + self.rezerva, 2)
+
+    def kosov_za_proracun(self, proracun, povrsina_cm2):
+        """Most pieces with ``povrsina_cm2`` of logos each that the film budget covers, or None.
+
+        Lengths are estimated from the area as izracunaj_dtf does, with this
+        solver's ``rezerva`` (pass _REZERVA_M to match quotes).
+        """
+        metri = self.najvec_metrov(proracun)
+        if metri is None or metri <= self.rezerva:
+            return None
+        kolicina = math.floor((metri - self.rezerva) * SIRINA_ROLE * 100 / povrsina_cm2 + 1e-9)
+        while kolicina > 0 and (self._metri_kosov(kolicina, povrsina_cm2) > metri
+                                or self._cena(self._metri_kosov(kolicina, povrsina_cm2)) > proracun):
+            kolicina -= 1
+        while (self._metri_kosov(kolicina + 1, povrsina_cm2) <= metri
+               and self._cena(self._metri_kosov(kolicina + 1, povrsina_cm2)) <= proracun):
+            kolicina += 1
+        return kolicina or None
+
+    def kosov_za_ceno_na_kos(self, cena_na_kos, povrsina_cm2):
+        """Fewest pieces with ``povrsina_cm2`` of logos each whose film is quoted at ``cena_na_kos`` or less per piece.
+
+        A piece uses povrsina / 4400 metres, so the price per piece is that
+        times the price per printed metre: the metre solver does the search.
+        """
+        na_kos_m = povrsina_cm2 / (SIRINA_ROLE * 100)
+        metri = self.najmanj_metrov(cena_na_kos / na_kos_m)
+        if metri is None:
+            return None
+        konec = self.interpolator.tocke[-1]
+
+        def dovolj(kolicina):
+            return na_kos(v_cente(self._cena(self._metri_kosov(kolicina, povrsina_cm2))), kolicina) <= cena_na_kos
+
+        kolicina = max(1, math.ceil((metri - self.rezerva) / na_kos_m - 1e-9))
+        while not dovolj(kolicina):
+            if self._metri_kosov(kolicina, povrsina_cm2) > konec:
+                return None
+            kolicina += 1
+        while kolicina > 1 and dovolj(kolicina - 1):
+            kolicina -= 1
+        return kolicina
+
+_resevalci = {}
+
+def resevalec_razponov(cenik):
+    """Return the solver for a promotional cenik list, (re)building it if needed."""
+    resevalec = _resevalci.get(id(cenik))
+    if resevalec is None or resevalec.cenik is not cenik or resevalec.dolzina != len(cenik):
+        resevalec = ResevalecRazponov(cenik)
+        _resevalci[id(cenik)] = resevalec
+    return resevalec
+
+def resevalec_dtf(cenik, rezerva=0):
+    """Return the solver for a DTF cenik, (re)building it with its interpolator."""
+    interpolator = interpolator_cenika(cenik)
+    kljuc = (id(interpolator), rezerva)
+    resevalec = _resevalci.get(kljuc)
+    if resevalec is None or resevalec.interpolator is not interpolator:
+        resevalec = ResevalecDTF(interpolator, rezerva)
+        _resevalci[kljuc] = resevalec
+    return resevalec
+
+def izpisi_meje(artikli=None):
+    """Print the tier boundaries of promotional items and the DTF breakpoints."""
+    for artikel in artikli or list(promocijski_material) + ["dtf"]:
+        print(f"{artikel}:")
+        if artikel == "dtf":
+            interpolator = interpolator_cenika(ceniki["dtf"])
+            for metri, prodaja in zip(interpolator.tocke[1:], interpolator.prodajne[1:]):
+                print(f"  {metri} m: {prodaja} € ({round(prodaja / metri, 3)} € na m)")
+            continue
+        for meja in resevalec_razponov(ceniki[promocijski_material[artikel]]).meje():
+            opomba = "" if meja["smiselno"] else " — višja količina je enako draga ali cenejša"
+            print(f"  {meja['min']}-{meja['max']} kos: {meja['prodaja']} €, najbolje {meja['max']} kos "
+                  f"({meja['cena_na_kos']} € na kos){opomba}")
+
+def obratni_izracun(proracun=None, cena_na_kos=None, artikli=None, povrsina_cm2=None):
+    """Answer a budget or price-per-piece question for several products at once.
+
+    ``artikli`` defaults to every promotional item plus "dtf". For DTF the
+    answer is in metres of film, or in pieces when ``povrsina_cm2`` (logo
+    area per piece) is given. Returns one dict per product with ``kolicina``
+    (None when no quantity qualifies), ``enota`` and, where there is a
+    quantity, ``prodaja`` and ``cena_na_kos`` as a quote would show them.
+    """
+    if (proracun is None) == (cena_na_kos is None):
+        raise ValueError("Podaj proračun ali ceno na kos.")
+    if proracun is not None and proracun <= 0:
+        raise ValueError("Proračun mora biti pozitiven.")
+    if povrsina_cm2 is not None and povrsina_cm2 <= 0:
+        raise ValueError("Površina mora biti pozitivna.")
+    rezultati = []
+    for artikel in artikli or list(promocijski_material) + ["dtf"]:
+        if artikel == "dtf":
+            if povrsina_cm2 is None:
+                resevalec = resevalec_dtf(ceniki["dtf"])
+                kolicina = (resevalec.najvec_metrov(proracun) if proracun is not None
+                            else resevalec.najmanj_metrov(cena_na_kos))
+                enota, metri = "m", kolicina
+            else:
+                resevalec = resevalec_dtf(ceniki["dtf"], _REZERVA_M)
+                kolicina = (resevalec.kosov_za_proracun(proracun, povrsina_cm2) if proracun is not None
+                            else resevalec.kosov_za_ceno_na_kos(cena_na_kos, povrsina_cm2))
+                enota = "kos"
+                metri = None if kolicina is None else resevalec._metri_kosov(kolicina, povrsina_cm2)
+            rezultat = {"artikel": artikel, "kolicina": kolicina, "enota": enota}
+            if kolicina is not None:
+                prodaja = interpoliraj_ceno(metri, ceniki["dtf"])[1]
+                rezultat.update(dolzina_m=metri, prodaja=prodaja, cena_na_kos=na_kos(v_cente(prodaja), kolicina))
+        else:
+            if artikel not in promocijski_material:
+                raise ValueError(f"Neznan izdelek: {artikel}")
+            resevalec = resevalec_razponov(ceniki[promocijski_material[artikel]])
+            kolicina = (resevalec.najvec_za_proracun(proracun) if proracun is not None
+                        else resevalec.najmanj_za_ceno_na_kos(cena_na_kos))
+            rezultat = {"artikel": artikel, "kolicina": kolicina, "enota": "kos"}
+            if kolicina is not None:
+                ponudba = izracunaj_promocijo(artikel, kolicina)
+                rezultat.update(prodaja=ponudba["prodaja"], cena_na_kos=ponudba["cena_na_kos"])
+        rezultati.append(rezultat)
+    return rezultati
+
+# === DNEVNI NAČRT TISKA ===
+def nacrtuj_tisk(narocila, zlaganje=True, maks_m=None):
+    """Plan a day's DTF orders onto shared film runs and share each run's price back out.
+
+    ``narocila`` are batch rows ({"tip", "podjetje", "logotipi", ...}); rows
+    whose ``tip`` is not "dtf" are skipped. Only the film is planned,
+    garments keep their own prices. Printed alone, every order is a run of
+    its own length plus the 0.2 m reserve. Here orders are placed first-fit
+    decreasing by length into runs of at most ``maks_m`` metres (by default
+    the last DTF breakpoint, past which the price curve is flat), each run
+    is repacked as a whole after every addition so logos of different
+    customers share shelves, and a run carries one reserve.
+    The fit test uses the run's packed length plus the order's own length,
+    which repacking can only shorten. With ``zlaganje`` False lengths come
+    from the logo area, as in izracunaj_dtf.
+
+    Every run is priced once and its price is shared out over its orders in
+    proportion to what each would cost alone, in whole cents, so the saving
+    is shared the same way and no customer pays more than alone when the run
+    is cheaper than its orders apart (an order only joins a run if it is).
+    Returns {"zagoni": [...], "narocila": [...], "skupaj": {...}}; orders
+    keep their input order and ``narocilo`` is the row number (from 1).
+    Raises ValueError naming the first bad row.
+    """
+    interpolator = interpolator_cenika(ceniki["dtf"])
+    if maks_m is None:
+        maks_m = interpolator.tocke[-1]
+    if maks_m <= _REZERVA_M:
+        raise ValueError(f"Največja dolžina mora biti večja od rezerve ({_REZERVA_M} m).")
+    zmogljivost_cm = (maks_m - _REZERVA_M) * 100
+
+    def dolzina_cm(logotipi, povrsina):
+        return zlozi_logotipe(logotipi)["dolzina_cm"] if zlaganje else povrsina / SIRINA_ROLE
+
+    postavke = []
+    for st, narocilo in enumerate(narocila, 1):
+        try:
+            narocilo = preberi_narocilo(narocilo)
+        except ValueError as e:
+            raise ValueError(f"Naročilo {st}: {e}") from None
+        if str(narocilo.get("tip", "dtf")).strip().lower() != "dtf":
+            continue
+        try:
+            logotipi = _preberi_logotipe(narocilo.get("logotipi") or [])
+            if not logotipi:
+                raise ValueError("Število logotipov mora biti pozitivno.")
+            povrsina = 0
+            for sirina, visina, kolicina in logotipi:
+                if sirina <= 0 or visina <= 0 or kolicina <= 0:
+                    raise ValueError("Vrednosti morajo biti pozitivne.")
+                povrsina += sirina * visina * kolicina
+            cm = dolzina_cm(logotipi, povrsina)
+        except KeyError as e:
+            raise ValueError(f"Naročilo {st}: manjka polje {e}.") from None
+        except (TypeError, ValueError, OverflowError) as e:
+            raise ValueError(f"Naročilo {st}: {e}") from None
+        samostojno_m = round(cm / 100 + _REZERVA_M, 2)
+        dobava, prodaja = interpolator(samostojno_m)
+        postavke.append({
+            "narocilo": st,
+            "podjetje": narocilo.get("podjetje", ""),
+            "logotipi": logotipi,
+            "povrsina": povrsina,
+            "cm": cm,
+            "samostojno_m": samostojno_m,
+            "samostojno_dobava": dobava,
+            "samostojno_prodaja": prodaja,
+        })
+    if not postavke:
+        raise ValueError("Ni naročil DTF.")
+
+    def cena_zagona(cm):
+        return interpolator(round(cm / 100 + _REZERVA_M, 2))[1]
+
+    zagoni = []  # [dolzina_cm, logotipi, povrsina, indeksi]
+    for i in sorted(range(len(postavke)), key=lambda i: (-postavke[i]["cm"], i)):
+        postavka = postavke[i]
+        for zagon in zagoni:
+            if zagon[0] + postavka["cm"] > zmogljivost_cm + _EPS:
+                continue
+            logotipi = zagon[1] + postavka["logotipi"]
+            povrsina = zagon[2] + postavka["povrsina"]
+            cm = min(zagon[0] + postavka["cm"], dolzina_cm(logotipi, povrsina))
+            # Joining a run must not cost more than printing the order on its own.
+            if cena_zagona(cm) > cena_zagona(zagon[0]) + postavka["samostojno_prodaja"]:
+                continue
+            zagon[:] = [cm, logotipi, povrsina, zagon[3] + [i]]
+            break
+        else:
+            zagoni.append([postavka["cm"], list(postavka["logotipi"]), postavka["povrsina"], [i]])
+
+    izid_zagonov = []
+    narocila_izid = [None] * len(postavke)
+    for st, (cm, _, povrsina, indeksi) in enumerate(zagoni, 1):
+        indeksi.sort()
+        dolzina_m = round(cm / 100 + _REZERVA_M, 2)
+        dobava, prodaja = interpolator(dolzina_m)
+        utezi_dobave = [postavke[i]["samostojno_dobava"] for i in indeksi]
+        utezi_prodaje = [postavke[i]["samostojno_prodaja"] for i in indeksi]
+        for i, dobava_dela, prodaja_dela in zip(indeksi, _razdeli(dobava, utezi_dobave),
+                                                _razdeli(prodaja, utezi_prodaje)):
+            postavka = postavke[i]
+            narocila_izid[i] = {
+                "narocilo": postavka["narocilo"],
+                "podjetje": postavka["podjetje"],
+                "zagon": st,
+                "dtf_dobava": dobava_dela,
+                "dtf_prodaja": prodaja_dela,
+                "samostojno_m": postavka["samostojno_m"],
+                "samostojno_dobava": postavka["samostojno_dobava"],
+                "samostojno_prodaja": postavka["samostojno_prodaja"],
+                "prihranek": v_evre(v_cente(postavka["samostojno_prodaja"]) - v_cente(prodaja_dela)),
+            }
+        izid_zagonov.append({
+            "zagon": st,
+            "dolzina_m": dolzina_m,
+            "narocila": [postavke[i]["narocilo"] for i in indeksi],
+            "izkoristek": povrsina / (cm * SIRINA_ROLE) if cm else 0,
+            "dtf_dobava": dobava,
+            "dtf_prodaja": prodaja,
+        })
+    skupaj_dobava = sestej_cente([zagon["dtf_dobava"] for zagon in izid_zagonov])
+    skupaj_prodaja = sestej_cente([zagon["dtf_prodaja"] for zagon in izid_zagonov])
+    samostojno_prodaja = sestej_cente([postavka["samostojno_prodaja"] for postavka in postavke])
+    return {
+        "zagoni": izid_zagonov,
+        "narocila": narocila_izid,
+        "skupaj": {
+            "zagonov": len(izid_zagonov),
+            "dolzina_m": round(sum(zagon["dolzina_m"] for zagon in izid_zagonov), 2),
+            "dtf_dobava": v_evre(skupaj_dobava),
+            "dtf_prodaja": v_evre(skupaj_prodaja),
+            "samostojno_m": round(sum(postavka["samostojno_m"] for postavka in postavke), 2),
+            "samostojno_dobava": v_evre(sestej_cente([postavka["samostojno_dobava"] for postavka in postavke])),
+            "samostojno_prodaja": v_evre(samostojno_prodaja),
+            "prihranek": v_evre(samostojno_prodaja - skupaj_prodaja),
+        },
+    }
+
+def vrstice_nacrta(nacrt):
+    """Text lines of a run plan from nacrtuj_tisk."""
+    narocila = {narocilo["narocilo"]: narocilo for narocilo in nacrt["narocila"]}
+    vrstice = []
+    for zagon in nacrt["zagoni"]:
+        vrstice.append(f"Zagon {zagon['zagon']}: {zagon['dolzina_m']} m, {len(zagon['narocila'])} naročil, "
+                       f"izkoristek {zagon['izkoristek']:.0%}, dobava {zagon['dtf_dobava']} €, "
+                       f"prodaja {zagon['dtf_prodaja']} €")
+        for st in zagon["narocila"]:
+            narocilo = narocila[st]
+            vrstice.append(f"  #{st} {narocilo['podjetje'] or '-'}: {narocilo['dtf_prodaja']:.2f} € "
+                           f"(samostojno {narocilo['samostojno_prodaja']:.2f} €, {narocilo['samostojno_m']} m)")
+    skupaj = nacrt["skupaj"]
+    vrstice.append(f"Skupaj: {skupaj['zagonov']} zagonov, {skupaj['dolzina_m']} m "
+                   f"(samostojno {skupaj['samostojno_m']} m), prodaja {skupaj['dtf_prodaja']} € "
+                   f"(samostojno {skupaj['samostojno_prodaja']} €, prihranek {skupaj['prihranek']} €)")
+    return vrstice
+
+# === PREDPOMNILNIK PONUDB ===
+_MERE_LOGOTIPA = operator.itemgetter(0, 1, 2)  # sort logos by value only; types do not order
+class PredpomnilnikPonudb:
+    """LRU cache of complete quote results, with an optional TTL.
+
+    Orders are keyed by a canonical signature (podpis): the product, the
+    quantity and, for DTF, the logos as a sorted tuple of (sirina, visina,
+    kolicina) plus the packing flag, so the same logos in another order hit
+    the same entry. Logo values are compared together with their type, as
+    10 and 10.0 print differently in ``podrobnosti``; batch rows always
+    carry float sizes (see _preberi_logotipe). An entry keeps the finished result record for each logo
+    order it has been asked for (up to ``MAKS_VRSTNIH_REDOV``), and a hit
+    returns that record itself, so callers must not modify it; a new order
+    of known logos is built once by reordering the per-logo lines of
+    ``podrobnosti``. Errors are not cached.
+
+    The cache is emptied whenever ``zbirka`` reloads a price list. With
+    ``pot`` the entries are kept on disk between runs (shrani() writes them)
+    together with the price list file signatures; a file with other
+    signatures is ignored. ``zadetki``, ``zgresitve``, ``izrinjeni`` (LRU),
+    ``potekli`` (TTL) and ``razveljavitve`` count what happened.
+    """
+
+    RAZLICICA = 4
+    MAKS_VRSTNIH_REDOV = 8
+
+    def __init__(self, velikost=10_000, ttl=None, pot=None, zbirka=None):
+        self.velikost = velikost
+        self.ttl = ttl
+        self.pot = pot
+        self.zbirka = ceniki if zbirka is None else zbirka
+        self.zadetki = self.zgresitve = self.izrinjeni = self.potekli = self.razveljavitve = 0
+        self._vnosi = collections.OrderedDict()  # podpis -> (cas, rezultat)
+        self._generacija = self.zbirka.generacija
+        if pot:
+            self._nalozi()
+
+    @staticmethod
+    def podpis(tip, izbira, kolicina, logotipi=(), zlaganje=False):
+        """Canonical cache key of an order; ``logotipi`` as hashable tuples (see izracunaj_dtf)."""
+        if tip == "promocija":
+            return tip, izbira, kolicina
+        return tip, izbira, kolicina, tuple(sorted(logotipi, key=_MERE_LOGOTIPA)), bool(zlaganje)
+
+    def __len__(self):
+        return len(self._vnosi)
+
+    def _preveri_generacijo(self):
+        self.zbirka.preveri_osvezitev()
+        if self.zbirka.generacija != self._generacija:
+            self._generacija = self.zbirka.generacija
+            if self._vnosi:
+                self._vnosi.clear()
+                self.razveljavitve += 1
+
+    def _poisci(self, podpis):
+        self._preveri_generacijo()
+        vnos = self._vnosi.get(podpis)
+        if vnos is not None:
+            if self.ttl is None or time.time() - vnos[0] < self.ttl:
+                self._vnosi.move_to_end(podpis)
+                self.zadetki += 1
+                return vnos[1]
+            del self._vnosi[podpis]
+            self.potekli += 1
+        self.zgresitve += 1
+        return None
+
+    def _dodaj(self, podpis, rezultat):
+        self._vnosi[podpis] = (time.time(), rezultat)
+        if len(self._vnosi) > self.velikost:
+            self._vnosi.popitem(last=False)
+            self.izrinjeni += 1
+
+    def izracunaj_promocijo(self, izbira, kolicina):
+        """izracunaj_promocijo through the cache."""
+        podpis = self.podpis("promocija", izbira, kolicina)
+        rezultat = self._poisci(podpis)
+        if rezultat is None:
+            rezultat = izracunaj_promocijo(izbira, kolicina)
+            self._dodaj(podpis, rezultat)
+        return rezultat
+
+    def izracunaj_dtf(self, izbira, skupna_kolicina, logotipi, zlaganje=False):
+        """izracunaj_dtf through the cache."""
+        # (sirina, visina, kolicina) plus their types, which decide how podrobnosti prints them.
+        red = tuple((sirina, visina, kolicina, type(sirina), type(visina), type(kolicina))
+                    for sirina, visina, kolicina in logotipi)
+        podpis = self.podpis("dtf", izbira, skupna_kolicina, red, zlaganje)
+        po_redih = self._poisci(podpis)
+        if po_redih is None:
+            rezultat = izracunaj_dtf(izbira, skupna_kolicina, [logotip[:3] for logotip in red], zlaganje)
+            self._dodaj(podpis, {red: rezultat})
+            return rezultat
+        rezultat = po_redih.get(red)
+        if rezultat is None:
+            vzorcni_red, vzorec = next(iter(po_redih.items()))
+            postavitve = {logotip: vrstica.split(": ", 1)[1]
+                          for logotip, vrstica in zip(vzorcni_red, vzorec["podrobnosti"])}
+            podrobnosti = [f"Logotip #{i}: {postavitve[logotip]}" for i, logotip in enumerate(red, 1)]
+            rezultat = {**vzorec, "podrobnosti": podrobnosti + vzorec["podrobnosti"][len(red):]}
+            if len(po_redih) < self.MAKS_VRSTNIH_REDOV:
+                po_redih[red] = rezultat
+        return rezultat
+
+    def statistika(self):
+        vseh = self.zadetki + self.zgresitve
+        return {
+            "vnosov": len(self._vnosi),
+            "zadetki": self.zadetki,
+            "zgresitve": self.zgresitve,
+            "delez_zadetkov": round(self.zadetki / vseh, 4) if vseh else None,
+            "izrinjeni": self.izrinjeni,
+            "potekli": self.potekli,
+            "razveljavitve": self.razveljavitve,
+        }
+
+    def _nalozi(self):
+        try:
+            with open(self.pot, "rb") as f:
+                shranjeno = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return
+        if shranjeno.get("razlicica") != self.RAZLICICA or shranjeno.get("odtis") != self.zbirka.odtis():
+            return
+        zdaj = time.time()
+        for podpis, cas, rezultat in shranjeno["vnosi"][-self.velikost:]:
+            if self.ttl is None or zdaj - cas < self.ttl:
+                self._vnosi[podpis] = (cas, rezultat)
+
+    def shrani(self):
+        """Write the entries to ``pot`` (no-op without one)."""
+        if not self.pot:
+            return
+        self._preveri_generacijo()
+        mapa = os.path.dirname(self.pot)
+        if mapa:
+            os.makedirs(mapa, exist_ok=True)
+        zacasna = f"{self.pot}.{os.getpid()}.tmp"
+        with open(zacasna, "wb") as f:
+            pickle.dump({"razlicica": self.RAZLICICA, "odtis": self.zbirka.odtis(),
+                         "vnosi": [(podpis, cas, rezultat) for podpis, (cas, rezultat) in self._vnosi.items()]},
+                        f, pickle.HIGHEST_PROTOCOL)
+        os.replace(zacasna, self.pot)
+
+# === VEKTORSKI IZRAČUN DTF ===
+def _dtf_paket_python(sirine, visine, kolicine, narocila, st_narocil, cenik):
+    """Plain-Python reference for izracunaj_dtf_paket; same rules as izracunaj_dtf."""
+    rotirano, na_vrstico, vrstic, visina_cm = [], [], [], []
+    povrsine = [0] * st_narocil
+    for sirina, visina, kolicina, narocilo in zip(sirine, visine, kolicine, narocila):
+        log_na_vrstico = math.floor(44 / sirina) if sirina > 0 else 0
+        st_vrstic = math.ceil(kolicina / log_na_vrstico) if log_na_vrstico > 0 else 1
+        visina_total = st_vrstic * visina
+        rot_log_na_vrstico = math.floor(44 / visina) if visina > 0 else 0
+        rot_vrstic = math.ceil(kolicina / rot_log_na_vrstico) if rot_log_na_vrstico > 0 else 1
+        rot_visina_total = rot_vrstic * sirina
+        rot = rot_visina_total < visina_total and rot_log_na_vrstico > 0
+        rotirano.append(rot)
+        na_vrstico.append(rot_log_na_vrstico if rot else log_na_vrstico)
+        vrstic.append(rot_vrstic if rot else st_vrstic)
+        visina_cm.append(rot_visina_total if rot else visina_total)
+        povrsine[narocilo] += sirina * visina * kolicina
+
+    dolzine, dobavne, prodajne = [], [], []
+    for povrsina in povrsine:
+        dolzina = round(povrsina / (44 * 100) + 0.2, 2)
+        dobavna, prodajna = interpoliraj_ceno(dolzina, cenik)
+        dolzine.append(dolzina)
+        dobavne.append(dobavna)
+        prodajne.append(prodajna)
+    return {
+        "rotirano": rotirano, "na_vrstico": na_vrstico, "vrstic": vrstic, "visina_cm": visina_cm,
+        "dolzina_m": dolzine, "dtf_dobava": dobavne, "dtf_prodaja": prodajne,
+    }
+
+def _blizu_polovice(stotine):
+    """Mask of values whose hundredths are too close to .5 for np.rint to agree with round()."""
+    return np.abs(stotine - np.floor(stotine) - 0.5) < 1e-6
+
+def _zaokrozi_2(vrednosti, natancno):
+    """Vectorized round(x, 2); near-ties are redone with ``natancno(i)``."""
+    stotine = vrednosti * 100
+    rezultat = np.rint(stotine) / 100
+    for i in np.flatnonzero(_blizu_polovice(stotine)):
+        rezultat[i] = natancno(i)
+    return rezultat
+
+def _dtf_paket_numpy(sirine, visine, kolicine, narocila, st_narocil, cenik):
+    sirine = np.asarray(sirine, dtype=np.float64)
+    visine = np.asarray(visine, dtype=np.float64)
+    kolicine = np.asarray(kolicine, dtype=np.int64)
+    narocila = np.asarray(narocila, dtype=np.intp)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_na_vrstico = np.floor(44 / sirine).astype(np.int64)
+        st_vrstic = np.where(log_na_vrstico > 0, np.ceil(kolicine / np.maximum(log_na_vrstico, 1)), 1).astype(np.int64)
+        rot_log_na_vrstico = np.floor(44 / visine).astype(np.int64)
+        rot_vrstic = np.where(rot_log_na_vrstico > 0, np.ceil(kolicine / np.maximum(rot_log_na_vrstico, 1)), 1).astype(np.int64)
+    visina_total = st_vrstic * visine
+    rot_visina_total = rot_vrstic * sirine
+    rotirano = (rot_visina_total < visina_total) & (rot_log_na_vrstico > 0)
+
+    # bincount adds the weights in input order, like the scalar += loop.
+    povrsine = np.bincount(narocila, weights=sirine * visine * kolicine, minlength=st_narocil)
+    dolzine = _zaokrozi_2(povrsine / (44 * 100) + 0.2, lambda i: round(float(povrsine[i]) / (44 * 100) + 0.2, 2))
+
+    # The same integer step as InterpolatorCen, in int64 over all orders: the
+    # lengths are whole centimetres, so the prices are exact cents. Beyond the
+    # last breakpoint the last price holds (the default "omejeno").
+    interpolator = interpolator_cenika(cenik)
+    centimetri = np.rint(dolzine * 100).astype(np.int64)
+    tocke = np.asarray(interpolator.centimetri, dtype=np.int64)
+    odsek = np.clip(np.searchsorted(tocke, centimetri) - 1, 0, len(tocke) - 2)
+    premik = centimetri - tocke[odsek]
+    imenovalec = np.asarray(interpolator.razlike_cm, dtype=np.int64)[odsek]
+    cene = []
+    for centi, razlike in ((interpolator.centi_d, interpolator.razlike_cd),
+                           (interpolator.centi_p, interpolator.razlike_cp)):
+        stevec = np.asarray(razlike, dtype=np.int64)[odsek] * premik
+        # deli_zaokrozeno, element-wise
+        korak = np.where(stevec < 0, -((imenovalec - 2 * stevec) // (2 * imenovalec)),
+                         (2 * stevec + imenovalec) // (2 * imenovalec))
+        cena = np.asarray(centi, dtype=np.int64)[odsek] + korak
+        cena = np.where(centimetri > tocke[-1], centi[-1], cena)
+        cene.append(np.where(centimetri <= 0, 0, cena) / 100)
+    dobavne, prodajne = cene
+    return {
+        "rotirano": rotirano,
+        "na_vrstico": np.where(rotirano, rot_log_na_vrstico, log_na_vrstico),
+        "vrstic": np.where(rotirano, rot_vrstic, st_vrstic),
+        "visina_cm": np.where(rotirano, rot_visina_total, visina_total),
+        "dolzina_m": dolzine, "dtf_dobava": dobavne, "dtf_prodaja": prodajne,
+    }
+
+def izracunaj_dtf_paket(sirine, visine, kolicine, narocila, st_narocil=None, cenik=None, uporabi_numpy=True):
+    """Price the DTF film of many orders at once.
+
+    ``sirine``, ``visine`` and ``kolicine`` describe every logo of every order
+    and ``narocila`` holds the order number (0 .. st_narocil-1) of each logo.
+    Returns a dict with per-logo ``rotirano``, ``na_vrstico``, ``vrstic``,
+    ``visina_cm`` and per-order ``dolzina_m``, ``dtf_dobava``, ``dtf_prodaja``,
+    equal to what izracunaj_dtf computes order by order. Uses NumPy arrays when
+    NumPy is installed and plain lists otherwise.
+    """
+    if cenik is None:
+        cenik = ceniki["dtf"]
+    if st_narocil is None:
+        st_narocil = max(narocila) + 1 if len(narocila) else 0
+    if uporabi_numpy and _numpy() is not None:
+        return _dtf_paket_numpy(sirine, visine, kolicine, narocila, st_narocil, cenik)
+    return _dtf_paket_python(sirine, visine, kolicine, narocila, st_narocil, cenik)
+
+# === INTERAKTIVNI VNOS ===
 def izracun_promocije():
     """Calculate costs for promotional materials."""
     try:
@@ -349,42 +2485,30 @@ def izracun_promocije():
             print("❌ Napačen vnos količine. Vnesi celo število.")
             return
 
-        cenik = promocijski_material[izbira]
-        razpon = poisci_razpon(cenik, kolicina)
-        if razpon is None:
-            print("❌ Napačna količina za izbrani izdelek.")
+        try:
+            rezultat = izracunaj_promocijo(izbira, kolicina)
+        except ValueError as e:
+            print(f"❌ {e}")
             return
 
-        dobava = razpon["dobava"]
-        prodaja = razpon["prodaja"]
-        profit = round(prodaja - dobava, 2)
-        cena_na_kos = round(prodaja / kolicina, 3) if kolicina else 0
-
         print("\n=== REZULTAT ===")
         print(f"Podjetje: {podjetje}")
         print(f"Artikel: {izbira.title()} | Količina: {kolicina}")
-        print(f"Dobavna cena: {dobava} €")
-        print(f"Prodajna cena: {prodaja} €")
-        print(f"Profit: {profit} €")
-        print(f"Cena na kos: {cena_na_kos} €")
-
-        data = [
-            f"Artikel: {izbira.title()}",
-            f"Količina: {kolicina}",
-            f"Dobavna cena: {dobava} €",
-            f"Prodajna cena: {prodaja} €",
-            f"Profit: {profit} €",
-            f"Cena na kos: {cena_na_kos} €"
-        ]
-        save_path = save_to_file(podjetje, data, kolicina, izbira)
+        print(f"Dobavna cena: {rezultat['dobava']} €")
+        print(f"Prodajna cena: {rezultat['prodaja']} €")
+        print(f"Profit: {rezultat['profit']} €")
+        print(f"Cena na kos: {rezultat['cena_na_kos']} €")
+
+        save_path = save_to_file(podjetje, vrstice_promocije(rezultat), kolicina, izbira)
+        if save_path:
+            zabelezi_ponudbo({"podjetje": podjetje, **rezultat})
         # Optional: attach PDF offer/spec
         pdf_pot = input("Če želiš priložiti PDF (npr. ponudbo/brief), vnesi pot do PDF (pusti prazno za preskok): ").strip()
         if save_path and pdf_pot:
             try:
                 cilj_mapa = os.path.dirname(save_path)
                 pdf_ime = os.path.basename(pdf_pot)
-                cilj_pdf = os.path.join(cilj_mapa, pdf_ime)
-                shutil.copy2(pdf_pot, cilj_pdf)
+                cilj_pdf = prilozi_pdf(pdf_pot, os.path.join(cilj_mapa, pdf_ime), "izracuni_dtf")
                 print(f"✅ PDF priložen: {cilj_pdf}")
             except Exception as e:
                 print(f"❌ Napaka pri kopiranju PDF: {e}")
@@ -407,20 +2531,24 @@ def izracun_dtf():
         if pdf_pot and not pdf_pot.lower().endswith(".pdf"):
             print("❌ Napačen tip datoteke. Dovoli se le .pdf.")
             return
+        if pdf_pot:
+            try:
+                preveri_pdf(pdf_pot)
+            except ValueError as e:
+                print(f"❌ {e}")
+                return
+            except OSError as e:
+                print(f"❌ Napaka pri branju PDF: {e}")
+                return
         
-        # Check if user wants to skip article costs
-        if izbira == "ne potrebujem ga":
-            artikel_dobava = 0
-            artikel_prodaja = 0
-            artikel_ime = "ne potrebujem ga"
-            cenik_izbira = None
-        else:
-            # Handle T-shirt selection only
-            if izbira not in [razpon["ime"].lower() for razpon in cenik_majice]:
-                print("❌ Napačen izdelek. Vnesi veljaven oblačilni artikel (npr. backfire) ali 'ne potrebujem ga'.")
+        # Handle T-shirt selection only
+        katalog = ceniki["majice"]
+        if izbira != "ne potrebujem ga":
+            artikel = katalog.najdi(izbira)
+            if artikel is None:
+                print(f"❌ {napaka_artikla(katalog, izbira)}")
                 return
-            cenik_izbira = cenik_majice
-            artikel_ime = izbira
+            izbira = artikel
 
         # Input total quantity
         try:
@@ -431,17 +2559,9 @@ def izracun_dtf():
             print("❌ Napačen vnos količine. Vnesi celo število.")
             return
 
-        # Calculate article costs if an article is selected
-        if cenik_izbira:
-            razpon = poisci_razpon(cenik_izbira, skupna_kolicina, artikel_ime)
-            if razpon is None:
-                print("❌ Napačna količina ali izdelek.")
-                return
-            artikel_dobava = razpon["dobava"] * skupna_kolicina
-            artikel_prodaja = razpon["prodaja"] * skupna_kolicina
-        else:
-            artikel_dobava = 0
-            artikel_prodaja = 0
+        if izbira != "ne potrebujem ga" and katalog.razpon(izbira, skupna_kolicina) is None:
+            print("❌ Napačna količina ali izdelek.")
+            return
 
         # Input logo details
         st_logotipov = input("Koliko različnih vrst logotipov boš vnesel? ").strip()
@@ -453,9 +2573,7 @@ def izracun_dtf():
             print("❌ Napačen vnos števila logotipov. Vnesi celo število.")
             return
 
-        skupna_povrsina_cm2 = 0
-        podrobnosti = []
-
+        logotipi = []
         for i in range(1, st_logotipov + 1):
             print(f"\nVnos za logotip #{i}:")
             try:
@@ -467,93 +2585,45 @@ def izracun_dtf():
             except ValueError:
                 print("❌ Napačen vnos. Vnesi veljavne številske vrednosti.")
                 return
+            logotipi.append((sirina, visina, kolicina))
 
-            # Calculate layout with and without rotation
-            log_na_vrstico = math.floor(44 / sirina) if sirina > 0 else 0
-            vrstic = math.ceil(kolicina / log_na_vrstico) if log_na_vrstico > 0 else 1
-            visina_total = vrstic * visina
-
-            rot_log_na_vrstico = math.floor(44 / visina) if visina > 0 else 0
-            rot_vrstic = math.ceil(kolicina / rot_log_na_vrstico) if rot_log_na_vrstico > 0 else 1
-            rot_visina_total = rot_vrstic * sirina
-
-            if rot_visina_total < visina_total and rot_log_na_vrstico > 0:
-                vrstica_opis = (
-                    f"Logotip #{i}: {kolicina} × {visina}x{sirina} cm (ROTIRANO) → "
-                    f"{rot_log_na_vrstico} na vrstico, {rot_vrstic} vrstic = {rot_visina_total:.2f} cm"
-                )
-            else:
-                vrstica_opis = (
-                    f"Logotip #{i}: {kolicina} × {sirina}x{visina} cm → "
-                    f"{log_na_vrstico} na vrstico, {vrstic} vrstic = {visina_total:.2f} cm"
-                )
-
-            podrobnosti.append(vrstica_opis)
-            povrsina = sirina * visina * kolicina
-            skupna_povrsina_cm2 += povrsina
-
-        # Calculate DTF costs
-        povrsinska_dolzina_m = skupna_povrsina_cm2 / (44 * 100)
-        povrsinska_z_rezervo = round(povrsinska_dolzina_m + 0.2, 2)
-        dtf_dobava, dtf_prodaja = interpoliraj_ceno(povrsinska_z_rezervo, cenik_dtf)
-
-        # Calculate total costs and profit
-        skupna_dobava = round(dtf_dobava + artikel_dobava, 2)
-        skupna_prodaja = round(dtf_prodaja + artikel_prodaja, 2)
-        profit = round(skupna_prodaja - skupna_dobava, 2)
-        cena_na_kos = round(skupna_prodaja / skupna_kolicina, 3) if skupna_kolicina else 0
+        try:
+            rezultat = izracunaj_dtf(izbira, skupna_kolicina, logotipi)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        artikel_ime = rezultat["artikel"]
 
         # Output results
         print("\n=== REZULTAT ===")
         print(f"Podjetje: {podjetje}")
         print(f"Artikel: {artikel_ime.title()}")
         print(f"Količina: {skupna_kolicina}")
-        for vrstica in podrobnosti:
+        for vrstica in rezultat["podrobnosti"]:
             print("  " + vrstica)
         print("\nDTF tisk:")
-        print(f"  Referenčna dolžina: {povrsinska_z_rezervo} m")
-        print(f"  Dobavna cena: {dtf_dobava} €")
-        print(f"  Prodajna cena: {dtf_prodaja} €")
+        print(f"  Referenčna dolžina: {rezultat['dolzina_m']} m")
+        print(f"  Dobavna cena: {rezultat['dtf_dobava']} €")
+        print(f"  Prodajna cena: {rezultat['dtf_prodaja']} €")
         if artikel_ime != "ne potrebujem ga":
             print(f"{artikel_ime.title()}:")
-            print(f"  Dobavna cena: {artikel_dobava:.2f} €")
-            print(f"  Prodajna cena: {artikel_prodaja:.2f} €")
+            print(f"  Dobavna cena: {rezultat['artikel_dobava']:.2f} €")
+            print(f"  Prodajna cena: {rezultat['artikel_prodaja']:.2f} €")
         print("Skupaj:")
-        print(f"  Dobavna cena: {skupna_dobava} €")
-        print(f"  Prodajna cena: {skupna_prodaja} €")
-        print(f"  Profit: {profit} €")
-        print(f"  Cena na kos: {cena_na_kos} €")
+        print(f"  Dobavna cena: {rezultat['dobava']} €")
+        print(f"  Prodajna cena: {rezultat['prodaja']} €")
+        print(f"  Profit: {rezultat['profit']} €")
+        print(f"  Cena na kos: {rezultat['cena_na_kos']} €")
 
         # Save to file
-        data = [
-            f"Artikel: {artikel_ime.title()}",
-            f"Količina: {skupna_kolicina}"
-        ] + podrobnosti + [
-            f"DTF tisk:",
-            f"  Referenčna dolžina: {povrsinska_z_rezervo} m",
-            f"  Dobavna cena: {dtf_dobava} €",
-            f"  Prodajna cena: {dtf_prodaja} €"
-        ]
-        if artikel_ime != "ne potrebujem ga":
-            data += [
-                f"{artikel_ime.title()}:",
-                f"  Dobavna cena: {artikel_dobava:.2f} €",
-                f"  Prodajna cena: {artikel_prodaja:.2f} €"
-            ]
-        data += [
-            f"Skupaj:",
-            f"  Dobavna cena: {skupna_dobava} €",
-            f"  Prodajna cena: {skupna_prodaja} €",
-            f"  Profit: {profit} €",
-            f"  Cena na kos: {cena_na_kos} €"
-        ]
-        save_path = save_to_file(podjetje, data, skupna_kolicina, artikel_ime if artikel_ime != "ne potrebujem ga" else "dtf")
+        save_path = save_to_file(podjetje, vrstice_dtf(rezultat), skupna_kolicina, artikel_ime if artikel_ime != "ne potrebujem ga" else "dtf")
+        if save_path:
+            zabelezi_ponudbo({"podjetje": podjetje, **rezultat})
         if save_path and pdf_pot:
             try:
                 cilj_mapa = os.path.dirname(save_path)
                 pdf_ime = os.path.basename(pdf_pot)
-                cilj_pdf = os.path.join(cilj_mapa, pdf_ime)
-                shutil.copy2(pdf_pot, cilj_pdf)
+                cilj_pdf = prilozi_pdf(pdf_pot, os.path.join(cilj_mapa, pdf_ime), "izracuni_dtf")
                 print(f"✅ PDF priložen: {cilj_pdf}")
             except Exception as e:
                 print(f"❌ Napaka pri kopiranju PDF: {e}")
@@ -561,13 +2631,882 @@ def izracun_dtf():
     except Exception as e:
         print(f"❌ Napaka: {e}")
 
-if __name__ == "__main__":
+def izracun_narocila():
+    """Calculate one consolidated quote for an order with several items."""
+    try:
+        podjetje = input("Vpiši ime podjetja: ").strip()
+        if not podjetje:
+            print("❌ Ime podjetja ne sme biti prazno.")
+            return
+
+        postavke = []
+        while True:
+            tip = input(f"\nPostavka #{len(postavke) + 1} - promocija ali dtf (pusti prazno za konec): ").lower().strip()
+            if not tip:
+                break
+            if tip == "promocija":
+                izdelek = input("Vpiši ime izdelka (gravura, dotisk na bloke, vzigalniki, vizitke, letaki): ").lower().strip()
+            elif tip == "dtf":
+                izdelek = input("Vpiši ime oblačilnega artikla (ali 'ne potrebujem ga' za lastne izdelke): ").lower().strip()
+            else:
+                print("❌ Napačen vnos. Vpiši promocija ali dtf.")
+                continue
+            try:
+                kolicina = int(input("Vpiši količino: ").strip())
+            except ValueError:
+                print("❌ Napačen vnos količine. Vnesi celo število.")
+                continue
+            postavka = {"tip": tip, "izdelek": izdelek, "kolicina": kolicina, "logotipi": []}
+            if tip == "dtf":
+                try:
+                    st_logotipov = int(input("Koliko različnih vrst logotipov boš vnesel? ").strip())
+                    for i in range(1, st_logotipov + 1):
+                        print(f"\nVnos za logotip #{i}:")
+                        sirina = float(input("  Širina logotipa (v cm): "))
+                        visina = float(input("  Višina logotipa (v cm): "))
+                        st = int(input("  Količina tega logotipa: "))
+                        postavka["logotipi"].append((sirina, visina, st))
+                except ValueError:
+                    print("❌ Napačen vnos. Vnesi veljavne številske vrednosti.")
+                    continue
+            postavke.append(postavka)
+
+        if not postavke:
+            print("❌ Naročilo nima postavk.")
+            return
+        zlaganje = _je_da(input("Zloži logotipe na rolo? (da/ne): "))
+        try:
+            rezultat = izracunaj_skupno(postavke, zlaganje)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+
+        print("\n=== REZULTAT ===")
+        print(f"Podjetje: {podjetje}")
+        data = vrstice_narocila(rezultat)
+        for vrstica in data:
+            print(vrstica)
+        save_path = save_to_file(podjetje, data, rezultat["kolicina"], "narocilo")
+        if save_path:
+            zabelezi_ponudbo({"podjetje": podjetje, **rezultat})
+
+    except Exception as e:
+        print(f"❌ Napaka: {e}")
+
+# === PAKETNA OBDELAVA ===
+def _preberi_logotipe(vrednost):
+    """Parse logos from a JSON list or a CSV cell like ``10x5x20;8x8x30``."""
+    if isinstance(vrednost, str):
+        vrednost = [del_.split("x") for del_ in vrednost.replace(" ", "").split(";") if del_]
+    logotipi = []
+    for logotip in vrednost:
+        if isinstance(logotip, dict):
+            logotip = (logotip["sirina"], logotip["visina"], logotip["kolicina"])
+        sirina, visina, kolicina = logotip
+        sirina, visina = float(sirina), float(visina)
+        if not (math.isfinite(sirina) and math.isfinite(visina)):
+            raise ValueError("Mere logotipa morajo biti končna števila.")
+        logotipi.append((sirina, visina, int(kolicina)))
+    return logotipi
+
+def _logotip(vrednost):
+    """argparse type for one logo given as SIRINAxVISINAxKOLICINA."""
+    try:
+        (logotip,) = _preberi_logotipe(vrednost)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"neveljaven logotip {vrednost!r} (pričakovano SIRINAxVISINAxKOLICINA)")
+    return logotip
+
+def _je_da(vrednost):
+    """Truthy flag from JSON (true) or a CSV cell ("1", "da", "true")."""
+    return str(vrednost).strip().lower() in ("1", "true", "da", "yes")
+
+def beri_narocila(pot):
+    """Stream order rows from a CSV or JSONL file, one row at a time.
+
+    CSV rows come as dicts, JSONL lines as their text: preberi_narocilo()
+    parses them where the row is priced, so a broken line fails only itself.
+    """
+    with open(pot, encoding="utf-8", newline="") as f:
+        if pot.lower().endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for vrstica in f:
+                if vrstica.strip():
+                    yield vrstica
+
+def preberi_narocilo(vrstica):
+    """The order dict of a row from beri_narocila; raises ValueError for anything but a JSON object."""
+    if isinstance(vrstica, str):
+        try:
+            vrstica = json.loads(vrstica)
+        except ValueError as e:
+            raise ValueError(f"Neveljaven JSON: {e}") from None
+    if not isinstance(vrstica, dict):
+        raise ValueError(f"Naročilo mora biti JSON objekt, ne {type(vrstica).__name__}.")
+    return vrstica
+
+def izracunaj_narocilo(narocilo, predpomnilnik=None):
+    """Price one order row from a batch file and return the result record.
+
+    With a PredpomnilnikPonudb, repeated orders are answered from it.
+    """
+    tip = str(narocilo.get("tip", "")).strip().lower()
+    if tip == "narocilo":
+        rezultat = izracunaj_skupno(narocilo.get("postavke") or [], zlaganje=_je_da(narocilo.get("zlaganje")))
+        return {"podjetje": narocilo.get("podjetje", ""), **rezultat}
+    izdelek = str(narocilo.get("izdelek", "")).strip().lower()
+    kolicina = int(narocilo["kolicina"])
+    if tip == "promocija":
+        izracunaj = izracunaj_promocijo if predpomnilnik is None else predpomnilnik.izracunaj_promocijo
+        rezultat = izracunaj(izdelek, kolicina)
+    elif tip == "dtf":
+        izracunaj = izracunaj_dtf if predpomnilnik is None else predpomnilnik.izracunaj_dtf
+        rezultat = izracunaj(izdelek, kolicina, _preberi_logotipe(narocilo.get("logotipi") or []),
+                             zlaganje=_je_da(narocilo.get("zlaganje")))
+    else:
+        raise ValueError(f"Neznan tip naročila: {tip!r}")
+    rezultat = {"podjetje": narocilo.get("podjetje", ""), **rezultat}
+    pdf_pot = str(narocilo.get("pdf") or "").strip()
+    if pdf_pot:
+        if not pdf_pot.lower().endswith(".pdf"):
+            raise ValueError("Napačen tip datoteke. Dovoli se le .pdf.")
+        rezultat["pdf"] = pdf_pot
+    return rezultat
+
+def izracunaj_narocila(narocila, zacetek=1, predpomnilnik=None):
+    """Price a stream of order rows; invalid rows yield an error record instead."""
+    for st, narocilo in enumerate(narocila, zacetek):
+        try:
+            narocilo = preberi_narocilo(narocilo)
+            yield izracunaj_narocilo(narocilo, predpomnilnik)
+        except (ValueError, KeyError, TypeError, OverflowError) as e:
+            podjetje = narocilo.get("podjetje", "") if isinstance(narocilo, dict) else ""
+            yield {"vrstica": st, "podjetje": podjetje, "napaka": str(e)}
+
+def zapis_ponudbe(rezultat):
+    """save_to_file arguments (podjetje, data, kolicina_or_metri, izbira) for a result record."""
+    if rezultat["tip"] == "promocija":
+        return rezultat["podjetje"], vrstice_promocije(rezultat), rezultat["kolicina"], rezultat["artikel"]
+    if rezultat["tip"] == "narocilo":
+        return rezultat["podjetje"], vrstice_narocila(rezultat), rezultat["kolicina"], "narocilo"
+    izbira = rezultat["artikel"] if rezultat["artikel"] != "ne potrebujem ga" else "dtf"
+    return rezultat["podjetje"], vrstice_dtf(rezultat), rezultat["kolicina"], izbira
+
+def _shranjevalec(zapisovalnik):
+    """Consumer that queues a quote file (and its pdf) for a priced result record."""
+    def shrani(rezultat):
+        pot = zapisovalnik.shrani(*zapis_ponudbe(rezultat))
+        if rezultat.get("pdf"):
+            zapisovalnik.prilozi_pdf(rezultat["pdf"], pot)
+    return shrani
+
+def _posreduj_sproti(rezultati, porabniki):
+    """Pass result records through, handing each priced one to every consumer."""
+    for rezultat in rezultati:
+        if "napaka" not in rezultat:
+            for porabnik in porabniki:
+                porabnik(rezultat)
+        yield rezultat
+
+def _v_jsonl(rezultat):
+    return json.dumps(rezultat, ensure_ascii=False) + "\n"
+
+def zapisi_rezultate(rezultati, f):
+    """Write result records to an open text file as JSONL. Returns (ok, napake)."""
+    ok = napake = 0
+    for rezultat in rezultati:
+        f.write(_v_jsonl(rezultat))
+        if "napaka" in rezultat:
+            napake += 1
+        else:
+            ok += 1
+    return ok, napake
+
+# === POROČILA ===
+POLJA_CSV = ("cas", "podjetje", "tip", "artikel", "kolicina", "dolzina_m", "dobava", "prodaja", "profit",
+             "cena_na_kos")
+
+class PisecCSV:
+    """Streams result records into one CSV file, a row per quote (POLJA_CSV)."""
+
+    def __init__(self, pot):
+        mapa = os.path.dirname(pot)
+        if mapa:
+            os.makedirs(mapa, exist_ok=True)
+        self.pot = pot
+        self._f = open(pot, "w", encoding="utf-8", newline="")
+        self._pisec = csv.DictWriter(self._f, POLJA_CSV, extrasaction="ignore")
+        self._pisec.writeheader()
+        self.zapisanih = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.zapri()
+
+    def dodaj(self, rezultat):
+        if "cas" not in rezultat:
+            # Quotes straight from a batch have no ledger time; they are priced now.
+            rezultat = {**rezultat, "cas": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        self._pisec.writerow(rezultat)
+        self.zapisanih += 1
+
+    def zapri(self):
+        self._f.close()
+
+def postavke_ponudbe(rezultat):
+    """Customer-facing rows of a result record: (opis, kolicina, znesek, podrobnosti).
+
+    Only sale prices are listed; supplier costs and profit stay in the text
+    quote and the CSV.
+    """
+    if rezultat["tip"] == "promocija":
+        return [(rezultat["artikel"].title(), f"{rezultat['kolicina']} kos", rezultat["prodaja"], [])]
+    if rezultat["tip"] == "narocilo":
+        return [(ime_postavke(p["artikel"]), f"{p['kolicina']} kos", p["prodaja"], []) for p in rezultat["postavke"]]
+    postavke = [(f"DTF tisk ({rezultat['dolzina_m']} m)", f"{rezultat['kolicina']} kos",
+                 rezultat["dtf_prodaja"], rezultat["podrobnosti"])]
+    if rezultat["artikel"] != "ne potrebujem ga":
+        postavke.append((rezultat["artikel"].title(), f"{rezultat['kolicina']} kos",
+                         round(rezultat["artikel_prodaja"], 2), []))
+    return postavke
+
+# Helvetica advance widths (1/1000 em) of what goes into right-aligned amounts.
+_SIRINE_HELVETICE = {**dict.fromkeys("0123456789", 556), ".": 278, ",": 278, " ": 278, "-": 333, "€": 556}
+
+class PredlogaPDF:
+    """Layout, fonts and fixed objects of an offer PDF, prepared once for any number of documents.
+
+    Documents use the standard Helvetica fonts (nothing is embedded) with
+    WinAnsiEncoding. Its free codes carry Č, č, Ć and ć and đ through a
+    /Differences array; Đ is drawn with Ð, which looks the same. Characters
+    the encoding lacks print as "?". The catalogue, both fonts and the
+    encoding are serialized once here with their xref offsets, so a document
+    only adds its pages, the page tree and the xref table.
+    """
+    SIRINA, VISINA = 595, 842  # A4 in points
+    ROB = 56
+    VRSTICA = 16
+
+    _DODATNI_ZNAKI = {"Č": 0x81, "č": 0x8D, "Ć": 0x8F, "ć": 0x90, "đ": 0x9D, "Đ": 0xD0}
+
+    def __init__(self, naslov="PONUDBA"):
+        self.naslov = naslov
+        tabela = {}
+        for koda in range(0x80, 0xA0):
+            try:
+                tabela[ord(bytes([koda]).decode("cp1252"))] = koda
+            except UnicodeDecodeError:
+                pass  # a free code, some get used by _DODATNI_ZNAKI
+        tabela.update({ord(znak): koda for znak, koda in self._DODATNI_ZNAKI.items()})
+        tabela.update({ord("→"): "->", ord("\\"): "\\\\", ord("("): "\\(", ord(")"): "\\)"})
+        self._tabela = tabela
+        razlike = " ".join(f"{koda} /{ime}" for koda, ime in ((0x81, "Ccaron"), (0x8D, "ccaron"), (0x8F, "Cacute"),
+                                                             (0x90, "cacute"), (0x9D, "dcroat")))
+        staticni = {
+            1: b"<< /Type /Catalog /Pages 2 0 R >>",
+            3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding 5 0 R >>",
+            4: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding 5 0 R >>",
+            5: f"<< /Type /Encoding /BaseEncoding /WinAnsiEncoding /Differences [{razlike}] >>".encode("ascii"),
+        }
+        glava = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._odmiki = {}
+        for st, telo in staticni.items():
+            self._odmiki[st] = len(glava)
+            glava += b"%d 0 obj\n%s\nendobj\n" % (st, telo)
+        self._glava = bytes(glava)
+        self._vir = b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >>"
+
+    def niz(self, besedilo):
+        """``besedilo`` as the bytes of a PDF string literal, without the parentheses."""
+        return besedilo.translate(self._tabela).encode("latin-1", "replace")
+
+    def _besedilo(self, x, y, besedilo, velikost=10, krepko=False, desno=False):
+        if desno:
+            x -= sum(_SIRINE_HELVETICE.get(znak, 556) for znak in besedilo) * velikost / 1000
+        return b"BT /F%d %d Tf %.2f %.2f Td (%s) Tj ET\n" % (2 if krepko else 1, velikost, x, y, self.niz(besedilo))
+
+    def strani(self, rezultat, datum=None):
+        """Content streams (bytes), one per page, of the offer for ``rezultat``."""
+        levo, desno, stolpec = self.ROB, self.SIRINA - self.ROB, self.SIRINA - self.ROB - 170
+        vrh = self.VISINA - self.ROB
+        datum = datum or rezultat.get("cas", "")[:10] or time.strftime("%Y-%m-%d")
+        # Rows are (cells, font size, bold); a cell is (x, text) or (x, text, right-aligned).
+        vrstice = [([(levo, "Postavka"), (stolpec, "Količina"), (desno, "Cena", True)], 10, True)]
+        for opis, kolicina, znesek, podrobnosti in postavke_ponudbe(rezultat):
+            vrstice.append(([(levo, opis), (stolpec, kolicina), (desno, f"{znesek:.2f} €", True)], 10, False))
+            vrstice.extend(([(levo + 12, podrobnost)], 8, False) for podrobnost in podrobnosti)
+        vrstice += [
+            ([], 8, False),
+            ([(levo, "Skupaj"), (desno, f"{rezultat['prodaja']:.2f} €", True)], 10, True),
+            ([(levo, "Cena na kos"), (desno, f"{rezultat['cena_na_kos']:.3f} €", True)], 10, False),
+        ]
+        strani = []
+        ukazi = [
+            self._besedilo(levo, vrh - 18, self.naslov, 18, True),
+            self._besedilo(levo, vrh - 44, f"Podjetje: {rezultat.get('podjetje') or '-'}"),
+            self._besedilo(levo, vrh - 58, f"Datum: {datum}"),
+        ]
+        y = vrh - 92
+        for celice, velikost, krepko in vrstice:
+            if y < self.ROB:
+                strani.append(ukazi)
+                ukazi, y = [], vrh - 18
+            for x, besedilo, *poravnava in celice:
+                ukazi.append(self._besedilo(x, y, besedilo, velikost, krepko, bool(poravnava)))
+            y -= self.VRSTICA * velikost / 10
+        strani.append(ukazi)
+        return [b"".join(ukazi) + self._besedilo(desno, self.ROB / 2, f"{st}/{len(strani)}", 8, desno=True)
+                for st, ukazi in enumerate(strani, 1)]
+
+    def zapisi(self, f, rezultat, datum=None):
+        """Write the offer for ``rezultat`` as a complete PDF to the binary file ``f``."""
+        odmiki = dict(self._odmiki)
+        deli = [self._glava]
+        dolzina = len(self._glava)
+        otroci = []
+        for i, vsebina in enumerate(self.strani(rezultat, datum)):
+            stran, tok = 6 + 2 * i, 7 + 2 * i
+            otroci.append(b"%d 0 R" % stran)
+            for st, telo in (
+                (stran, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] %s /Contents %d 0 R >>"
+                 % (self.SIRINA, self.VISINA, self._vir, tok)),
+                (tok, b"<< /Length %d >>\nstream\n%s\nendstream" % (len(vsebina), vsebina)),
+            ):
+                odmiki[st] = dolzina
+                deli.append(b"%d 0 obj\n%s\nendobj\n" % (st, telo))
+                dolzina += len(deli[-1])
+        odmiki[2] = dolzina
+        deli.append(b"2 0 obj\n<< /Type /Pages /Kids [%s] /Count %d >>\nendobj\n" % (b" ".join(otroci), len(otroci)))
+        dolzina += len(deli[-1])
+        deli.append(b"xref\n0 %d\n0000000000 65535 f \n" % (len(odmiki) + 1))
+        deli.extend(b"%010d 00000 n \n" % odmiki[st] for st in range(1, len(odmiki) + 1))
+        deli.append(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(odmiki) + 1, dolzina))
+        f.write(b"".join(deli))
+
+class PisecPDF:
+    """Writes one offer PDF per result record under ``mapa``, laid out and named like the text quotes."""
+
+    def __init__(self, mapa, predloga=None):
+        self.mapa = mapa
+        self.predloga = PredlogaPDF() if predloga is None else predloga
+        self.zapisanih = 0
+        self._mape = set()
+
+    def dodaj(self, rezultat):
+        podjetje, _, kolicina_or_metri, izbira = zapis_ponudbe(rezultat)
+        mapa = mapa_ponudbe(self.mapa, podjetje, (rezultat.get("cas") or "")[:10] or None)
+        if mapa not in self._mape:
+            os.makedirs(mapa, exist_ok=True)
+            self._mape.add(mapa)
+        ime = os.path.splitext(ime_datoteke_ponudbe(podjetje, kolicina_or_metri, izbira))[0] + ".pdf"
+        f = io.BytesIO()
+        self.predloga.zapisi(f, rezultat)
+        pot = zapisi_brez_prepisa(mapa, ime, f.getvalue())
+        self.zapisanih += 1
+        return pot
+
+def zapisi_porocila(rezultati, pot_csv=None, mapa_pdf=None):
+    """Stream result records into a CSV file and/or offer PDFs; returns the number of quotes."""
+    porabniki = []
+    csv_pisec = PisecCSV(pot_csv) if pot_csv else None
+    if csv_pisec is not None:
+        porabniki.append(csv_pisec.dodaj)
+    if mapa_pdf:
+        porabniki.append(PisecPDF(mapa_pdf).dodaj)
+    st = 0
+    try:
+        for rezultat in rezultati:
+            for porabnik in porabniki:
+                porabnik(rezultat)
+            st += 1
+    finally:
+        if csv_pisec is not None:
+            csv_pisec.zapri()
+    return st
+
+# === VZPOREDNA OBDELAVA ===
+def _razdeli_na_kose(narocila, velikost_kosa):
+    """Split a stream of orders into (first row number, list of rows) chunks."""
+    kos = []
+    zacetek = 1
+    for st, narocilo in enumerate(narocila, 1):
+        kos.append(narocilo)
+        if len(kos) >= velikost_kosa:
+            yield zacetek, kos
+            kos = []
+            zacetek = st + 1
+    if kos:
+        yield zacetek, kos
+
+_predpomnilnik_delavca = None
+
+def _zacni_delavca(predpomnilnik=None, z_meritvami=False):
+    """Worker initializer: load and compile the price tables once per process.
+
+    ``predpomnilnik`` is None (no cache), "" (an empty in-memory cache) or the
+    path of a saved PredpomnilnikPonudb to start from; workers never save it.
+    ``z_meritvami`` switches on meritve, whose counters go back with each chunk.
+    """
+    global _predpomnilnik_delavca
+    if z_meritvami:
+        meritve.vklopi()
+        meritve.ponastavi()  # a forked worker starts with the parent's counts
+    ceniki.nalozi_vse()
+    if predpomnilnik is not None:
+        _predpomnilnik_delavca = PredpomnilnikPonudb(pot=predpomnilnik or None)
+        _predpomnilnik_delavca.pot = None
+
+def _izracunaj_kos(delo):
+    """Price one chunk in a worker and return (JSONL text, ok, napake, rezultati, meritve).
+
+    ``rezultati`` holds the priced records when the chunk asks for them, so
+    the parent process can save them; otherwise it is None. ``meritve`` are
+    the worker's raw counters for this chunk when they are switched on.
+    """
+    zacetek, narocila, z_rezultati = delo
+    deli = []
+    rezultati = [] if z_rezultati else None
+    ok = napake = 0
+    for rezultat in izracunaj_narocila(narocila, zacetek, _predpomnilnik_delavca):
+        deli.append(_v_jsonl(rezultat))
+        if "napaka" in rezultat:
+            napake += 1
+        else:
+            ok += 1
+            if z_rezultati:
+                rezultati.append(rezultat)
+    surovo = None
+    if meritve.vklopljeno:
+        surovo = meritve.surovo()
+        meritve.ponastavi()
+    return "".join(deli), ok, napake, rezultati, surovo
+
+def izracunaj_vzporedno(narocila, delavci, velikost_kosa=500, z_rezultati=False, predpomnilnik=None):
+    """Price orders on a process pool, yielding chunk results in input order.
+
+    At most ``2 * delavci`` chunks are in flight, so the input is still
+    streamed rather than loaded whole. ``predpomnilnik`` is passed to
+    _zacni_delavca, so every worker keeps its own quote cache.
+    """
+    import concurrent.futures
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=delavci, initializer=_zacni_delavca,
+                                                initargs=(predpomnilnik, meritve.vklopljeno)) as pool:
+        v_teku = collections.deque()
+        for zacetek, kos in _razdeli_na_kose(narocila, velikost_kosa):
+            v_teku.append(pool.submit(_izracunaj_kos, (zacetek, kos, z_rezultati)))
+            if len(v_teku) >= 2 * delavci:
+                yield v_teku.popleft().result()
+        while v_teku:
+            yield v_teku.popleft().result()
+
+def obdelaj_paket(vhod, izhod, delavci=1, velikost_kosa=500, mapa_ponudb=None, knjiga=None, predpomnilnik=None,
+                  ponudbe_csv=None, ponudbe_pdf=None):
+    """Price every order in ``vhod`` and stream the results to ``izhod`` ('-' for stdout).
+
+    With ``delavci`` > 1 the orders are priced on a process pool; the output
+    is byte-identical to the serial path. With ``mapa_ponudb`` every priced
+    quote is also saved there as a text file (and its ``pdf`` attached) by a
+    ZapisovalnikPonudb in the background; with ``knjiga`` (a path) it is
+    appended to that KnjigaPonudb ledger. ``predpomnilnik`` turns on the
+    quote cache: "" keeps it in memory, a path also loads it from and (in
+    the serial mode) saves it to that file. ``ponudbe_csv`` (a path) and
+    ``ponudbe_pdf`` (a folder) stream the priced quotes into a CSV file and
+    offer PDFs (see PisecCSV, PisecPDF).
+    """
+    f = sys.stdout if izhod == "-" else open(izhod, "w", encoding="utf-8")
+    zapisovalnik = ZapisovalnikPonudb(mapa_ponudb) if mapa_ponudb else None
+    knjiga = KnjigaPonudb(knjiga) if knjiga else None
+    csv_pisec = PisecCSV(ponudbe_csv) if ponudbe_csv else None
+    porabniki = []
+    if zapisovalnik:
+        porabniki.append(_shranjevalec(zapisovalnik))
+    if knjiga is not None:
+        porabniki.append(knjiga.dodaj)
+    if csv_pisec is not None:
+        porabniki.append(csv_pisec.dodaj)
+    if ponudbe_pdf:
+        porabniki.append(PisecPDF(ponudbe_pdf).dodaj)
+    try:
+        if delavci <= 1:
+            predpomnilnik = None if predpomnilnik is None else PredpomnilnikPonudb(pot=predpomnilnik or None)
+            rezultati = izracunaj_narocila(beri_narocila(vhod), predpomnilnik=predpomnilnik)
+            if porabniki:
+                rezultati = _posreduj_sproti(rezultati, porabniki)
+            stevci = zapisi_rezultate(rezultati, f)
+            if predpomnilnik is not None:
+                predpomnilnik.shrani()
+            return stevci
+        ok = napake = 0
+        kosi = izracunaj_vzporedno(beri_narocila(vhod), delavci, velikost_kosa, z_rezultati=bool(porabniki),
+                                   predpomnilnik=predpomnilnik)
+        for besedilo, kos_ok, kos_napake, rezultati, surovo in kosi:
+            f.write(besedilo)
+            ok += kos_ok
+            napake += kos_napake
+            if surovo:
+                meritve.pristej(surovo)
+            for rezultat in rezultati or ():
+                for porabnik in porabniki:
+                    porabnik(rezultat)
+        return ok, napake
+    finally:
+        if f is not sys.stdout:
+            f.close()
+        if knjiga is not None:
+            knjiga.zapri()
+        if csv_pisec is not None:
+            csv_pisec.zapri()
+        if zapisovalnik:
+            zapisovalnik.zapri()
+            for pot, napaka in zapisovalnik.napake:
+                print(f"❌ Napaka pri shranjevanju {pot}: {napaka}", file=sys.stderr)
+
+# === MERITVE ===
+# Functions that Meritve.vklopi() times, in pipeline order.
+MERJENE_FUNKCIJE = (
+    "beri_narocila", "preberi_narocilo", "_preberi_logotipe", "izracunaj_narocilo", "izracunaj_promocijo",
+    "izracunaj_dtf", "poisci_razpon", "postavitev_logotipa", "zlozi_logotipe", "interpoliraj_ceno", "_v_jsonl",
+    "save_to_file", "izracunaj_vzporedno",
+)
+
+class Meritve:
+    """Opt-in call counters and timers for the pricing stages.
+
+    vklopi() swaps each function named in MERJENE_FUNKCIJE for a timed
+    wrapper in this module's globals and izklopi() puts the original back,
+    so while switched off the hot path runs the untouched functions. For
+    generator functions (reading the input, waiting for pool workers) every
+    produced item counts as a call. Times are inclusive: izracunaj_dtf also
+    contains its poisci_razpon and interpoliraj_ceno calls.
+
+    Per function it keeps calls, raised exceptions, total and longest time;
+    posnetek() returns them as a dict and v_prometheus() in the Prometheus
+    text format.
+    """
+
+    def __init__(self):
+        self.vklopljeno = False
+        self._izvirniki = {}
+        self._stevci = {}  # ime -> [klici, napake, skupaj_ns, maks_ns]
+
+    def _ovij(self, ime, fn):
+        import functools
+        import inspect
+        stevci = self._stevci.setdefault(ime, [0, 0, 0, 0])
+        ura = time.perf_counter_ns
+
+        def zabelezi(zacetek, klic):
+            trajanje = ura() - zacetek
+            stevci[0] += klic
+            stevci[2] += trajanje
+            if trajanje > stevci[3]:
+                stevci[3] = trajanje
+
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def merjena(*args, **kwargs):
+                elementi = fn(*args, **kwargs)
+                while True:
+                    zacetek = ura()
+                    try:
+                        element = next(elementi)
+                    except StopIteration:
+                        zabelezi(zacetek, 0)
+                        return
+                    except BaseException:
+                        stevci[1] += 1
+                        zabelezi(zacetek, 1)
+                        raise
+                    zabelezi(zacetek, 1)
+                    yield element
+        else:
+            @functools.wraps(fn)
+            def merjena(*args, **kwargs):
+                zacetek = ura()
+                try:
+                    return fn(*args, **kwargs)
+                except BaseException:
+                    stevci[1] += 1
+                    raise
+                finally:
+                    zabelezi(zacetek, 1)
+        return merjena
+
+    def vklopi(self, imena=MERJENE_FUNKCIJE):
+        g = globals()
+        for ime in imena:
+            if ime not in self._izvirniki:
+                self._izvirniki[ime] = g[ime]
+                g[ime] = self._ovij(ime, g[ime])
+        self.vklopljeno = True
+
+    def izklopi(self):
+        globals().update(self._izvirniki)
+        self._izvirniki = {}
+        self.vklopljeno = False
+
+    def ponastavi(self):
+        for stevci in self._stevci.values():
+            stevci[:] = [0, 0, 0, 0]
+
+    def surovo(self):
+        """Counters as plain lists, to add into another process with pristej()."""
+        return {ime: list(stevci) for ime, stevci in self._stevci.items() if stevci[0] or stevci[2]}
+
+    def pristej(self, surovo):
+        for ime, (klici, napake, skupaj, maks) in surovo.items():
+            stevci = self._stevci.setdefault(ime, [0, 0, 0, 0])
+            stevci[0] += klici
+            stevci[1] += napake
+            stevci[2] += skupaj
+            stevci[3] = max(stevci[3], maks)
+
+    def posnetek(self):
+        return {
+            ime: {
+                "klici": klici,
+                "napake": napake,
+                "skupaj_s": round(skupaj / 1e9, 6),
+                "povprecje_us": round(skupaj / klici / 1000, 3) if klici else 0,
+                "maks_us": round(maks / 1000, 3),
+            }
+            for ime, (klici, napake, skupaj, maks) in self._stevci.items()
+        }
+
+    def v_prometheus(self):
+        vrstice = []
+        for metrika, tip, opis, vrednost in (
+            ("ponudbe_klici_total", "counter", "Calls per pricing function.", lambda s: s[0]),
+            ("ponudbe_napake_total", "counter", "Exceptions raised per pricing function.", lambda s: s[1]),
+            ("ponudbe_cas_sekunde_total", "counter", "Inclusive time per pricing function.", lambda s: s[2] / 1e9),
+            ("ponudbe_cas_maks_sekunde", "gauge", "Longest single call per pricing function.", lambda s: s[3] / 1e9),
+        ):
+            vrstice.append(f"# HELP {metrika} {opis}")
+            vrstice.append(f"# TYPE {metrika} {tip}")
+            for ime, stevci in self._stevci.items():
+                vrstice.append(f'{metrika}{{funkcija="{ime}"}} {vrednost(stevci)}')
+        return "\n".join(vrstice) + "\n"
+
+    def shrani(self, pot):
+        """Write a snapshot to ``pot``: JSON for *.json, Prometheus text otherwise."""
+        with open(pot, "w", encoding="utf-8") as f:
+            if pot.lower().endswith(".json"):
+                json.dump(self.posnetek(), f, ensure_ascii=False, indent=2)
+                f.write("\n")
+            else:
+                f.write(self.v_prometheus())
+
+meritve = Meritve()
+
+def profiliraj(fn, pot, profiler="cprofile"):
+    """Run ``fn()`` under cProfile (stats to ``pot``) or pyinstrument (HTML to ``pot``); returns fn's result."""
+    if profiler == "pyinstrument":
+        try:
+            import pyinstrument
+        except ImportError:
+            raise ValueError("pyinstrument ni nameščen (pip install pyinstrument).") from None
+        profil = pyinstrument.Profiler()
+        profil.start()
+        try:
+            return fn()
+        finally:
+            profil.stop()
+            with open(pot, "w", encoding="utf-8") as f:
+                f.write(profil.output_html())
+    import cProfile
+    import pstats
+    profil = cProfile.Profile()
+    try:
+        return profil.runcall(fn)
+    finally:
+        profil.dump_stats(pot)
+        pstats.Stats(profil, stream=sys.stderr).sort_stats("cumulative").print_stats(15)
+
+# === HTTP STORITEV ===
+# Service-time targets per request, checked by /health and the load test.
+CILJ_P50_MS = 1
+CILJ_P99_MS = 5
+MAKS_TELO = 1 << 20
+
+_RAZLOGI = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+def _zavrni_konstanto(ime):
+    raise ValueError(f"Vrednost {ime} ni dovoljena, števila morajo biti končna.")
+_POTI_PONUDB = {"/quote/promo": "promocija", "/quote/dtf": "dtf", "/quote/order": "narocilo"}
+
+def percentil(vrednosti, p):
+    """Nearest-rank ``p``-th percentile (0..100) of a sequence, None if it is empty."""
+    urejene = sorted(vrednosti)
+    if not urejene:
+        return None
+    return urejene[max(0, math.ceil(p / 100 * len(urejene)) - 1)]
+
+class StoritevPonudb:
+    """Local HTTP/JSON quoting service on asyncio.
+
+    POST /quote/promo takes {"izdelek", "kolicina"} and POST /quote/dtf
+    takes {"izdelek", "kolicina", "logotipi", "zlaganje"} and POST
+    /quote/order takes {"postavke", "zlaganje"} (see izracunaj_skupno), all
+    optionally with "podjetje"; the reply is the same result record the batch mode
+    writes, or {"napaka": ...} with status 400. GET /health reports the
+    price list generation and the p50/p99 service time of the last
+    requests against CILJ_P50_MS/CILJ_P99_MS, and the hit rate of the
+    optional PredpomnilnikPonudb that repeated quotes are answered from.
+    While meritve are switched on, GET /metrics serves them for Prometheus.
+
+    Price lists are loaded and compiled before the first request and
+    re-checked every ``interval_osvezevanja`` seconds, so edits to ceniki/
+    go live without a restart. Pricing takes microseconds and runs on the
+    event loop; connections are HTTP/1.1 keep-alive.
+    """
+
+    def __init__(self, naslov="127.0.0.1", vrata=8080, interval_osvezevanja=5, predpomnilnik=None):
+        self.naslov = naslov
+        self.vrata = vrata
+        self.interval_osvezevanja = interval_osvezevanja
+        self.predpomnilnik = predpomnilnik
+        self.zahtev = 0
+        self.napak = 0
+        self.latence = collections.deque(maxlen=10_000)  # seconds, most recent requests
+
+    def statistika(self):
+        p50 = percentil(self.latence, 50)
+        p99 = percentil(self.latence, 99)
+        return {
+            "zahtev": self.zahtev,
+            "napak": self.napak,
+            "p50_ms": None if p50 is None else round(p50 * 1000, 3),
+            "p99_ms": None if p99 is None else round(p99 * 1000, 3),
+            "cilj_p50_ms": CILJ_P50_MS,
+            "cilj_p99_ms": CILJ_P99_MS,
+            "predpomnilnik": None if self.predpomnilnik is None else self.predpomnilnik.statistika(),
+        }
+
+    def obdelaj(self, metoda, pot, telo):
+        """Route one request and return (status, JSON-ready reply)."""
+        pot = pot.split("?", 1)[0]
+        if pot == "/metrics" and meritve.vklopljeno:
+            return 200, meritve.v_prometheus()
+        if pot == "/health":
+            if metoda != "GET":
+                return 405, {"napaka": "Dovoljena je le metoda GET."}
+            return 200, {"status": "ok", "generacija": ceniki.generacija, **self.statistika()}
+        tip = _POTI_PONUDB.get(pot)
+        if tip is None:
+            return 404, {"napaka": f"Neznana pot {pot}."}
+        if metoda != "POST":
+            return 405, {"napaka": "Dovoljena je le metoda POST."}
+        try:
+            narocilo = json.loads(telo or b"{}", parse_constant=_zavrni_konstanto)
+            if not isinstance(narocilo, dict):
+                raise ValueError("Telo zahteve mora biti JSON objekt.")
+            narocilo.pop("pdf", None)
+            return 200, izracunaj_narocilo({**narocilo, "tip": tip}, self.predpomnilnik)
+        except json.JSONDecodeError as e:
+            return 400, {"napaka": f"Neveljaven JSON: {e}"}
+        except KeyError as e:
+            return 400, {"napaka": f"Manjka polje {e}."}
+        except (ValueError, TypeError, OverflowError) as e:
+            return 400, {"napaka": str(e)}
+
+    async def _povezava(self, bralnik, pisalnik):
+        import asyncio
+
+        try:
+            while True:
+                try:
+                    glava = await bralnik.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                zacetek = time.perf_counter()
+                vrstice = glava.decode("latin-1").split("\r\n")
+                try:
+                    metoda, pot, razlicica = vrstice[0].split(" ", 2)
+                except ValueError:
+                    return
+                glave = {}
+                for vrstica in vrstice[1:]:
+                    ime, _, vrednost = vrstica.partition(":")
+                    glave[ime.strip().lower()] = vrednost.strip()
+                ohrani = glave.get("connection", "").lower() != "close" and razlicica == "HTTP/1.1"
+                try:
+                    dolzina = int(glave.get("content-length") or 0)
+                except ValueError:
+                    dolzina = -1
+                if dolzina < 0:
+                    # The body cannot be found, so the connection cannot be reused.
+                    status, odgovor, ohrani = 400, {"napaka": "Neveljavna glava Content-Length."}, False
+                elif dolzina > MAKS_TELO:
+                    status, odgovor, ohrani = 413, {"napaka": "Telo zahteve je preveliko."}, False
+                else:
+                    telo = await bralnik.readexactly(dolzina) if dolzina else b""
+                    try:
+                        status, odgovor = self.obdelaj(metoda, pot, telo)
+                    except Exception as e:
+                        # A bug must not drop the connection without a reply.
+                        print(f"❌ Napaka pri obdelavi {metoda} {pot}: {e!r}", file=sys.stderr)
+                        status, odgovor = 500, {"napaka": "Notranja napaka strežnika."}
+                if isinstance(odgovor, str):
+                    besedilo, vrsta = odgovor.encode("utf-8"), "text/plain; version=0.0.4"
+                else:
+                    try:
+                        besedilo = json.dumps(odgovor, ensure_ascii=False, allow_nan=False)
+                    except ValueError:  # Infinity and NaN are not JSON
+                        status, odgovor = 400, {"napaka": "Rezultat ni končno število; preveri vhodne vrednosti."}
+                        besedilo = json.dumps(odgovor, ensure_ascii=False)
+                    besedilo, vrsta = besedilo.encode("utf-8"), "application/json"
+                pisalnik.write(
+                    f"HTTP/1.1 {status} {_RAZLOGI[status]}\r\n"
+                    f"Content-Type: {vrsta}; charset=utf-8\r\n"
+                    f"Content-Length: {len(besedilo)}\r\n"
+                    f"Connection: {'keep-alive' if ohrani else 'close'}\r\n\r\n".encode("latin-1") + besedilo)
+                await pisalnik.drain()
+                self.zahtev += 1
+                if status != 200:
+                    self.napak += 1
+                self.latence.append(time.perf_counter() - zacetek)
+                if not ohrani:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            pisalnik.close()
+
+    async def zazeni(self):
+        """Warm the price lists and start listening; returns the asyncio server."""
+        import asyncio
+
+        ceniki.interval_osvezevanja = self.interval_osvezevanja
+        ceniki.nalozi_vse()
+        streznik = await asyncio.start_server(self._povezava, self.naslov, self.vrata)
+        self.vrata = streznik.sockets[0].getsockname()[1]
+        return streznik
+
+    async def strezi(self):
+        """Serve until cancelled."""
+        streznik = await self.zazeni()
+        print(f"✅ Storitev posluša na http://{self.naslov}:{self.vrata}", file=sys.stderr, flush=True)
+        try:
+            async with streznik:
+                await streznik.serve_forever()
+        finally:
+            if self.predpomnilnik is not None:
+                self.predpomnilnik.shrani()
+
+def meni():
+    """Interactive menu loop."""
     while True:
         print("\nKaj želiš izračunati?")
         print("1. Promocijski material")
         print("2. DTF tisk (oblačila)")
         print("3. Izhod")
-        izbira = input("Izberi [1/2/3]: ").strip()
+        print("4. Naročilo z več postavkami")
+        izbira = input("Izberi [1/2/3/4]: ").strip()
         if izbira == "1":
             izracun_promocije()
         elif izbira == "2":
@@ -575,6 +3514,176 @@ if __name__ == "__main__":
         elif izbira == "3":
             print("✅ Izhod.")
             break
+        elif izbira == "4":
+            izracun_narocila()
         else:
-            print("❌ Napačen vnos. Izberi 1, 2 ali 3.")
+            print("❌ Napačen vnos. Izberi 1, 2, 3 ali 4.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Izračun cen promocijskega materiala in DTF tiska.")
+    ukazi = parser.add_subparsers(dest="ukaz")
+    paket = ukazi.add_parser("batch", help="paketni izračun naročil iz CSV/JSONL datoteke")
+    paket.add_argument("vhod", help="vhodna datoteka (.csv ali .jsonl)")
+    paket.add_argument("izhod", nargs="?", default="-", help="izhodna JSONL datoteka (privzeto stdout)")
+    paket.add_argument("-j", "--delavci", type=int, default=1, help="število procesov (privzeto 1)")
+    paket.add_argument("--velikost-kosa", type=int, default=500, help="naročil na kos pri vzporedni obdelavi")
+    paket.add_argument("--shrani", metavar="MAPA", help="shrani tudi besedilne ponudbe (in PDF priloge) v MAPA")
+    paket.add_argument("--knjiga", metavar="POT", help="dodaj ponudbe v knjigo ponudb (SQLite) na POT")
+    paket.add_argument("--ponudbe-csv", metavar="POT", help="zapiši ponudbe v CSV datoteko POT")
+    paket.add_argument("--ponudbe-pdf", metavar="MAPA", help="zapiši ponudbe za stranke kot PDF v MAPA")
+    paket.add_argument("--predpomnilnik", metavar="POT", nargs="?", const="",
+                       help="uporabi predpomnilnik ponudb (v pomnilniku ali shranjen v POT)")
+    paket.add_argument("--meritve", metavar="POT", help="izmeri čas po funkcijah in ga zapiši v POT (.json ali Prometheus)")
+    paket.add_argument("--profil", metavar="POT", help="profiliraj paket in zapiši profil v POT")
+    paket.add_argument("--profiler", choices=("cprofile", "pyinstrument"), default="cprofile")
+    knjiga = ukazi.add_parser("ledger", help="poizvedbe po knjigi ponudb")
+    knjiga.add_argument("pot", nargs="?", default=POT_KNJIGE, help=f"knjiga ponudb (privzeto {POT_KNJIGE})")
+    knjiga.add_argument("--podjetje")
+    knjiga.add_argument("--artikel")
+    knjiga.add_argument("--od", help="od datuma (YYYY-MM-DD, vključno)")
+    knjiga.add_argument("--do", help="do datuma (YYYY-MM-DD, izključno)")
+    knjiga.add_argument("--izvozi", metavar="MAPA", help="izvozi ponudbe kot besedilne datoteke v MAPA")
+    knjiga.add_argument("--ponudbe-csv", metavar="POT", help="izvozi ponudbe v CSV datoteko POT")
+    knjiga.add_argument("--ponudbe-pdf", metavar="MAPA", help="izvozi ponudbe za stranke kot PDF v MAPA")
+    storitev = ukazi.add_parser("serve", help="lokalna HTTP/JSON storitev za ponudbe")
+    storitev.add_argument("--naslov", default="127.0.0.1", help="naslov (privzeto 127.0.0.1)")
+    storitev.add_argument("--vrata", type=int, default=8080, help="vrata (privzeto 8080, 0 = poljubna)")
+    storitev.add_argument("--osvezevanje", type=float, default=5, help="sekund med preverjanji cenikov")
+    storitev.add_argument("--predpomnilnik", metavar="POT", help="shrani predpomnilnik ponudb v POT ob izhodu")
+    storitev.add_argument("--ttl", type=float, help="življenjska doba ponudbe v predpomnilniku (sekunde)")
+    storitev.add_argument("--meritve", action="store_true", help="izmeri čas po funkcijah in ga objavi na /metrics")
+    ponudba = ukazi.add_parser("quote", help="ena ponudba brez vprašanj (za skripte)")
+    vrste = ponudba.add_subparsers(dest="vrsta", required=True)
+    promo = vrste.add_parser("promo", help="promocijski material")
+    promo.add_argument("izdelek", choices=list(promocijski_material))
+    promo.add_argument("kolicina", type=int)
+    dtf = vrste.add_parser("dtf", help="DTF tisk (oblačila)")
+    dtf.add_argument("izdelek", help="oblačilni artikel ali 'ne potrebujem ga' za lastne izdelke")
+    dtf.add_argument("kolicina", type=int, help="skupna količina izdelkov")
+    dtf.add_argument("-l", "--logotip", type=_logotip, action="append", required=True, metavar="SxVxK",
+                     help="logotip kot širina x višina (cm) x količina, npr. 10x5x20 (lahko večkrat)")
+    dtf.add_argument("--zlaganje", action="store_true", help="dolžino filma izračunaj z zlaganjem na rolo")
+    for vrsta in (promo, dtf):
+        vrsta.add_argument("--podjetje", default="", help="ime podjetja (potrebno za --shrani)")
+        vrsta.add_argument("--pdf", metavar="POT", help="priloži PDF (npr. ponudbo/brief) k shranjeni ponudbi")
+        vrsta.add_argument("--shrani", metavar="MAPA", nargs="?", const="izracuni_dtf",
+                           help="shrani ponudbo v MAPA (privzeto izracuni_dtf) in jo zapiši v knjigo ponudb")
+        vrsta.add_argument("--json", action="store_true", help="izpiši ponudbo kot JSON")
+    nacrt = ukazi.add_parser("plan", help="dnevni načrt tiska DTF: naročila na skupnih zagonih filma")
+    nacrt.add_argument("vhod", help="naročila (.csv ali .jsonl); upoštevana so le naročila DTF")
+    nacrt.add_argument("--json", metavar="POT", help="zapiši načrt kot JSON v POT")
+    nacrt.add_argument("--brez-zlaganja", action="store_true", help="dolžine oceni iz površine namesto z zlaganjem")
+    nacrt.add_argument("--maks-m", type=float, metavar="M", help="največja dolžina zagona (privzeto zadnja točka cenika)")
+    obratno = ukazi.add_parser("solve", help="obratni izračun: količina za proračun ali ceno na kos, meje razponov")
+    obratno.add_argument("--proracun", type=float, metavar="EUR", help="največja količina za ta znesek")
+    obratno.add_argument("--cena-na-kos", type=float, metavar="EUR", help="najmanjša količina s tako ali nižjo ceno na kos")
+    obratno.add_argument("--artikel", action="append", choices=list(promocijski_material) + ["dtf"],
+                         help="samo ta izdelek (lahko večkrat; privzeto vsi)")
+    obratno.add_argument("--povrsina", type=float, metavar="CM2",
+                         help="površina logotipov na kos za DTF (brez nje je DTF v metrih)")
+    args = parser.parse_args(argv)
+
+    if args.ukaz == "batch":
+        if args.profil and args.profiler == "pyinstrument":
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError:
+                parser.error("pyinstrument ni nameščen (pip install pyinstrument).")
+        if args.meritve:
+            meritve.vklopi()
+
+        def paket():
+            return obdelaj_paket(args.vhod, args.izhod, args.delavci, args.velikost_kosa, args.shrani, args.knjiga,
+                                 args.predpomnilnik, args.ponudbe_csv, args.ponudbe_pdf)
+
+        ok, napake = profiliraj(paket, args.profil, args.profiler) if args.profil else paket()
+        if args.meritve:
+            meritve.shrani(args.meritve)
+        print(f"✅ Izračunanih ponudb: {ok}, napak: {napake}", file=sys.stderr)
+    elif args.ukaz == "serve":
+        import asyncio
+
+        try:
+            if args.meritve:
+                meritve.vklopi()
+            predpomnilnik = PredpomnilnikPonudb(ttl=args.ttl, pot=args.predpomnilnik)
+            asyncio.run(StoritevPonudb(args.naslov, args.vrata, args.osvezevanje, predpomnilnik).strezi())
+        except KeyboardInterrupt:
+            pass
+    elif args.ukaz == "ledger":
+        filtri = {"podjetje": args.podjetje, "artikel": args.artikel, "od": args.od, "do": args.do}
+        with KnjigaPonudb(args.pot) as knjiga:
+            if args.izvozi:
+                print(f"✅ Izvoženih ponudb: {knjiga.izvozi(args.izvozi, **filtri)}")
+            if args.ponudbe_csv or args.ponudbe_pdf:
+                st = zapisi_porocila(knjiga.poisci(**filtri), args.ponudbe_csv, args.ponudbe_pdf)
+                print(f"✅ Izvoženih poročil: {st}")
+            if not (args.izvozi or args.ponudbe_csv or args.ponudbe_pdf):
+                for vrstica in knjiga.profit_po_artiklih(**filtri):
+                    print(f"{vrstica['artikel']}: {vrstica['ponudb']} ponudb, {vrstica['kolicina']} kos, "
+                          f"prodaja {vrstica['prodaja']} €, profit {vrstica['profit']} €, "
+                          f"cena na kos {vrstica['cena_na_kos']} €")
+    elif args.ukaz == "quote":
+        if args.shrani is not None and not args.podjetje.strip():
+            parser.error("--shrani zahteva --podjetje.")
+        narocilo = {"tip": "promocija" if args.vrsta == "promo" else "dtf", "podjetje": args.podjetje.strip(),
+                    "izdelek": args.izdelek, "kolicina": args.kolicina, "pdf": args.pdf}
+        if args.vrsta == "dtf":
+            narocilo.update(logotipi=args.logotip, zlaganje=args.zlaganje)
+        try:
+            rezultat = izracunaj_narocilo(narocilo)
+            if args.pdf:
+                preveri_pdf(args.pdf)
+        except (ValueError, OSError) as e:
+            sys.exit(f"❌ {e}")
+        podjetje, vrstice, kolicina, izbira = zapis_ponudbe(rezultat)
+        if args.json:
+            sys.stdout.write(_v_jsonl(rezultat))
+        else:
+            sys.stdout.write(vsebina_ponudbe(podjetje, vrstice) if podjetje else "".join(f"{v}\n" for v in vrstice))
+        if args.shrani is not None:
+            # Status lines go to stderr so stdout stays the quote alone.
+            with contextlib.redirect_stdout(sys.stderr):
+                pot = save_to_file(podjetje, vrstice, kolicina, izbira, mapa=args.shrani)
+                if pot is None:
+                    sys.exit(1)
+                zabelezi_ponudbo(rezultat, pot_knjige(args.shrani))
+                if args.pdf:
+                    try:
+                        cilj_pdf = prilozi_pdf(args.pdf, os.path.join(os.path.dirname(pot), os.path.basename(args.pdf)),
+                                               args.shrani)
+                        print(f"✅ PDF priložen: {cilj_pdf}")
+                    except (OSError, ValueError) as e:
+                        sys.exit(f"❌ Napaka pri kopiranju PDF: {e}")
+    elif args.ukaz == "plan":
+        try:
+            nacrt = nacrtuj_tisk(beri_narocila(args.vhod), not args.brez_zlaganja, args.maks_m)
+        except ValueError as e:
+            sys.exit(f"❌ {e}")
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(nacrt, f, ensure_ascii=False, indent=1)
+        for vrstica in vrstice_nacrta(nacrt):
+            print(vrstica)
+    elif args.ukaz == "solve":
+        if args.proracun is not None and args.cena_na_kos is not None:
+            parser.error("podaj --proracun ali --cena-na-kos, ne obojega.")
+        if args.proracun is None and args.cena_na_kos is None:
+            izpisi_meje(args.artikel)
+            return
+        try:
+            rezultati = obratni_izracun(args.proracun, args.cena_na_kos, args.artikel, args.povrsina)
+        except ValueError as e:
+            parser.error(str(e))
+        for r in rezultati:
+            if r["kolicina"] is None:
+                print(f"{r['artikel']}: ❌ ni primerne količine v ceniku")
+            else:
+                print(f"{r['artikel']}: {r['kolicina']} {r['enota']} za {r['prodaja']} € "
+                      f"({r['cena_na_kos']} € na {r['enota']})")
+    else:
+        meni()
+
+if __name__ == "__main__":
+    main()
 